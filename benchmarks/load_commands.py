@@ -0,0 +1,66 @@
+"""Serial vs concurrent loading of command directories.
+
+A high-latency mount (NFS, sshfs, a cloud-synced folder) is simulated by sleeping
+before every file read.
+
+Usage:
+    python -m benchmarks.load_commands [--commands 10000] [--latency-ms 0,1] [--workers 16]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from src.providers import base
+from src.providers.claude import ClaudeProvider
+
+from .synthetic import make_project
+
+
+def time_load(project_dir: Path, max_workers: int) -> float:
+  """Wall time in ms to load every Claude command with ``max_workers`` threads."""
+  provider = ClaudeProvider()
+  rel_paths = provider.command_files(project_dir)
+  start = time.perf_counter()
+  commands = provider.load_commands(project_dir, rel_paths, max_workers=max_workers)
+  elapsed = time.perf_counter() - start
+  assert [command.name for command in commands] == [Path(p).stem for p in rel_paths]
+  return elapsed * 1000
+
+
+def with_latency(latency_s: float):
+  """Wrap ``read_head`` so every file read first waits ``latency_s``."""
+  read_head = base.read_head
+
+  def slow_read_head(path, *args, **kwargs):
+    time.sleep(latency_s)
+    return read_head(path, *args, **kwargs)
+
+  return slow_read_head
+
+
+def main():
+  """Print serial and pooled load times per simulated latency."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--commands', type=int, default=10000)
+  parser.add_argument('--latency-ms', default='0,1', help='Simulated per-read latencies')
+  parser.add_argument('--workers', type=int, default=base.LOAD_WORKERS)
+  options = parser.parse_args()
+
+  original = base.read_head
+  print(f"{'latency ms':>10} {'serial ms':>10} {'pooled ms':>10} {'speedup':>8}")
+  with tempfile.TemporaryDirectory() as temp_dir:
+    project_dir = make_project(Path(temp_dir) / 'project', claude_commands=options.commands)
+    for latency in (float(s) for s in options.latency_ms.split(',')):
+      base.read_head = with_latency(latency / 1000) if latency else original
+      try:
+        serial = time_load(project_dir, max_workers=1)
+        pooled = time_load(project_dir, max_workers=options.workers)
+      finally:
+        base.read_head = original
+      print(f'{latency:>10.1f} {serial:>10.1f} {pooled:>10.1f} {serial / pooled:>7.1f}x')
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,123 @@
+"""Cold-start import benchmark for the aiproj entry point.
+
+Runs ``python -X importtime`` in a fresh interpreter and fails when the CLI's own
+import cost exceeds a budget or when modules that should load lazily show up.
+
+Usage:
+    python -m benchmarks.startup [--budget-ms 40] [--runs 5]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported just to build the CLI or render --help.
+# typer itself pulls in rich for help rendering, so only aiproj modules are listed.
+LAZY_MODULES = ('src.cli.commands', 'src.core', 'src.providers')
+
+# Machine-readable listings must not load the CLI framework at all
+MACHINE_LISTING = ['list', '--format', 'json']
+FRAMEWORK_MODULES = ('typer', 'click', 'rich')
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$')
+
+_LOADED_PREFIX = 'loaded modules:'
+
+# importlib.import_module() is not reported by -X importtime, so the final set of
+# loaded modules is printed as well to catch lazily imported ones.
+_STARTUP_CODE = f"""
+import sys
+sys.argv = ['aiproj', *sys.argv[1:]]
+from src.cli.main import main
+try:
+    main()
+except SystemExit:
+    pass
+print('{_LOADED_PREFIX}', ' '.join(sys.modules), file=sys.stderr)
+"""
+
+
+def measure_imports(args: List[str] = None) -> Dict[str, Tuple[int, int]]:
+  """Import the CLI in a fresh interpreter and run it with ``args``.
+
+  Returns:
+      Dict mapping module name to (self_us, cumulative_us); modules loaded through
+      importlib are reported as (0, 0)
+  """
+  result = subprocess.run(
+    [sys.executable, '-X', 'importtime', '-c', _STARTUP_CODE, *(args or [])],
+    cwd=PROJECT_ROOT,
+    capture_output=True,
+    text=True,
+    check=False,
+  )
+
+  modules = {}
+  for line in result.stderr.splitlines():
+    match = _IMPORTTIME_LINE.match(line)
+    if match:
+      self_us, cumulative_us, _, name = match.groups()
+      modules[name] = (int(self_us), int(cumulative_us))
+    elif line.startswith(_LOADED_PREFIX):
+      for name in line[len(_LOADED_PREFIX) :].split():
+        modules.setdefault(name, (0, 0))
+  return modules
+
+
+def cli_import_cost_us(modules: Dict[str, Tuple[int, int]]) -> int:
+  """Self time of every aiproj module, excluding third-party dependencies."""
+  return sum(self_us for name, (self_us, _) in modules.items() if name.split('.')[0] == 'src')
+
+
+def eager_modules(modules: Dict[str, Tuple[int, int]]) -> List[str]:
+  """Modules that were imported but should have been deferred."""
+  return sorted(name for name in modules if any(name.startswith(prefix) for prefix in LAZY_MODULES))
+
+
+def framework_modules(modules: Dict[str, Tuple[int, int]]) -> List[str]:
+  """CLI framework modules that were imported."""
+  return sorted(name for name in modules if name.split('.')[0] in FRAMEWORK_MODULES)
+
+
+def main() -> int:
+  """Run the benchmark and return a process exit code."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--budget-ms', type=float, default=40.0, help='Max aiproj import time')
+  parser.add_argument('--runs', type=int, default=5, help='Number of cold starts to sample')
+  options = parser.parse_args()
+
+  failures = []
+  for args in ([], ['--help']):
+    samples = [measure_imports(args) for _ in range(options.runs)]
+    best_ms = min(cli_import_cost_us(sample) for sample in samples) / 1000
+    total_ms = min(sum(s for s, _ in sample.values()) for sample in samples) / 1000
+    eager = eager_modules(samples[0])
+
+    label = 'aiproj ' + ' '.join(args) if args else 'import'
+    print(f'{label:<26} aiproj modules: {best_ms:7.2f} ms   all imports: {total_ms:7.2f} ms')
+
+    if best_ms > options.budget_ms:
+      failures.append(f'{label}: {best_ms:.2f} ms exceeds budget of {options.budget_ms} ms')
+    if eager:
+      failures.append(f"{label}: eagerly imported {', '.join(eager)}")
+
+  samples = [measure_imports(MACHINE_LISTING) for _ in range(options.runs)]
+  total_ms = min(sum(s for s, _ in sample.values()) for sample in samples) / 1000
+  label = 'aiproj ' + ' '.join(MACHINE_LISTING)
+  print(f'{label:<26} all imports: {total_ms:7.2f} ms')
+  framework = framework_modules(samples[0])
+  if framework:
+    failures.append(f"{label}: imported {', '.join(framework[:5])}")
+
+  for failure in failures:
+    print(f'FAIL {failure}')
+  return 1 if failures else 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
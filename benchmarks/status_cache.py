@@ -0,0 +1,56 @@
+"""Cold vs warm provider status benchmark for the persistent status cache.
+
+Usage:
+    python -m benchmarks.status_cache [--sizes 10,1000,10000] [--repeat 20]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from src.core.cache import StatusCache
+from src.core.detector import ProjectDetector
+
+from .synthetic import make_project
+
+
+def time_status(project_dir: Path, cache_dir: Path = None, repeat: int = 20) -> float:
+  """Best wall time in ms of get_provider_status in a fresh detector."""
+  best = float('inf')
+  for _ in range(repeat):
+    cache = StatusCache(cache_dir) if cache_dir else None
+    start = time.perf_counter()
+    ProjectDetector(cache=cache).get_provider_status(project_dir)
+    best = min(best, time.perf_counter() - start)
+  return best * 1000
+
+
+def main():
+  """Print cold (uncached) and warm (cached) status times per project size."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--sizes', default='10,1000,10000', help='Commands per provider')
+  parser.add_argument('--repeat', type=int, default=20)
+  options = parser.parse_args()
+
+  print(f"{'commands':>10} {'no cache ms':>12} {'warm ms':>10} {'speedup':>8}")
+  for size in (int(s) for s in options.sizes.split(',')):
+    with tempfile.TemporaryDirectory() as temp_dir:
+      project_dir = make_project(
+        Path(temp_dir) / 'project',
+        claude_commands=size,
+        gemini_commands=size,
+        codex_prompts=size,
+        body_size=64,
+        age_seconds=3600,
+      )
+      cache_dir = Path(temp_dir) / 'cache'
+
+      cold = time_status(project_dir, repeat=options.repeat)
+      time_status(project_dir, cache_dir, repeat=1)  # populate the cache
+      warm = time_status(project_dir, cache_dir, repeat=options.repeat)
+      print(f'{size * 3:>10} {cold:>12.3f} {warm:>10.3f} {cold / warm:>7.1f}x')
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,93 @@
+"""Peak memory of batch vs streaming generate→write during a large migration.
+
+Migrates every Claude command of a synthetic project into Gemini and Codex, once
+through ``generate_targets`` + ``write_config_files`` (every output in memory at
+once) and once through ``stream_targets`` + ``write_config_stream``, and reports
+the peak traced Python allocation of each with ``tracemalloc``. ``--check`` fails
+when the streaming peak exceeds a few times the largest single file plus a small
+per-command allowance for the command metadata that is loaded up front.
+
+Usage:
+    python -m benchmarks.stream_memory [--commands 1000] [--body-kb 64] [--check]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Tuple
+
+from src.core.generator import ConfigGenerator
+
+from .synthetic import make_project
+
+TARGETS = {'gemini': ['commands'], 'codex': ['commands']}
+
+
+def batch(generator: ConfigGenerator, project_dir: Path):
+  """Generate every output, then write them."""
+  generated = generator.generate_targets(project_dir, TARGETS, migrate_from=['claude'])
+  files = {}
+  for target_files in generated.values():
+    files.update(target_files)
+  generator.write_config_files(project_dir, files)
+
+
+def stream(generator: ConfigGenerator, project_dir: Path):
+  """Write each output as it is generated."""
+  items = generator.stream_targets(project_dir, TARGETS, migrate_from=['claude'])
+  generator.write_config_stream(project_dir, items)
+
+
+def measure(
+  run: Callable[[ConfigGenerator, Path], None], project_dir: Path
+) -> Tuple[int, float, int]:
+  """Peak traced bytes, wall time in ms and largest written file of one migration."""
+  generator = ConfigGenerator()
+  tracemalloc.start()
+  try:
+    start = time.perf_counter()
+    run(generator, project_dir)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+  largest = max(path.stat().st_size for path in project_dir.rglob('*') if path.is_file())
+  return peak, elapsed * 1000, largest
+
+
+def main() -> int:
+  """Print both peaks; with --check, return 1 if streaming is not bounded."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--commands', type=int, default=1000)
+  parser.add_argument('--body-kb', type=int, default=64, help='Size of each command body')
+  parser.add_argument('--check', action='store_true', help='Fail if streaming is not bounded')
+  parser.add_argument('--file-factor', type=float, default=4.0)
+  parser.add_argument('--per-command-bytes', type=int, default=4096)
+  options = parser.parse_args()
+
+  corpus = options.commands * options.body_kb * 1024
+  print(f'{options.commands} commands, {corpus / 2**20:.1f} MiB of bodies')
+  print(f'{"mode":<8} {"peak MiB":>10} {"time ms":>10}')
+  peaks = {}
+  with tempfile.TemporaryDirectory() as temp_dir:
+    for mode, run in (('batch', batch), ('stream', stream)):
+      project_dir = make_project(
+        Path(temp_dir) / mode, claude_commands=options.commands, body_size=options.body_kb * 1024
+      )
+      peak, elapsed, largest = measure(run, project_dir)
+      peaks[mode] = peak
+      print(f'{mode:<8} {peak / 2**20:>10.2f} {elapsed:>10.1f}')
+
+  budget = options.file_factor * largest + options.per_command_bytes * options.commands
+  print(f'largest file {largest / 2**20:.2f} MiB; streaming budget {budget / 2**20:.2f} MiB')
+  if options.check and peaks['stream'] > budget:
+    print('FAIL: streaming peak exceeds the budget')
+    return 1
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
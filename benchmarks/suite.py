@@ -0,0 +1,328 @@
+"""Scale benchmark suite over synthetic projects.
+
+Times provider status, per-provider load/generate, writes, removal and monorepo
+discovery on generated projects, cold (fresh objects, empty status cache, empty
+target directory) and warm (populated cache, repeated calls, unchanged files).
+Results are saved as JSON and can be compared against a baseline run.
+
+Usage:
+    python -m benchmarks.suite run [--scenarios commands-10,commands-1k] [--output results.json]
+    python -m benchmarks.suite run --compare baseline.json [--threshold 0.2]
+    python -m benchmarks.suite compare baseline.json results.json [--threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.cli.commands.clean import _remove_providers
+from src.core.cache import StatusCache, cache_home
+from src.core.detector import ProjectDetector
+from src.core.discovery import discover_provider_configs
+from src.core.generator import ConfigGenerator
+from src.core.gitindex import GitIndex
+from src.core.trash import Trash
+
+from .synthetic import make_git_monorepo, make_mixed_project, make_monorepo, make_project
+
+RESULTS_VERSION = 1
+
+# name -> (builder, kind); 'project' scenarios run every per-project operation
+SCENARIOS: Dict[str, Tuple[Callable[[Path], Path], str]] = {
+  'commands-10': (lambda root: make_mixed_project(root, 10), 'project'),
+  'commands-1k': (lambda root: make_mixed_project(root, 1_000), 'project'),
+  'commands-10k': (lambda root: make_mixed_project(root, 10_000), 'project'),
+  'commands-100k': (lambda root: make_mixed_project(root, 100_000), 'project'),
+  'large-prompts': (
+    lambda root: make_project(
+      root, claude_commands=20, gemini_commands=10, codex_prompts=10, body_size=1 << 20
+    ),
+    'project',
+  ),
+  'monorepo-deep': (lambda root: make_monorepo(root, depth=6, fanout=3), 'monorepo'),
+  'monorepo-git': (lambda root: make_git_monorepo(root), 'monorepo'),
+}
+
+Timing = Dict[str, Optional[float]]
+
+
+def best_ms(fn: Callable[[], Any], repeat: int, setup: Callable[[], Any] = None) -> float:
+  """Best wall time of ``fn`` in ms over ``repeat`` runs, excluding ``setup``."""
+  best = float('inf')
+  for _ in range(max(1, repeat)):
+    if setup:
+      setup()
+    start = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - start)
+  return round(best * 1000, 3)
+
+
+def bench_project(project_dir: Path, work_dir: Path, repeat: int) -> Dict[str, Timing]:
+  """Time every per-project operation on a generated project."""
+  results: Dict[str, Timing] = {}
+  providers = list(ProjectDetector().get_all_providers())
+  counter = iter(range(1 << 30))
+
+  # Status: empty cache vs populated cache, fresh detector each time
+  warm_cache = work_dir / 'cache-warm'
+  results['status'] = {
+    'cold_ms': best_ms(
+      lambda: ProjectDetector(cache=StatusCache(work_dir / f'cache-{next(counter)}'))
+      .get_provider_status(project_dir),
+      repeat,
+    ),
+    'warm_ms': None,
+  }
+  ProjectDetector(cache=StatusCache(warm_cache)).get_provider_status(project_dir)
+  results['status']['warm_ms'] = best_ms(
+    lambda: ProjectDetector(cache=StatusCache(warm_cache)).get_provider_status(project_dir),
+    repeat,
+  )
+
+  for name in providers:
+    # Load: first call with a fresh snapshot vs repeated calls sharing one snapshot
+    detector = ProjectDetector()
+    provider = detector.get_provider(name)
+    cold = best_ms(lambda: provider.load_existing_config(project_dir), 1)
+    snapshot = detector.snapshot(project_dir)
+    warm = best_ms(lambda: provider.load_existing_config(project_dir, snapshot), repeat)
+    results[f'load:{name}'] = {'cold_ms': cold, 'warm_ms': warm}
+
+    # Generate: migrate every other provider's commands (reads full bodies)
+    sources = [p for p in providers if p != name]
+    generator = ConfigGenerator(ProjectDetector())
+    generate = lambda: generator.generate_provider_config(  # noqa: E731
+      project_dir, name, ['commands'], migrate_from=sources
+    )
+    cold = best_ms(generate, 1)
+    warm = best_ms(generate, repeat)
+    results[f'generate:{name}'] = {'cold_ms': cold, 'warm_ms': warm}
+
+  # Write: into an empty directory vs rewriting identical content
+  files = ConfigGenerator().generate_provider_config(
+    project_dir, 'codex', ['config', 'commands'], migrate_from=['claude', 'gemini']
+  )
+  target = work_dir / 'write-target'
+  generator = ConfigGenerator()
+  results['write'] = {
+    'cold_ms': best_ms(
+      lambda: generator.write_config_files(target, files),
+      repeat,
+      setup=lambda: shutil.rmtree(target, ignore_errors=True),
+    ),
+    'warm_ms': best_ms(lambda: generator.write_config_files(target, files, force=True), repeat),
+  }
+
+  # Remove: a fresh copy of every provider each run
+  copy = work_dir / 'remove-target'
+
+  def fresh_copy():
+    shutil.rmtree(copy, ignore_errors=True)
+    shutil.copytree(project_dir, copy, symlinks=True)
+
+  components = {name: ['config', 'commands', 'prompts', 'agents'] for name in providers}
+  results['remove'] = {
+    'cold_ms': best_ms(
+      lambda: _remove_providers(copy, components, 'bench', purge=False),
+      min(repeat, 3),
+      setup=fresh_copy,
+    ),
+    'warm_ms': None,
+  }
+  shutil.rmtree(copy, ignore_errors=True)
+  return results
+
+
+def bench_monorepo(root: Path, work_dir: Path, repeat: int) -> Dict[str, Timing]:
+  """Time recursive discovery with an empty and a populated status cache.
+
+  In a git repository discovery reads the index; it is also timed walking the
+  tree, and cold runs then include parsing the index (its cache is cleared).
+  """
+  counter = iter(range(1 << 30))
+  warm_cache = work_dir / 'cache-warm'
+
+  def detector(cache_dir: Path, walk: bool = False) -> ProjectDetector:
+    detector = ProjectDetector(cache=StatusCache(cache_dir))
+    if walk:
+      detector.git_index = lambda project_dir: None
+    return detector
+
+  def forget_index():
+    shutil.rmtree(cache_home() / 'gitindex', ignore_errors=True)
+
+  results = {}
+  for operation, walk in (('discover', False), ('discover-walk', True)):
+    if walk and GitIndex.find(root) is None:
+      continue
+    cold = best_ms(
+      lambda: discover_provider_configs(root, detector(work_dir / f'cache-{next(counter)}', walk)),
+      repeat,
+      setup=forget_index,
+    )
+    discover_provider_configs(root, detector(warm_cache, walk))
+    warm = best_ms(lambda: discover_provider_configs(root, detector(warm_cache, walk)), repeat)
+    results[operation] = {'cold_ms': cold, 'warm_ms': warm}
+  return results
+
+
+@contextmanager
+def isolated_user_dirs(directory: Path):
+  """Point aiproj's caches and state at ``directory`` and skip background trash purges.
+
+  The suite clears the git index cache and removes providers over and over; neither
+  may touch the caller's own caches or leave detached purge processes running.
+  """
+  saved = {name: os.environ.get(name) for name in ('XDG_CACHE_HOME', 'XDG_STATE_HOME')}
+  os.environ['XDG_CACHE_HOME'] = str(directory / 'cache')
+  os.environ['XDG_STATE_HOME'] = str(directory / 'state')
+  purge_in_background = Trash.purge_in_background
+  Trash.purge_in_background = lambda self: None
+  try:
+    yield
+  finally:
+    Trash.purge_in_background = purge_in_background
+    for name, value in saved.items():
+      if value is None:
+        os.environ.pop(name, None)
+      else:
+        os.environ[name] = value
+
+
+def run_suite(scenarios: List[str], repeat: int, log=print) -> Dict[str, Any]:
+  """Generate each scenario in a temp directory and benchmark it.
+
+  Caches and state also live in that directory (see ``isolated_user_dirs``).
+
+  Returns:
+      Results document (see ``RESULTS_VERSION``)
+  """
+  document = {
+    'version': RESULTS_VERSION,
+    'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    'python': platform.python_version(),
+    'platform': platform.platform(),
+    'repeat': repeat,
+    'scenarios': {},
+  }
+  for name in scenarios:
+    build, kind = SCENARIOS[name]
+    with tempfile.TemporaryDirectory() as temp_dir, isolated_user_dirs(Path(temp_dir) / 'home'):
+      temp_path = Path(temp_dir)
+      start = time.perf_counter()
+      root = build(temp_path / 'project')
+      log(f'{name}: generated in {time.perf_counter() - start:.1f}s')
+
+      work_dir = temp_path / 'work'
+      work_dir.mkdir()
+      bench = bench_project if kind == 'project' else bench_monorepo
+      document['scenarios'][name] = bench(root, work_dir, repeat)
+      for operation, timing in document['scenarios'][name].items():
+        log(f"  {operation:<18} cold {_fmt(timing['cold_ms'])}  warm {_fmt(timing['warm_ms'])}")
+  return document
+
+
+def compare(
+  baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.2, min_ms: float = 1.0
+) -> List[Dict[str, Any]]:
+  """Pair up timings present in both result documents.
+
+  A timing regresses when it is more than ``threshold`` (a fraction) slower than the
+  baseline and slower by at least ``min_ms``, which keeps sub-millisecond noise out.
+
+  Returns:
+      One row per scenario/operation/metric with ``baseline``, ``current``,
+      ``ratio`` and ``regressed``
+  """
+  rows = []
+  for scenario, operations in current.get('scenarios', {}).items():
+    for operation, timing in operations.items():
+      for metric, value in timing.items():
+        old = baseline.get('scenarios', {}).get(scenario, {}).get(operation, {}).get(metric)
+        if old is None or value is None:
+          continue
+        ratio = value / old if old else float('inf')
+        rows.append(
+          {
+            'scenario': scenario,
+            'operation': operation,
+            'metric': metric,
+            'baseline': old,
+            'current': value,
+            'ratio': round(ratio, 3),
+            'regressed': value > old * (1 + threshold) and value - old >= min_ms,
+          }
+        )
+  return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> int:
+  """Print a comparison table and return the number of regressions."""
+  print(f"{'scenario':<16} {'operation':<18} {'metric':<8} {'base ms':>10} {'now ms':>10} ratio")
+  for row in rows:
+    flag = '  REGRESSION' if row['regressed'] else ''
+    print(
+      f"{row['scenario']:<16} {row['operation']:<18} {row['metric'][:-3]:<8} "
+      f"{row['baseline']:>10.3f} {row['current']:>10.3f} {row['ratio']:>5.2f}x{flag}"
+    )
+  regressions = sum(row['regressed'] for row in rows)
+  print(f'{regressions} regressions in {len(rows)} timings')
+  return regressions
+
+
+def _fmt(value: Optional[float]) -> str:
+  return f'{value:>10.3f} ms' if value is not None else f"{'-':>13}"
+
+
+def main() -> int:
+  """Run or compare benchmark results and return a process exit code."""
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  subparsers = parser.add_subparsers(dest='action', required=True)
+
+  run_parser = subparsers.add_parser('run', help='Run the suite and save results')
+  run_parser.add_argument(
+    '--scenarios', default=','.join(SCENARIOS), help=f"Any of: {', '.join(SCENARIOS)}"
+  )
+  run_parser.add_argument('--repeat', type=int, default=3, help='Runs per warm timing')
+  run_parser.add_argument('--output', default='benchmark-results.json')
+  run_parser.add_argument('--compare', help='Baseline results to compare against')
+
+  compare_parser = subparsers.add_parser('compare', help='Compare two result files')
+  compare_parser.add_argument('baseline')
+  compare_parser.add_argument('current')
+
+  for sub in (run_parser, compare_parser):
+    sub.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown (0.2 = 20%%)')
+    sub.add_argument('--min-ms', type=float, default=1.0, help='Ignore differences below this')
+  options = parser.parse_args()
+
+  if options.action == 'compare':
+    baseline = json.loads(Path(options.baseline).read_text())
+    current = json.loads(Path(options.current).read_text())
+  else:
+    scenarios = [name for name in options.scenarios.split(',') if name]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+      parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    current = run_suite(scenarios, options.repeat)
+    Path(options.output).write_text(json.dumps(current, indent=2) + '\n')
+    print(f'Results written to {options.output}')
+    if not options.compare:
+      return 0
+    baseline = json.loads(Path(options.compare).read_text())
+
+  rows = compare(baseline, current, options.threshold, options.min_ms)
+  return 1 if print_comparison(rows) else 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,143 @@
+"""Synthetic project generators for benchmarks."""
+
+import os
+import subprocess
+import time
+from pathlib import Path
+
+
+def make_project(
+  root: Path,
+  claude_commands: int = 0,
+  gemini_commands: int = 0,
+  codex_prompts: int = 0,
+  body_size: int = 512,
+  age_seconds: int = 0,
+) -> Path:
+  """Create a project with the given number of provider command files.
+
+  Args:
+      root: Directory to create the project in (created if missing)
+      claude_commands: Number of ``.claude/commands/*.md`` files
+      gemini_commands: Number of ``.gemini/commands/*.toml`` files
+      codex_prompts: Number of ``.codex/prompts/*.md`` files
+      body_size: Approximate size of each command body in bytes
+      age_seconds: Backdate every mtime by this much (keeps status caches non-racy)
+
+  Returns:
+      The project root
+  """
+  root.mkdir(parents=True, exist_ok=True)
+  body = ('Lorem ipsum dolor sit amet. ' * (body_size // 28 + 1))[:body_size]
+
+  if claude_commands:
+    (root / 'CLAUDE.md').write_text('# Claude Configuration\n')
+    _write_many(
+      root / '.claude' / 'commands',
+      '.md',
+      claude_commands,
+      lambda i: f'---\ndescription: "Command {i}"\n---\n\n# Command {i}\n\n{body}\n',
+    )
+  if gemini_commands:
+    (root / 'GEMINI.md').write_text('# Gemini Configuration\n')
+    _write_many(
+      root / '.gemini' / 'commands',
+      '.toml',
+      gemini_commands,
+      lambda i: f'description = "Command {i}"\nprompt = """{body}"""\n',
+    )
+  if codex_prompts:
+    (root / 'AGENTS.md').write_text('# Codex Notes\n')
+    _write_many(
+      root / '.codex' / 'prompts', '.md', codex_prompts, lambda i: f'# Prompt {i}\n\n{body}\n'
+    )
+
+  if age_seconds:
+    backdate(root, age_seconds)
+  return root
+
+
+def make_mixed_project(root: Path, commands: int, body_size: int = 512) -> Path:
+  """Project with ``commands`` files split across providers (half .md, a quarter .toml).
+
+  Claude gets half of the commands and Gemini and Codex a quarter each, so sources
+  mix markdown and TOML.
+  """
+  gemini = commands // 4
+  codex = commands // 4
+  return make_project(
+    root,
+    claude_commands=commands - gemini - codex,
+    gemini_commands=gemini,
+    codex_prompts=codex,
+    body_size=body_size,
+  )
+
+
+def make_monorepo(
+  root: Path, depth: int = 6, fanout: int = 3, commands_per_package: int = 5
+) -> Path:
+  """Nested packages ``depth`` levels deep, each with ``fanout`` children and a Claude setup.
+
+  Every directory at every level is a package with ``commands_per_package`` Claude
+  commands, plus a source directory and a ``node_modules`` directory that discovery
+  should skip.
+  """
+  root.mkdir(parents=True, exist_ok=True)
+  (root / '.gitignore').write_text('build/\n')
+  level = [root]
+  for _ in range(depth):
+    next_level = []
+    for package in level:
+      make_project(package, claude_commands=commands_per_package, body_size=128)
+      (package / 'src').mkdir(exist_ok=True)
+      (package / 'src' / 'main.py').write_text('print("hello")\n')
+      (package / 'node_modules' / 'dep').mkdir(parents=True, exist_ok=True)
+      next_level.extend(package / f'pkg-{i}' for i in range(fanout))
+    level = next_level
+  return root
+
+
+def make_git_monorepo(
+  root: Path,
+  packages: int = 2_000,
+  files_per_package: int = 20,
+  configured_every: int = 100,
+  age_seconds: int = 60,
+) -> Path:
+  """A git repository of flat packages where only every ``configured_every``-th has a setup.
+
+  All files are staged, so the index lists them; discovery by walking has to list
+  every package directory while discovery from the index does not. The tree and
+  index are backdated, as in a checkout nobody has just edited, so their cached
+  results can be reused.
+  """
+  root.mkdir(parents=True, exist_ok=True)
+  for i in range(packages):
+    package = root / 'packages' / f'pkg-{i:05d}'
+    (package / 'src').mkdir(parents=True, exist_ok=True)
+    for j in range(files_per_package):
+      (package / 'src' / f'module_{j}.py').write_text('x = 1\n')
+    if i % configured_every == 0:
+      make_project(package, claude_commands=5, body_size=128)
+  subprocess.run(['git', 'init', '-q'], cwd=root, check=True)
+  subprocess.run(['git', 'add', '.'], cwd=root, check=True)
+  if age_seconds:
+    backdate(root, age_seconds)
+  return root
+
+
+def backdate(root: Path, age_seconds: int):
+  """Set the mtime of ``root`` and everything under it ``age_seconds`` into the past."""
+  past = time.time() - age_seconds
+  for directory, _, files in os.walk(root):
+    for name in files:
+      os.utime(os.path.join(directory, name), (past, past))
+    os.utime(directory, (past, past))
+
+
+def _write_many(directory: Path, suffix: str, count: int, render):
+  """Write ``count`` files named ``cmd-00000<suffix>`` rendered by ``render(i)``."""
+  directory.mkdir(parents=True, exist_ok=True)
+  for i in range(count):
+    (directory / f'cmd-{i:05d}{suffix}').write_text(render(i))
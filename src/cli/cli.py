@@ -1,21 +1,182 @@
 """Main CLI application for aiproj."""
 
+import functools
+import time
+from pathlib import Path
+from typing import Optional
+
+import click
 import typer
 
-from .commands.add import add
-from .commands.clean import clean
-from .commands.init import init
-from .commands.list_providers import list_providers
+from .lazy import LazyCommand, LazyGroup
+
+# Subcommands are imported on first use; see LazyGroup.
+COMMANDS = {
+  'init': LazyCommand(
+    '.commands.init:init', 'Initialize AI provider configurations for a project.'
+  ),
+  'add': LazyCommand(
+    '.commands.add:add',
+    'Add AI provider configurations to existing project with content migration.',
+  ),
+  'list': LazyCommand(
+    '.commands.list_providers:list_providers', 'List configured AI providers and their status.'
+  ),
+  'clean': LazyCommand('.commands.clean:clean', 'Remove AI provider configurations.'),
+  'undo': LazyCommand('.commands.undo:undo', 'Restore the files removed by the last clean.'),
+  'sync': LazyCommand(
+    '.commands.sync:sync',
+    'Mirror commands between configured providers, converting only what changed.',
+  ),
+  'watch': LazyCommand(
+    '.commands.watch:watch',
+    'Mirror command edits to the other configured providers as they happen.',
+  ),
+  'serve': LazyCommand(
+    '.commands.serve:serve',
+    'Keep project state warm and answer status queries over a Unix socket.',
+  ),
+  'export': LazyCommand(
+    '.commands.bundle:export', "Pack every provider's files into one tar or zip bundle."
+  ),
+  'import': LazyCommand(
+    '.commands.bundle:import_', 'Write the files of a bundle into this project.'
+  ),
+  'codex': LazyCommand(
+    '.commands.codex:app', 'Install project Codex prompts into $CODEX_HOME/prompts.'
+  ),
+  'stats': LazyCommand(
+    '.commands.stats:stats', 'Show timing percentiles and I/O counters of recorded runs.'
+  ),
+}
+
+
+# Not recorded in the run metrics (reading them should not add to them)
+UNRECORDED_COMMANDS = {'stats'}
+
+# Commands that change provider files, after which the shell completion cache is rebuilt
+REFRESHES_COMPLETION = {'init', 'add', 'clean', 'undo', 'sync', 'import'}
+
+# ctx.meta key set once a subcommand's own callback starts (not for --help or usage errors)
+BODY_RAN = 'aiproj.body_ran'
+
+
+class AiprojGroup(LazyGroup):
+  """Top-level aiproj command group; records each run's timing and I/O counters."""
+
+  lazy_commands = COMMANDS
+
+  def load_command(self, cmd_name: str) -> click.Command:
+    """Import a subcommand and mark its callbacks so invoke can tell when one ran."""
+    command = super().load_command(cmd_name)
+    _mark_callbacks(command)
+    return command
+
+  def invoke(self, ctx: click.Context):
+    """Run the subcommand and append its metrics to the local store."""
+    from ..core import iostats
+
+    iostats.reset()
+    started = time.perf_counter()
+    exit_code = 1
+    try:
+      result = super().invoke(ctx)
+      exit_code = 0
+      return result
+    except click.exceptions.Exit as e:
+      exit_code = e.exit_code
+      raise
+    except click.ClickException as e:
+      exit_code = e.exit_code
+      raise
+    finally:
+      self._after_run(ctx, time.perf_counter() - started, exit_code)
+
+  def _after_run(self, ctx: click.Context, duration_s: float, exit_code: int):
+    command = ctx.invoked_subcommand
+    body_ran = ctx.meta.get(BODY_RAN, False)
+    # --help exits 0 before the body runs; it is neither a run nor a change
+    if not command or ctx.resilient_parsing or (exit_code == 0 and not body_ran):
+      return
+    if body_ran and exit_code == 0 and command in REFRESHES_COMPLETION:
+      _refresh_completion()
+    if command not in UNRECORDED_COMMANDS:
+      from ..core.metrics import record_run
+
+      record_run(command, duration_s, exit_code)
+
+
+def _mark_callbacks(command: click.Command):
+  """Wrap the callback of every leaf command so it sets ``ctx.meta[BODY_RAN]``.
+
+  Group callbacks run before their subcommand's arguments are parsed, so only
+  leaves count as a body having run.
+  """
+  if isinstance(command, click.Group):
+    for subcommand in command.commands.values():
+      _mark_callbacks(subcommand)
+    return
+  if command.callback is None:
+    return
+
+  callback = command.callback
+
+  @functools.wraps(callback)
+  def run(*args, **kwargs):
+    click.get_current_context().meta[BODY_RAN] = True
+    return callback(*args, **kwargs)
+
+  command.callback = run
+
+
+def _refresh_completion():
+  """Rebuild the current project's completion cache so the next TAB reads only it."""
+  from ..core.completion import refresh
+
+  try:
+    refresh(Path.cwd(), COMMANDS)
+  except OSError:
+    pass  # e.g. the project directory was removed; completion rebuilds it lazily
+
 
 app = typer.Typer(
-  name='aiproj', help='Multi-AI project configuration manager', no_args_is_help=True
+  name='aiproj',
+  help='Multi-AI project configuration manager',
+  no_args_is_help=True,
+  cls=AiprojGroup,
 )
 
-# Register commands
-app.command()(init)
-app.command()(add)
-app.command('list')(list_providers)
-app.command()(clean)
+
+@app.callback()
+def callback(
+  ctx: typer.Context,
+  profile: bool = typer.Option(
+    False, '--profile', help='Record per-phase timings and print a summary'
+  ),
+  profile_output: Path = typer.Option(
+    Path('aiproj-trace.json'), '--profile-output', help='Chrome trace file written by --profile'
+  ),
+  profile_cprofile: Optional[Path] = typer.Option(
+    None, '--profile-cprofile', help='Also dump cProfile stats for each phase into this directory'
+  ),
+):
+  """Multi-AI project configuration manager."""
+  if profile or profile_cprofile:
+    from ..core import profiling
+
+    profiling.start(profile_cprofile)
+    ctx.call_on_close(lambda: _finish_profile(f'aiproj {ctx.invoked_subcommand}', profile_output))
+
+
+def _finish_profile(root_name: str, output: Path):
+  """Stop profiling, write the trace and print the phase summary to stderr."""
+  from ..core import profiling
+
+  profiler = profiling.stop(root_name)
+  profiler.write_trace(output)
+  typer.echo(profiler.format_summary(), err=True)
+  typer.echo(f'Trace written to {output}', err=True)
+
 
 if __name__ == '__main__':
   app()
@@ -1,19 +1,30 @@
 """Add AI provider configurations to existing project."""
 
 from pathlib import Path
+from typing import List, Optional
 
 import typer
 from rich.console import Console
 from rich.prompt import Prompt
 
+from ...core.atomic import Durability, LinkMode
+from ...core.cache import StatusCache
 from ...core.detector import ProjectDetector
 from ...core.generator import ConfigGenerator
+from .. import complete
 
 console = Console()
 
 
+def _complete_providers(ctx: typer.Context, incomplete: str) -> List[str]:
+  """Shell completion for the providers argument."""
+  return complete.add_providers(complete.load_words(), ctx.params.get('providers') or [])
+
+
 def add(
-  provider: str = typer.Argument(None, help='Provider to add (claude, gemini, codex)'),
+  providers: List[str] = typer.Argument(
+    None, help='Providers to add (claude, gemini, codex)', autocompletion=_complete_providers
+  ),
   claude: bool = typer.Option(False, '--claude', help='Add Claude Code'),
   gemini: bool = typer.Option(False, '--gemini', help='Add Gemini CLI'),
   codex: bool = typer.Option(False, '--codex', help='Add OpenAI Codex'),
@@ -27,27 +38,38 @@ def add(
   migrate: bool = typer.Option(
     True, '--migrate/--no-migrate', help='Migrate content from existing providers'
   ),
+  no_cache: bool = typer.Option(False, '--no-cache', help='Ignore the provider status cache'),
+  prefer: str = typer.Option(
+    None, '--prefer', help='Comma-separated provider priority for conflicting commands'
+  ),
+  durability: Durability = typer.Option(
+    Durability.none, '--durability', help='fsync policy for written files: none, batch or strict'
+  ),
+  link: LinkMode = typer.Option(
+    LinkMode.copy, '--link', help='Outputs identical to their source: copy, hard or sym link'
+  ),
 ):
-  """Add AI provider configurations to existing project with content migration."""
+  """Add AI provider configurations to existing project with content migration.
+
+  Several providers can be added at once (``aiproj add gemini codex``): source content
+  is loaded once, every target is generated from it and all files are written together.
+  """
   project_dir = Path.cwd()
-  detector = ProjectDetector()
-  generator = ConfigGenerator()
+  detector = ProjectDetector(cache=None if no_cache else StatusCache())
+  generator = ConfigGenerator(detector, durability, link)
 
   # Show current status
   console.print('[bold cyan]Current configuration status:[/bold cyan]')
   console.print(detector.format_provider_status(project_dir))
   console.print()
 
-  # Determine target provider
-  if provider:
-    target_provider = provider
-  elif claude:
-    target_provider = 'claude'
-  elif gemini:
-    target_provider = 'gemini'
-  elif codex:
-    target_provider = 'codex'
-  else:
+  # Determine target providers
+  targets = list(dict.fromkeys(providers or []))
+  for selected, name in ((claude, 'claude'), (gemini, 'gemini'), (codex, 'codex')):
+    if selected and name not in targets:
+      targets.append(name)
+
+  if not targets:
     # Prompt for provider
     existing = detector.detect_existing_providers(project_dir)
     available = [name for name, configured in existing.items() if not configured]
@@ -56,90 +78,69 @@ def add(
       console.print('[yellow]All providers are already configured.[/yellow]')
       return
 
-    target_provider = Prompt.ask(
-      'Which provider would you like to add?', choices=available, default=available[0]
-    )
-
-  # Check if target provider exists
-  provider_obj = detector.get_provider(target_provider)
-  if not provider_obj:
-    console.print(f'[red]Unknown provider: {target_provider}[/red]')
-    console.print(
-      f"[yellow]Available providers: {', '.join(detector.get_all_providers().keys())}[/yellow]"
-    )
-    raise typer.Exit(1)
-
-  # Check if target provider already exists
-  if provider_obj.detect_existing(project_dir):
-    console.print(f'[yellow]{target_provider} is already configured.[/yellow]')
+    targets = [
+      Prompt.ask('Which provider would you like to add?', choices=available, default=available[0])
+    ]
 
-    # Show what components exist and what's missing
-    status = detector.get_provider(target_provider).get_existing_components(project_dir)
-    missing_components = []
-    if not status['config']:
-      missing_components.append('config')
-    if status['commands'] == 0:
-      missing_components.append('commands')
-    if status['prompts'] == 0:
-      missing_components.append('prompts')
-    if target_provider == 'claude' and not status['agents']:
-      missing_components.append('agents')
-
-    if missing_components:
-      console.print(f"[cyan]Missing components: {', '.join(missing_components)}[/cyan]")
-    else:
-      console.print('[green]All components are configured.[/green]')
-      if not force:
-        return
+  # Check if target providers exist
+  for target_provider in targets:
+    if not detector.get_provider(target_provider):
+      console.print(f'[red]Unknown provider: {target_provider}[/red]')
+      console.print(
+        f"[yellow]Available providers: {', '.join(detector.get_all_providers().keys())}[/yellow]"
+      )
+      raise typer.Exit(1)
 
   # Determine which components to add
-  components = []
+  requested = []
   if config:
-    components.append('config')
+    requested.append('config')
   if commands:
-    components.append('commands')
+    requested.append('commands')
   if prompts:
-    components.append('prompts')
+    requested.append('prompts')
   if agents:
-    components.append('agents')
+    requested.append('agents')
   if all_components:
-    components = ['config', 'commands', 'prompts', 'agents']
+    requested = ['config', 'commands', 'prompts', 'agents']
 
-  # Default to missing components if none specified
-  if not components:
-    if detector.get_provider(target_provider).detect_existing(project_dir):
-      status = detector.get_provider(target_provider).get_existing_components(project_dir)
-      components = []
-      if not status['config']:
-        components.append('config')
-      if status['commands'] == 0:
-        components.append('commands')
-    else:
-      components = ['config', 'commands']
+  plan = {}
+  for target_provider in targets:
+    components = _target_components(detector, project_dir, target_provider, requested, force)
+    if components is not None:
+      plan[target_provider] = components
+  if not plan:
+    return
 
-  # Find source providers for migration
-  migrate_from = []
-  if migrate:
-    configured = detector.get_configured_providers(project_dir)
-    migrate_from = [p for p in configured if p != target_provider]
+  # Find source providers for migration (each target skips itself)
+  migrate_from = detector.get_configured_providers(project_dir) if migrate else []
 
-  console.print(
-    f"\n[bold green]Adding {target_provider} with components: {', '.join(components)}[/bold green]"
-  )
-  if migrate_from:
-    console.print(f"[cyan]Migrating content from: {', '.join(migrate_from)}[/cyan]")
+  for target_provider, components in plan.items():
+    console.print(
+      f"\n[bold green]Adding {target_provider} with components: "
+      f"{', '.join(components)}[/bold green]"
+    )
+    sources = [p for p in migrate_from if p != target_provider]
+    if sources:
+      console.print(f"[cyan]Migrating content from: {', '.join(sources)}[/cyan]")
 
   try:
-    # Generate configuration files
-    files = generator.generate_provider_config(
+    # Generate targets concurrently from one load of the sources, writing files as they arrive
+    files = generator.stream_targets(
       project_dir=project_dir,
-      provider_name=target_provider,
-      components=components,
-      migrate_from=migrate_from if migrate else None,
+      targets=plan,
+      migrate_from=migrate_from,
+      priority=prefer.split(',') if prefer else None,
     )
 
-    # Write files to disk
-    written_files = generator.write_config_files(project_dir=project_dir, files=files, force=force)
+    for conflicts in generator.target_conflicts.values():
+      for conflict in conflicts:
+        console.print(
+          f"[yellow]Command '{conflict.name}' differs between providers; "
+          f"using {conflict.kept}, skipped {', '.join(conflict.dropped)}[/yellow]"
+        )
+
+    written_files = generator.write_config_stream(project_dir=project_dir, items=files, force=force)
 
     if written_files:
       console.print(f'[green]Created {len(written_files)} files:[/green]')
@@ -148,14 +149,66 @@ def add(
 
       # Open in editor if requested
       if editor:
-        generator.open_in_editor(project_dir, target_provider, components)
+        written = set(written_files)
+        for target_provider, target_files in generator.target_files.items():
+          if written.intersection(target_files):
+            generator.open_in_editor(project_dir, target_provider, plan[target_provider])
     else:
       console.print('[yellow]No new files created (use --force to overwrite)[/yellow]')
 
   except Exception as e:
-    console.print(f'[red]Error adding {target_provider}: {e}[/red]')
+    console.print(f"[red]Error adding {', '.join(plan)}: {e}[/red]")
     raise typer.Exit(1)
 
   # Show final status
   console.print('\n[bold cyan]Updated configuration status:[/bold cyan]')
   console.print(detector.format_provider_status(project_dir))
+
+
+def _target_components(
+  detector: ProjectDetector,
+  project_dir: Path,
+  target_provider: str,
+  requested: List[str],
+  force: bool,
+) -> Optional[List[str]]:
+  """Components to add for one target, or None if it is complete and not forced."""
+  provider_obj = detector.get_provider(target_provider)
+  snapshot = detector.snapshot(project_dir)
+
+  # Check if target provider already exists
+  if provider_obj.detect_existing(project_dir, snapshot):
+    console.print(f'[yellow]{target_provider} is already configured.[/yellow]')
+
+    # Show what components exist and what's missing
+    status = provider_obj.get_existing_components(project_dir, snapshot)
+    missing_components = []
+    if not status['config']:
+      missing_components.append('config')
+    if status['commands'] == 0:
+      missing_components.append('commands')
+    if status['prompts'] == 0:
+      missing_components.append('prompts')
+    if target_provider == 'claude' and not status['agents']:
+      missing_components.append('agents')
+
+    if missing_components:
+      console.print(f"[cyan]Missing components: {', '.join(missing_components)}[/cyan]")
+    else:
+      console.print('[green]All components are configured.[/green]')
+      if not force:
+        return None
+
+  if requested:
+    return requested
+
+  # Default to missing components if none specified
+  if provider_obj.detect_existing(project_dir, snapshot):
+    status = provider_obj.get_existing_components(project_dir, snapshot)
+    components = []
+    if not status['config']:
+      components.append('config')
+    if status['commands'] == 0:
+      components.append('commands')
+    return components
+  return ['config', 'commands']
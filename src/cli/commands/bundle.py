@@ -0,0 +1,71 @@
+"""Export provider configurations to a bundle and import them into a project."""
+
+from pathlib import Path
+from typing import List
+
+import typer
+from rich.console import Console
+
+from ...core.atomic import Durability
+from ...core.bundle import export_bundle, import_bundle
+
+console = Console()
+
+
+def export(
+  output: Path = typer.Argument(
+    ..., help='Bundle to write: .tar.gz/.tgz (default), .tar or .zip', dir_okay=False
+  ),
+  providers: List[str] = typer.Option(
+    None, '--provider', help='Export only this provider (repeatable)'
+  ),
+):
+  """Pack every provider's config, commands and prompts into one archive."""
+  try:
+    manifest = export_bundle(Path.cwd(), output, providers or None)
+  except (OSError, ValueError) as e:
+    console.print(f'[red]Cannot export to {output}: {e}[/red]')
+    raise typer.Exit(1)
+
+  files = manifest['files']
+  if not files:
+    console.print('[yellow]No provider files found; wrote an empty bundle.[/yellow]')
+    return
+  total = sum(entry['size'] for entry in files.values())
+  providers_found = sorted({entry['provider'] for entry in files.values()})
+  console.print(
+    f'[green]Exported {len(files)} files ({total} bytes) from {", ".join(providers_found)} '
+    f'to {output}[/green]'
+  )
+
+
+def import_(
+  archive: Path = typer.Argument(
+    ..., help='Bundle written by aiproj export', exists=True, dir_okay=False
+  ),
+  force: bool = typer.Option(False, '--force', help='Overwrite existing files that differ'),
+  dry_run: bool = typer.Option(False, '--dry-run', help='Show what would change'),
+  durability: Durability = typer.Option(
+    Durability.none, '--durability', help='fsync policy for written files: none, batch or strict'
+  ),
+):
+  """Write the files of a bundle into this project, skipping ones already up to date."""
+  try:
+    result = import_bundle(Path.cwd(), archive, force=force, dry_run=dry_run, durability=durability)
+  except (OSError, ValueError) as e:
+    console.print(f'[red]Cannot import {archive}: {e}[/red]')
+    raise typer.Exit(1)
+
+  verb = 'Would write' if dry_run else 'Wrote'
+  if result.written:
+    console.print(f'[green]{verb} {len(result.written)} files:[/green]')
+    for file_path in result.written:
+      console.print(f'  • {file_path}')
+
+  if result.skipped:
+    console.print(f'[yellow]Kept {len(result.skipped)} existing files (use --force):[/yellow]')
+    for file_path in result.skipped:
+      console.print(f'  • {file_path}')
+
+  if not result.written and not result.skipped:
+    console.print(f'[green]Everything up to date ({result.unchanged} files unchanged).[/green]')
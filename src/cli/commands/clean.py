@@ -1,30 +1,58 @@
 """Clean (remove) AI provider configurations."""
 
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 import typer
 from rich.console import Console
 from rich.prompt import Confirm, Prompt
 
 from ...core.detector import ProjectDetector
+from ...core.trash import Trash, TrashBatch
+from .. import complete
 
 console = Console()
 
 
+def _complete_provider(incomplete: str) -> List[str]:
+  """Shell completion for the provider argument."""
+  return complete.clean_providers(complete.load_words())
+
+
+def _complete_command(ctx: typer.Context, incomplete: str) -> List[str]:
+  """Shell completion for --command: names that exist for the chosen provider."""
+  return complete.command_names(complete.load_words(), ctx.params.get('provider'))
+
+
 def clean(
-  provider: str = typer.Argument(None, help='Provider to remove (claude, gemini, codex)'),
+  provider: str = typer.Argument(
+    None, help='Provider to remove (claude, gemini, codex)', autocompletion=_complete_provider
+  ),
   config: bool = typer.Option(False, '--config', help='Remove only main config files'),
   commands: bool = typer.Option(False, '--commands', help='Remove only command templates'),
   prompts: bool = typer.Option(False, '--prompts', help='Remove only prompt templates'),
   agents: bool = typer.Option(False, '--agents', help='Remove only agents configuration'),
   all_components: bool = typer.Option(False, '--all', help='Remove all components'),
   force: bool = typer.Option(False, '--force', help='Skip confirmation prompts'),
+  purge: bool = typer.Option(
+    False, '--purge', help='Delete immediately instead of keeping them for aiproj undo'
+  ),
+  command_names: List[str] = typer.Option(
+    None,
+    '--command',
+    help='Remove only this command or prompt (repeatable)',
+    autocompletion=_complete_command,
+  ),
 ):
   """Remove AI provider configurations."""
   project_dir = Path.cwd()
   detector = ProjectDetector()
 
+  if command_names:
+    _clean_commands(project_dir, detector, provider, command_names, force, purge)
+    return
+
   # Show current status
   console.print('[bold cyan]Current configuration status:[/bold cyan]')
   console.print(detector.format_provider_status(project_dir))
@@ -52,15 +80,24 @@ def clean(
     if not force and not Confirm.ask('[red]Remove all AI provider configurations?[/red]'):
       return
 
-    for provider_name in detector.get_configured_providers(project_dir):
-      _remove_provider(project_dir, provider_name, ['config', 'commands', 'prompts', 'agents'])
+    all_parts = ['config', 'commands', 'prompts', 'agents']
+    batch, _ = _remove_providers(
+      project_dir,
+      {name: all_parts for name in detector.get_configured_providers(project_dir)},
+      'clean all',
+      purge,
+    )
+    detector.invalidate(project_dir)
 
     console.print('[green]All providers removed.[/green]')
+    _print_undo_hint(batch, purge)
     return
 
   # Check if target provider exists
   provider_obj = detector.get_provider(target_provider)
-  if not provider_obj or not provider_obj.detect_existing(project_dir):
+  if not provider_obj or not provider_obj.detect_existing(
+    project_dir, detector.snapshot(project_dir)
+  ):
     console.print(f'[yellow]{target_provider} is not configured.[/yellow]')
     return
 
@@ -87,12 +124,16 @@ def clean(
     return
 
   # Remove components
-  removed_items = _remove_provider(project_dir, target_provider, components)
+  batch, removed_items = _remove_providers(
+    project_dir, {target_provider: components}, f'clean {target_provider}', purge
+  )
+  detector.invalidate(project_dir)
 
   if removed_items:
     console.print(f'[green]Removed {len(removed_items)} items:[/green]')
     for item in removed_items:
       console.print(f'  • {item}')
+    _print_undo_hint(batch, purge)
   else:
     console.print('[yellow]No items were removed.[/yellow]')
 
@@ -101,31 +142,70 @@ def clean(
   console.print(detector.format_provider_status(project_dir))
 
 
-def _remove_provider(project_dir: Path, provider_name: str, components: list) -> list:
-  """Remove specified components for a provider."""
+def _clean_commands(
+  project_dir: Path,
+  detector: ProjectDetector,
+  provider: str,
+  names: List[str],
+  force: bool,
+  purge: bool,
+):
+  """Remove the named commands and prompts from one provider, or from every configured one."""
+  snapshot = detector.snapshot(project_dir)
+  if provider and provider != 'all':
+    if provider not in detector.get_all_providers():
+      console.print(f'[red]Unknown provider: {provider}[/red]')
+      raise typer.Exit(1)
+    providers = [provider]
+  else:
+    providers = detector.get_configured_providers(project_dir)
+
+  wanted = set(names)
+  matches = [
+    rel_path
+    for name in providers
+    for rel_path in detector.get_provider(name).command_files(project_dir, snapshot)
+    if Path(rel_path).stem in wanted
+  ]
+  missing = wanted - {Path(rel_path).stem for rel_path in matches}
+  for name in sorted(missing):
+    console.print(f'[yellow]No command named {name}.[/yellow]')
+  if not matches:
+    raise typer.Exit(1)
+
+  if not force and not Confirm.ask(f'Remove {len(matches)} command files?'):
+    return
+
+  trash = Trash(project_dir)
+  batch = trash.new_batch()
+  batch.description = f"clean --command {' '.join(names)}"
+  removed_items = [rel_path for rel_path in matches if batch.move(rel_path)]
+  _finish_batch(trash, batch, purge)
+  detector.invalidate(project_dir)
+
+  console.print(f'[green]Removed {len(removed_items)} items:[/green]')
+  for item in removed_items:
+    console.print(f'  • {item}')
+  _print_undo_hint(batch, purge)
+
+
+def _remove_provider(batch: TrashBatch, provider_name: str, components: list) -> list:
+  """Move the specified components of a provider into the trash batch."""
+  project_dir = batch.project_dir
   removed_items = []
 
   if provider_name == 'claude':
-    if 'config' in components:
-      config_file = project_dir / 'CLAUDE.md'
-      if config_file.exists():
-        config_file.unlink()
-        removed_items.append('CLAUDE.md')
-
-    if 'commands' in components:
-      commands_dir = project_dir / '.claude' / 'commands'
-      if commands_dir.exists():
-        shutil.rmtree(commands_dir)
-        removed_items.append('.claude/commands/')
+    if 'config' in components and batch.move('CLAUDE.md'):
+      removed_items.append('CLAUDE.md')
+
+    if 'commands' in components and batch.move('.claude/commands'):
+      removed_items.append('.claude/commands/')
 
     # For Claude Code, prompts are stored as commands in .claude/commands/
     # No separate prompts directory to clean
 
-    if 'agents' in components:
-      agents_file = project_dir / 'agents.md'
-      if agents_file.exists():
-        agents_file.unlink()
-        removed_items.append('agents.md')
+    if 'agents' in components and batch.move('agents.md'):
+      removed_items.append('agents.md')
 
     # Clean up empty .claude directory
     claude_dir = project_dir / '.claude'
@@ -134,31 +214,65 @@ def _remove_provider(project_dir: Path, provider_name: str, components: list) ->
       removed_items.append('.claude/')
 
   elif provider_name in ['gemini', 'codex']:
-    if 'config' in components:
-      config_file = project_dir / f'.{provider_name}'
-      if config_file.exists():
-        if config_file.is_file():
-          config_file.unlink()
-        else:
-          shutil.rmtree(config_file)
-        removed_items.append(f'.{provider_name}')
+    if 'config' in components and batch.move(f'.{provider_name}'):
+      removed_items.append(f'.{provider_name}')
 
     provider_dir = project_dir / f'.{provider_name}'
     if provider_dir.exists() and provider_dir.is_dir():
-      if 'commands' in components:
-        commands_dir = provider_dir / 'commands'
-        if commands_dir.exists():
-          shutil.rmtree(commands_dir)
-          removed_items.append(f'.{provider_name}/commands/')
-
-      if 'prompts' in components:
-        prompts_dir = provider_dir / 'prompts'
-        if prompts_dir.exists():
-          shutil.rmtree(prompts_dir)
-          removed_items.append(f'.{provider_name}/prompts/')
+      if 'commands' in components and batch.move(f'.{provider_name}/commands'):
+        removed_items.append(f'.{provider_name}/commands/')
+
+      if 'prompts' in components and batch.move(f'.{provider_name}/prompts'):
+        removed_items.append(f'.{provider_name}/prompts/')
 
       # Clean up empty provider directory
       if not any(provider_dir.iterdir()):
         provider_dir.rmdir()
 
   return removed_items
+
+
+def _remove_providers(
+  project_dir: Path, components_by_provider: Dict[str, list], description: str, purge: bool
+) -> Tuple[TrashBatch, list]:
+  """Move several providers' components into one trash batch, concurrently.
+
+  Each move is a single rename, however large the directory, so the batch can be
+  restored with ``aiproj undo``. With ``purge`` the batch is deleted right away;
+  otherwise batches that fell out of the undo window are deleted by a detached
+  process.
+  """
+  trash = Trash(project_dir)
+  batch = trash.new_batch()
+  batch.description = description
+
+  with ThreadPoolExecutor(max_workers=max(len(components_by_provider), 1)) as executor:
+    futures = {
+      name: executor.submit(_remove_provider, batch, name, components)
+      for name, components in components_by_provider.items()
+    }
+    removed_items = [item for future in futures.values() for item in future.result()]
+  _finish_batch(trash, batch, purge)
+  return batch, removed_items
+
+
+def _finish_batch(trash: Trash, batch: TrashBatch, purge: bool):
+  """Save a non-empty batch and delete it right away with ``purge``, then expire old batches.
+
+  ``purge`` deletes only this run's batch, so an earlier clean can still be undone.
+  """
+  if not batch.entries:
+    batch.discard()
+  else:
+    # Saved even with purge, so an interrupted delete leaves a batch purge can find
+    batch.save()
+    if purge:
+      trash.delete(batch)
+
+  if trash.expired():
+    trash.purge_in_background()
+
+
+def _print_undo_hint(batch: TrashBatch, purge: bool):
+  if batch.entries and not purge:
+    console.print(f'[dim]Moved to .aiproj/trash/{batch.name}; run `aiproj undo` to restore.[/dim]')
@@ -0,0 +1,67 @@
+"""Manage a project's prompts in the global Codex prompts directory."""
+
+from pathlib import Path
+
+import typer
+from rich.console import Console
+
+from ...core.atomic import LinkMode
+from ...core.codex_install import CodexInstaller, InstallResult
+
+console = Console()
+
+app = typer.Typer(
+  help='Install project Codex prompts into $CODEX_HOME/prompts.', no_args_is_help=True
+)
+
+
+@app.command()
+def install(
+  prefix: str = typer.Option(
+    None, '--prefix', help='Prepend to installed prompt names (remembered for later installs)'
+  ),
+  link: LinkMode = typer.Option(
+    None,
+    '--link',
+    help='Install prompts as copies, hard links or symlinks (remembered; default: copy)',
+  ),
+  force: bool = typer.Option(
+    False, '--force', help='Replace prompts installed by other projects or by hand'
+  ),
+  dry_run: bool = typer.Option(False, '--dry-run', help='Show what would change'),
+):
+  """Install new and changed prompts from .codex/prompts and remove deleted ones."""
+  installer = CodexInstaller(Path.cwd())
+  result = installer.install(prefix=prefix, link=link, force=force, dry_run=dry_run)
+  _report(result, installer, dry_run)
+  if result.collisions:
+    raise typer.Exit(1)
+
+
+@app.command()
+def uninstall():
+  """Remove every prompt this project installed."""
+  installer = CodexInstaller(Path.cwd())
+  _report(installer.uninstall(), installer, dry_run=False)
+
+
+def _report(result: InstallResult, installer: CodexInstaller, dry_run: bool):
+  verb = 'Would install' if dry_run else 'Installed'
+  if result.installed:
+    console.print(
+      f'[green]{verb} {len(result.installed)} prompts in {installer.prompts_dir}:[/green]'
+    )
+    for name in result.installed:
+      console.print(f'  • {name}')
+
+  verb = 'Would remove' if dry_run else 'Removed'
+  if result.removed:
+    console.print(f'[green]{verb} {len(result.removed)} prompts:[/green]')
+    for name in result.removed:
+      console.print(f'  • {name}')
+
+  for collision in result.collisions:
+    console.print(f'[yellow]Skipped {collision}[/yellow]')
+
+  if not result.installed and not result.removed and not result.collisions:
+    console.print(f'[green]Everything up to date ({result.unchanged} prompts unchanged).[/green]')
@@ -6,6 +6,7 @@ import typer
 from rich.console import Console
 from rich.prompt import Prompt
 
+from ...core.atomic import Durability
 from ...core.detector import ProjectDetector
 from ...core.generator import ConfigGenerator
 
@@ -23,11 +24,14 @@ def init(
   prompts: bool = typer.Option(False, '--prompts', help='Generate only prompt templates'),
   agents: bool = typer.Option(False, '--agents', help='Generate only agents configuration'),
   all_components: bool = typer.Option(False, '--all', help='Generate all components'),
+  durability: Durability = typer.Option(
+    Durability.none, '--durability', help='fsync policy for written files: none, batch or strict'
+  ),
 ):
   """Initialize AI provider configurations for a project."""
   project_dir = Path.cwd()
   detector = ProjectDetector()
-  generator = ConfigGenerator()
+  generator = ConfigGenerator(detector, durability)
 
   # Determine which providers to initialize
   selected_providers = []
@@ -91,42 +95,51 @@ def init(
   if not components:
     components = ['config', 'commands']
 
-  # Initialize each selected provider
+  # Validate providers
+  plan = {}
   for provider_name in selected_providers:
-    console.print(f'\n[bold green]Initializing {provider_name}...[/bold green]')
-
-    # Validate provider exists
-    if not detector.get_provider(provider_name):
+    if detector.get_provider(provider_name):
+      plan[provider_name] = components
+    else:
       console.print(f'[red]Unknown provider: {provider_name}[/red]')
+
+  # Generate every provider's files concurrently and write them in one pass; a provider whose
+  # generation or writes fail is reported without keeping the others from being initialized
+  errors = {}
+  generated = generator.generate_targets(project_dir=project_dir, targets=plan, errors=errors)
+  files = {
+    path: content for target_files in generated.values() for path, content in target_files.items()
+  }
+  write_errors = {}
+  written = set(generator.write_config_files(project_dir, files, force=force, errors=write_errors))
+  for provider_name, target_files in generated.items():
+    failed = [path for path in target_files if path in write_errors]
+    if failed:
+      errors[provider_name] = write_errors[failed[0]]
+
+  for provider_name in plan:
+    console.print(f'\n[bold green]Initializing {provider_name}...[/bold green]')
+    if provider_name in errors:
+      console.print(f'[red]Error initializing {provider_name}: {errors[provider_name]}[/red]')
       continue
+    target_files = generated[provider_name]
+    written_files = [file_path for file_path in target_files if file_path in written]
 
-    try:
-      # Generate configuration files
-      files = generator.generate_provider_config(
-        project_dir=project_dir, provider_name=provider_name, components=components
-      )
+    if written_files:
+      console.print(f'[green]Created {len(written_files)} files:[/green]')
+      for file_path in written_files:
+        console.print(f'  • {file_path}')
 
-      # Write files to disk
-      written_files = generator.write_config_files(
-        project_dir=project_dir, files=files, force=force
+      # Open in editor if requested
+      if editor:
+        generator.open_in_editor(project_dir, provider_name, components)
+    else:
+      console.print(
+        f'[yellow]No new files created for {provider_name} (use --force to overwrite)[/yellow]'
       )
 
-      if written_files:
-        console.print(f'[green]Created {len(written_files)} files:[/green]')
-        for file_path in written_files:
-          console.print(f'  • {file_path}')
-
-        # Open in editor if requested
-        if editor:
-          generator.open_in_editor(project_dir, provider_name, components)
-      else:
-        console.print(
-          f'[yellow]No new files created for {provider_name} (use --force to overwrite)[/yellow]'
-        )
-
-    except Exception as e:
-      console.print(f'[red]Error initializing {provider_name}: {e}[/red]')
-
   # Show final status
   console.print('\n[bold cyan]Final configuration status:[/bold cyan]')
   console.print(detector.format_provider_status(project_dir))
+  if errors:
+    raise typer.Exit(1)
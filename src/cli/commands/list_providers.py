@@ -1,22 +1,67 @@
 """List AI provider configurations and status."""
 
+from enum import Enum
 from pathlib import Path
+from typing import Any, Dict, List
 
+import typer
 from rich.console import Console
 from rich.table import Table
 
+from ...core.cache import StatusCache
+from ...core.daemon_client import try_call
 from ...core.detector import ProjectDetector
+from ...core.discovery import discover_provider_configs
+from ...core.fleet import FleetSummary, expand_roots, iter_fleet_status
+from ..machine import write_listing
 
 console = Console()
 
 
-def list_providers():
+class OutputFormat(str, Enum):
+  """Output formats for provider status."""
+
+  table = 'table'
+  json = 'json'
+  ndjson = 'ndjson'
+
+
+def list_providers(
+  recursive: bool = typer.Option(
+    False, '--recursive', '-r', help='Find provider configs in nested directories'
+  ),
+  roots: str = typer.Option(
+    None, '--roots', help='File listing repository roots, or a glob such as "~/src/*"'
+  ),
+  output_format: OutputFormat = typer.Option(
+    OutputFormat.table, '--format', help='Output format: table, json or ndjson'
+  ),
+  jobs: int = typer.Option(32, '--jobs', '-j', min=1, help='Repositories to read concurrently'),
+  no_cache: bool = typer.Option(False, '--no-cache', help='Ignore the provider status cache'),
+):
   """List configured AI providers and their status."""
   project_dir = Path.cwd()
-  detector = ProjectDetector()
 
-  # Get detailed status for all providers
-  status = detector.get_provider_status(project_dir)
+  if output_format != OutputFormat.table:
+    exit_code = write_listing(output_format.value, project_dir, recursive, roots, jobs, no_cache)
+    raise typer.Exit(exit_code)
+
+  detector = ProjectDetector(cache=None if no_cache else StatusCache())
+
+  if roots:
+    _list_fleet(expand_roots(roots), detector, jobs)
+    return
+
+  if recursive:
+    _list_recursive(project_dir, detector)
+    return
+
+  # Get detailed status for all providers (from a running daemon if there is one)
+  records = None if no_cache else try_call('status', {'project': str(project_dir)})
+  if records is not None:
+    status = {record['provider']: record for record in records}
+  else:
+    status = detector.get_provider_status(project_dir)
 
   # Create table
   table = Table(title='AI Provider Configuration Status')
@@ -77,3 +122,78 @@ def list_providers():
     console.print(
       "\n[yellow]No AI providers configured yet. Run 'aiproj init' to get started.[/yellow]"
     )
+
+
+def _list_recursive(project_dir: Path, detector: ProjectDetector):
+  """Show every nested directory that holds provider configurations."""
+  projects = discover_provider_configs(project_dir, detector)
+
+  if not projects:
+    console.print('[yellow]No AI provider configurations found.[/yellow]')
+    return
+
+  provider_names = list(detector.get_all_providers())
+  table = Table(title='AI Provider Configurations (recursive)')
+  table.add_column('Path', style='bold')
+  for name in provider_names:
+    table.add_column(name)
+
+  for project in projects:
+    table.add_row(
+      str(project.path), *[_summarize(project.status[name]) for name in provider_names]
+    )
+
+  console.print(table)
+  console.print(f'\n[green]Found provider configs in {len(projects)} directories[/green]')
+
+
+def _summarize(components: Dict[str, Any]) -> str:
+  """Compact single-cell summary of a provider's components."""
+  parts = []
+  if components['config']:
+    parts.append('config')
+  if components['commands']:
+    parts.append(f"{components['commands']} commands")
+  if components['prompts']:
+    parts.append(f"{components['prompts']} prompts")
+  return ', '.join(parts) if parts else '-'
+
+
+def _list_fleet(roots: List[Path], detector: ProjectDetector, jobs: int):
+  """Stream one result per repository as it completes, then print totals."""
+  if not roots:
+    console.print('[yellow]No repository roots matched.[/yellow]')
+    raise typer.Exit(1)
+
+  provider_names = list(detector.get_all_providers())
+  summary = FleetSummary()
+  path_width = min(max(len('Repository'), *(len(str(root)) for root in roots)), 40)
+
+  console.print(_fleet_table(provider_names, path_width, show_header=True))
+
+  for result in iter_fleet_status(roots, max_workers=jobs, detector=detector):
+    summary.add(result)
+    if result.error is not None:
+      console.print(f'[red]{result.root}: {result.error}[/red]', highlight=False)
+    else:
+      table = _fleet_table(provider_names, path_width, show_header=False)
+      table.add_row(str(result.root), *[_summarize(result.status[name]) for name in provider_names])
+      console.print(table)
+
+  configured = ', '.join(f'{name} {summary.providers.get(name, 0)}' for name in provider_names)
+  console.print(
+    f'\n[green]Scanned {summary.roots} repositories: {configured}, '
+    f'{summary.unconfigured} unconfigured[/green]'
+  )
+  if summary.errors:
+    console.print(f'[red]{summary.errors} repositories could not be read[/red]')
+
+
+def _fleet_table(provider_names: List[str], path_width: int, show_header: bool) -> Table:
+  """Fixed-width table so rows printed one at a time line up."""
+  table = Table(show_header=show_header, show_edge=False, box=None, pad_edge=False)
+  table.add_column('Repository', style='bold', width=path_width, no_wrap=True)
+  for name in provider_names:
+    table.add_column(name, width=20, no_wrap=True)
+  return table
+
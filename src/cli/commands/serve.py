@@ -0,0 +1,46 @@
+"""Run the aiproj daemon that answers editor and CLI queries from memory."""
+
+from pathlib import Path
+
+import typer
+from rich.console import Console
+
+from ...core.daemon import DaemonServer
+from ...core.daemon import serve as run_daemon
+from ...core.daemon_client import DaemonError, DaemonUnavailable, call, socket_path
+
+console = Console()
+
+
+def serve(
+  socket: Path = typer.Option(
+    None, '--socket', help='Unix socket to listen on (default: $AIPROJ_SOCKET or runtime dir)'
+  ),
+  idle_timeout: float = typer.Option(
+    None, '--idle-timeout', min=0.0, help='Exit after this many seconds without a request'
+  ),
+  poll: bool = typer.Option(False, '--poll', help='Poll for changes instead of using inotify'),
+  stop: bool = typer.Option(False, '--stop', help='Ask the running daemon to exit'),
+):
+  """Keep project state warm and answer status queries over a Unix socket."""
+  path = socket or socket_path()
+
+  if stop:
+    try:
+      call('shutdown', path=path)
+    except (DaemonUnavailable, DaemonError):
+      console.print(f'[yellow]No daemon is listening on {path}.[/yellow]')
+      raise typer.Exit(1)
+    console.print(f'[green]Stopped the daemon on {path}.[/green]')
+    return
+
+  def ready(server: DaemonServer):
+    console.print(f'[bold cyan]Serving on {server.path}.[/bold cyan] Ctrl+C stops.')
+
+  try:
+    run_daemon(path, poll=poll, idle_timeout=idle_timeout, ready=ready)
+  except OSError as e:
+    console.print(f'[red]Cannot serve: {e}[/red]')
+    raise typer.Exit(1)
+  except KeyboardInterrupt:
+    console.print('\n[yellow]Stopped serving.[/yellow]')
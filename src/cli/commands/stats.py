@@ -0,0 +1,79 @@
+"""Show recorded run metrics and export them for monitoring."""
+
+import json
+from enum import Enum
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from ...core.metrics import MetricsStore, summarize, write_textfile
+
+console = Console()
+
+
+class StatsFormat(str, Enum):
+  """Output formats for run metrics."""
+
+  table = 'table'
+  json = 'json'
+
+
+def stats(
+  command: str = typer.Argument(None, help='Only show runs of this command (e.g. add, list)'),
+  export: Path = typer.Option(
+    None, '--export', help='Write a Prometheus textfile (for node_exporter) to this path'
+  ),
+  output_format: StatsFormat = typer.Option(
+    StatsFormat.table, '--format', help='Output format: table or json'
+  ),
+):
+  """Show timing percentiles and I/O counters of recorded aiproj runs."""
+  store = MetricsStore()
+  records = [r for r in store.records() if command is None or r.get('command') == command]
+
+  if export:
+    totals = {name: values for name, values in store.totals().items() if command in (None, name)}
+    write_textfile(export, records, totals)
+    console.print(f'[green]Wrote metrics for {len(records)} runs to {export}[/green]')
+    return
+
+  summary = summarize(records)
+  if output_format == StatsFormat.json:
+    typer.echo(json.dumps(summary, indent=2))
+    return
+
+  if not summary:
+    console.print(f'[yellow]No runs recorded yet ({store.path}).[/yellow]')
+    return
+
+  table = Table(title='aiproj run metrics')
+  table.add_column('Command', style='bold')
+  for column in ('Runs', 'Failed', 'p50', 'p90', 'p99', 'Max', 'Read', 'Written', 'Stats'):
+    table.add_column(column, justify='right')
+
+  for name, row in summary.items():
+    table.add_row(
+      name,
+      str(row['runs']),
+      str(row['failures']),
+      *(_ms(row[key]) for key in ('p50_ms', 'p90_ms', 'p99_ms', 'max_ms')),
+      f'{row["files_read"]} files',
+      _bytes(row['bytes_written']),
+      str(row['stats']),
+    )
+  console.print(table)
+  console.print(f'[dim]{store.path}[/dim]')
+
+
+def _ms(value: float) -> str:
+  return f'{value:.1f} ms' if value < 1000 else f'{value / 1000:.2f} s'
+
+
+def _bytes(value: int) -> str:
+  for unit in ('B', 'KiB', 'MiB'):
+    if value < 1024:
+      return f'{value:.0f} {unit}'
+    value /= 1024
+  return f'{value:.1f} GiB'
@@ -0,0 +1,55 @@
+"""Synchronize commands across configured AI providers."""
+
+from pathlib import Path
+
+import typer
+from rich.console import Console
+
+from ...core.atomic import Durability, LinkMode
+from ...core.detector import ProjectDetector
+from ...core.generator import ConfigGenerator
+from ...core.sync import CommandSync
+
+console = Console()
+
+
+def sync(
+  dry_run: bool = typer.Option(False, '--dry-run', help='Show what would change'),
+  force: bool = typer.Option(False, '--force', help='Overwrite outputs edited since last sync'),
+  durability: Durability = typer.Option(
+    Durability.none, '--durability', help='fsync policy for written files: none, batch or strict'
+  ),
+  link: LinkMode = typer.Option(
+    LinkMode.copy, '--link', help='Outputs identical to their source: copy, hard or sym link'
+  ),
+):
+  """Mirror commands between configured providers, converting only what changed."""
+  project_dir = Path.cwd()
+  detector = ProjectDetector()
+  generator = ConfigGenerator(detector, durability, link)
+
+  configured = detector.get_configured_providers(project_dir)
+  if len(configured) < 2:
+    console.print('[yellow]Sync needs at least two configured providers.[/yellow]')
+    return
+
+  console.print(f"[cyan]Syncing commands between: {', '.join(configured)}[/cyan]")
+  result = CommandSync(project_dir, generator).run(configured, dry_run=dry_run, force=force)
+
+  verb = 'Would write' if dry_run else 'Wrote'
+  if result.written:
+    console.print(f'[green]{verb} {len(result.written)} files:[/green]')
+    for file_path in result.written:
+      console.print(f'  • {file_path}')
+
+  verb = 'Would delete' if dry_run else 'Deleted'
+  if result.deleted:
+    console.print(f'[green]{verb} {len(result.deleted)} files:[/green]')
+    for file_path in result.deleted:
+      console.print(f'  • {file_path}')
+
+  for conflict in result.conflicts:
+    console.print(f'[yellow]Skipped {conflict}[/yellow]')
+
+  if not result.written and not result.deleted:
+    console.print(f'[green]Everything up to date ({result.unchanged} commands unchanged).[/green]')
@@ -0,0 +1,33 @@
+"""Undo the last clean by moving its files back out of the trash."""
+
+from pathlib import Path
+
+import typer
+from rich.console import Console
+
+from ...core.trash import Trash
+
+console = Console()
+
+
+def undo():
+  """Restore the files removed by the last aiproj clean."""
+  project_dir = Path.cwd()
+  batch = Trash(project_dir).latest()
+  if batch is None:
+    console.print('[yellow]Nothing to undo: the trash is empty.[/yellow]')
+    raise typer.Exit(1)
+
+  restored, skipped = batch.restore()
+
+  console.print(f'[green]Restored {len(restored)} items from {batch.description}:[/green]')
+  for item in restored:
+    console.print(f'  • {item}')
+  if skipped:
+    console.print(
+      f'[yellow]Left {len(skipped)} items in .aiproj/trash/{batch.name} '
+      'because their original path exists again:[/yellow]'
+    )
+    for item in skipped:
+      console.print(f'  • {item}')
+    raise typer.Exit(1)
@@ -0,0 +1,73 @@
+"""Watch provider commands and mirror edits across providers."""
+
+from pathlib import Path
+
+import typer
+from rich.console import Console
+
+from ...core.atomic import Durability
+from ...core.detector import ProjectDetector
+from ...core.generator import ConfigGenerator
+from ...core.sync import CommandSync, SyncResult
+from ...core.watcher import PollingWatcher, Watcher, create_watcher
+
+console = Console()
+
+
+def watch(
+  debounce: float = typer.Option(
+    0.3, '--debounce', min=0.0, help='Seconds of quiet before a batch of edits is mirrored'
+  ),
+  max_delay: float = typer.Option(
+    2.0, '--max-delay', min=0.0, help='Longest a continuous burst of edits is held back'
+  ),
+  poll: bool = typer.Option(False, '--poll', help='Poll for changes instead of using inotify'),
+  durability: Durability = typer.Option(
+    Durability.none, '--durability', help='fsync policy for written files: none, batch or strict'
+  ),
+):
+  """Mirror command edits to the other configured providers as they happen."""
+  project_dir = Path.cwd()
+  detector = ProjectDetector()
+  generator = ConfigGenerator(detector, durability)
+  syncer = CommandSync(project_dir, generator)
+
+  specs = detector.providers.specs.values()
+  watcher = create_watcher(
+    project_dir,
+    config_files=[name for spec in specs for name in spec.config_files],
+    directories=[directory for spec in specs for directory in spec.directories],
+    poll=poll,
+  )
+
+  mode = 'polling' if isinstance(watcher, PollingWatcher) else 'inotify'
+  console.print(f'[bold cyan]Watching provider commands ({mode}).[/bold cyan] Ctrl+C stops.')
+
+  try:
+    _report(syncer.run(), watcher, changes=None)
+    while True:
+      batch = watcher.next_batch(timeout=None, debounce=debounce, max_delay=max_delay)
+      if batch:
+        detector.invalidate(project_dir)
+        _report(syncer.run(), watcher, changes=len(batch))
+  except KeyboardInterrupt:
+    console.print('\n[yellow]Stopped watching.[/yellow]')
+  finally:
+    watcher.close()
+
+
+def _report(result: SyncResult, watcher: Watcher, changes: int = None):
+  """Print one sync pass and ignore the events caused by its own writes."""
+  watcher.suppress(result.written + result.deleted)
+
+  prefix = f'{changes} changes: ' if changes is not None else 'Initial sync: '
+  if not result.written and not result.deleted:
+    console.print(f'{prefix}[dim]nothing to mirror[/dim]')
+  else:
+    console.print(
+      f'{prefix}[green]wrote {len(result.written)}, deleted {len(result.deleted)}[/green]'
+    )
+    for file_path in result.written + result.deleted:
+      console.print(f'  • {file_path}')
+  for conflict in result.conflicts:
+    console.print(f'[yellow]Skipped {conflict}[/yellow]')
@@ -0,0 +1,177 @@
+"""Shell completion answered from the per-project completion cache.
+
+A TAB press runs ``aiproj`` with ``_AIPROJ_COMPLETE`` set. Completing subcommands,
+``add``/``clean`` providers and ``clean --command`` names only needs the cache
+written by ``src.core.completion``, so this module imports nothing beyond the
+standard library and reads one file. Anything else (option names and values,
+other subcommands) and a stale or missing cache return None, and the caller falls
+back to typer's completion, whose callbacks rebuild the cache with ``load_words``.
+"""
+
+import hashlib
+import json
+import os
+import shlex
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+CACHE_VERSION = 1
+
+# Options of the completed subcommands that take a value
+VALUE_OPTIONS = {
+  'add': {'--prefer', '--durability', '--link'},
+  'clean': {'--command'},
+}
+
+
+def complete_var(prog_name: str) -> str:
+  """Environment variable click and typer use to request completions."""
+  return f'_{os.path.basename(prog_name)}_COMPLETE'.replace('-', '_').upper()
+
+
+def read_cache(project_dir: str) -> Optional[Dict[str, Any]]:
+  """The project's completion cache, or None if it is missing or out of date."""
+  base = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+  digest = hashlib.sha1(project_dir.encode()).hexdigest()
+  try:
+    with open(os.path.join(base, 'aiproj', 'completion', f'{digest}.json')) as f:
+      data = json.load(f)
+  except (OSError, ValueError):
+    return None
+  if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+    return None
+  if data.get('project') != project_dir or data.get('signature') != _signature(
+    project_dir, data.get('paths', [])
+  ):
+    return None
+  return data
+
+
+def load_words() -> Dict[str, Any]:
+  """The current directory's cache, rebuilt first if it is stale (imports the detector)."""
+  data = read_cache(os.getcwd())
+  if data is None:
+    from ..core.completion import refresh
+    from .cli import COMMANDS
+
+    data = refresh(Path.cwd(), COMMANDS)
+  return data
+
+
+def add_providers(data: Dict[str, Any], given: List[str]) -> List[str]:
+  """Providers ``aiproj add`` has not been given yet."""
+  return [name for name in data['providers'] if name not in given]
+
+
+def clean_providers(data: Dict[str, Any]) -> List[str]:
+  """Providers ``aiproj clean`` can remove."""
+  return data['configured'] + ['all']
+
+
+def command_names(data: Dict[str, Any], provider: Optional[str] = None) -> List[str]:
+  """Command names of one configured provider, or of all of them."""
+  names = set()
+  for name, provider_names in data['command_names'].items():
+    if provider in (None, 'all', name):
+      names.update(provider_names)
+  return sorted(names)
+
+
+def words(data: Dict[str, Any], args: List[str], incomplete: str) -> Optional[List[str]]:
+  """Completions of ``incomplete`` after ``args``, or None to defer to typer."""
+  if incomplete.startswith('-'):
+    return None
+  if not args:
+    candidates = data['subcommands']
+  else:
+    subcommand, rest = args[0], args[1:]
+    if subcommand not in VALUE_OPTIONS:
+      return None  # global options, or a subcommand completed by typer
+
+    value_options = VALUE_OPTIONS[subcommand]
+    positional = []
+    expects_value = None
+    for arg in rest:
+      if expects_value:
+        expects_value = None
+      elif arg in value_options:
+        expects_value = arg
+      elif not arg.startswith('-'):
+        positional.append(arg)
+
+    if expects_value == '--command':
+      candidates = command_names(data, positional[0] if positional else None)
+    elif expects_value:
+      return None
+    elif subcommand == 'add':
+      candidates = add_providers(data, positional)
+    else:
+      candidates = [] if positional else clean_providers(data)
+  return [word for word in candidates if word.startswith(incomplete)]
+
+
+def complete(prog_name: str) -> Optional[Tuple[str, int]]:
+  """Answer a completion request from the cache.
+
+  Returns:
+      (output, exit code) for the shell, or None to defer to typer
+  """
+  instruction = os.environ.get(complete_var(prog_name), '')
+  shell = instruction.partition('_')[2] if instruction.startswith('complete_') else None
+  if shell == 'bash':
+    cwords = _split(os.environ.get('COMP_WORDS', ''))
+    cword = int(os.environ.get('COMP_CWORD', len(cwords)))
+    args = cwords[1:cword]
+    incomplete = cwords[cword] if cword < len(cwords) else ''
+  elif shell in ('zsh', 'fish'):
+    line = os.environ.get('_TYPER_COMPLETE_ARGS', '')
+    args = _split(line)[1:]
+    incomplete = args.pop() if args and not line.endswith(' ') else ''
+  else:
+    return None
+
+  data = read_cache(os.getcwd())
+  found = words(data, args, incomplete) if data is not None else None
+  if found is None:
+    return None
+
+  if shell == 'bash':
+    return '\n'.join(found), 0
+  if shell == 'zsh':
+    if not found:
+      return '_files', 0
+    quoted = '\n'.join(f'"{_zsh_escape(word)}"' for word in found)
+    return f"_arguments '*: :(({quoted}))'", 0
+  if os.environ.get('_TYPER_COMPLETE_FISH_ACTION') == 'is-args':
+    return '', 0 if found else 1
+  return '\n'.join(found), 0
+
+
+def _signature(project_dir: str, paths: List[str]) -> List[Optional[List[int]]]:
+  """Same as ``src.core.cache.stat_signature``, without importing the core package."""
+  signature = []
+  for rel_path in paths:
+    try:
+      stat = os.stat(os.path.join(project_dir, rel_path))
+    except (FileNotFoundError, NotADirectoryError):
+      signature.append(None)
+    else:
+      signature.append([stat.st_mtime_ns, stat.st_ino, stat.st_size])
+  return signature
+
+
+def _split(line: str) -> List[str]:
+  try:
+    return shlex.split(line)
+  except ValueError:  # an unterminated quote in the word being completed
+    return line.split()
+
+
+def _zsh_escape(word: str) -> str:
+  return (
+    word.replace('"', '""')
+    .replace("'", "''")
+    .replace('$', '\\$')
+    .replace('`', '\\`')
+    .replace(':', r'\\:')
+  )
@@ -0,0 +1,68 @@
+"""Lazy subcommand registry for the aiproj CLI."""
+
+import importlib
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import click
+import typer
+from typer.core import TyperGroup
+
+
+@dataclass(frozen=True)
+class LazyCommand:
+  """A subcommand that is imported only when it is invoked.
+
+  Attributes:
+      import_path: ``module:attribute`` of the command callback, relative to ``src.cli``
+      help: Short help shown in ``aiproj --help`` without importing the command module
+  """
+
+  import_path: str
+  help: str
+
+
+class LazyGroup(TyperGroup):
+  """Typer group that resolves subcommands from a registry on first use.
+
+  ``--help`` listings are rendered from the registry's help strings, so only the
+  subcommand that is actually invoked pays for importing its module (and with it
+  the detector, generator and providers).
+  """
+
+  lazy_commands: Dict[str, LazyCommand] = {}
+
+  def list_commands(self, ctx: click.Context) -> list:
+    """List eagerly registered commands followed by lazy ones, in registry order."""
+    names = list(super().list_commands(ctx))
+    return names + [name for name in self.lazy_commands if name not in names]
+
+  def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+    """Return the loaded command, or a help-only placeholder for a lazy one."""
+    command = super().get_command(ctx, cmd_name)
+    if command is not None:
+      return command
+
+    spec = self.lazy_commands.get(cmd_name)
+    if spec is None:
+      return None
+    return click.Command(cmd_name, help=spec.help, short_help=spec.help)
+
+  def resolve_command(self, ctx: click.Context, args: list):
+    """Import the requested subcommand before click resolves it."""
+    if args and args[0] in self.lazy_commands and args[0] not in self.commands:
+      self.add_command(self.load_command(args[0]), args[0])
+    return super().resolve_command(ctx, args)
+
+  def load_command(self, cmd_name: str) -> click.Command:
+    """Import a lazy subcommand and convert it into a click command."""
+    module_name, attribute = self.lazy_commands[cmd_name].import_path.split(':')
+    module = importlib.import_module(module_name, package=__package__)
+    target = getattr(module, attribute)
+
+    if isinstance(target, typer.Typer):
+      return typer.main.get_command(target)
+
+    sub_app = typer.Typer()
+    sub_app.command(cmd_name)(target)
+    return typer.main.get_command(sub_app)
@@ -0,0 +1,160 @@
+"""Machine-readable ``aiproj list`` output.
+
+Nothing here imports typer or rich: ``src.cli.main`` routes ``aiproj list --format
+json|ndjson`` straight to ``write_listing`` so editor plugins and CI can call it on
+every change without paying for the CLI framework or table rendering. When an
+``aiproj serve`` daemon is running, a single-project listing comes from it and the
+detector is not even imported.
+
+Formats:
+    json: one document; ``{"project", "providers"}`` for a single project,
+        ``{"projects": [...]}`` with ``--recursive`` and ``{"roots", "summary"}``
+        with ``--roots``
+    ndjson: one line per provider per project, or one line per repository
+        followed by a ``{"summary"}`` line with ``--roots``
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..core.daemon_client import try_call
+
+if TYPE_CHECKING:
+  from ..core.detector import ProjectDetector
+  from ..core.fleet import RootStatus
+
+MACHINE_FORMATS = ('json', 'ndjson')
+
+
+def root_record(result: 'RootStatus') -> Dict[str, Any]:
+  """JSON-serializable record for one repository of a ``--roots`` scan."""
+  return {
+    'root': str(result.root),
+    'status': result.status,
+    'error': result.error,
+    'elapsed_ms': round(result.elapsed * 1000, 3),
+  }
+
+
+def write_listing(
+  output_format: str,
+  project_dir: Path,
+  recursive: bool = False,
+  roots: Optional[str] = None,
+  jobs: int = 32,
+  no_cache: bool = False,
+  out: Optional[IO[str]] = None,
+) -> int:
+  """Write ``aiproj list`` results as JSON or NDJSON.
+
+  Args:
+      output_format: 'json' or 'ndjson'
+      project_dir: Project to list (root of the search with ``recursive``)
+      recursive: List every nested directory with provider configs
+      roots: ``--roots`` spec (file of paths or glob) to scan many repositories
+      jobs: Repositories read concurrently with ``roots``
+      no_cache: Ignore the provider status cache
+      out: Stream to write to (default: stdout)
+
+  Returns:
+      Process exit code
+  """
+  out = out or sys.stdout
+  try:
+    exit_code = _write_listing(output_format, project_dir, recursive, roots, jobs, no_cache, out)
+    out.flush()
+  except BrokenPipeError:
+    # The reader stopped early (``aiproj list --format ndjson | head -2``), which is not an
+    # error. Point stdout at devnull so the interpreter's final flush does not fail again.
+    if out is sys.stdout:
+      os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+  return exit_code
+
+
+def _write_listing(
+  output_format: str,
+  project_dir: Path,
+  recursive: bool,
+  roots: Optional[str],
+  jobs: int,
+  no_cache: bool,
+  out: IO[str],
+) -> int:
+  records = None
+  if not (roots or recursive or no_cache):
+    records = try_call('status', {'project': str(project_dir)})
+  if records is not None:
+    return _write_projects(
+      output_format, [{'project': str(project_dir), 'providers': records}], out
+    )
+
+  from ..core.cache import StatusCache
+  from ..core.detector import ProjectDetector
+  from ..core.discovery import discover_provider_configs
+  from ..core.fleet import expand_roots
+
+  detector = ProjectDetector(cache=None if no_cache else StatusCache())
+
+  if roots:
+    return _write_fleet(output_format, expand_roots(roots), jobs, detector, out)
+
+  if recursive:
+    projects = [
+      {
+        'project': str(project.path),
+        'providers': detector.get_provider_records(project_dir / project.path, project.status),
+      }
+      for project in discover_provider_configs(project_dir, detector)
+    ]
+    return _write_projects(output_format, projects, out, recursive=True)
+
+  projects = [
+    {'project': str(project_dir), 'providers': detector.get_provider_records(project_dir)}
+  ]
+  return _write_projects(output_format, projects, out)
+
+
+def _write_projects(
+  output_format: str, projects: List[Dict[str, Any]], out: IO[str], recursive: bool = False
+) -> int:
+  """Write per-project provider records."""
+  if output_format == 'json':
+    document = {'projects': projects} if recursive else projects[0]
+    out.write(json.dumps(document) + '\n')
+    return 0
+
+  for project in projects:
+    for record in project['providers']:
+      out.write(json.dumps({'project': project['project'], **record}) + '\n')
+  return 0
+
+
+def _write_fleet(
+  output_format: str, roots: List[Path], jobs: int, detector: 'ProjectDetector', out: IO[str]
+) -> int:
+  """Write per-repository records (streamed for NDJSON) and the summary."""
+  from ..core.fleet import FleetSummary, iter_fleet_status
+
+  if not roots:
+    print('No repository roots matched.', file=sys.stderr)
+    return 1
+
+  summary = FleetSummary()
+  records = []
+  for result in iter_fleet_status(roots, max_workers=jobs, detector=detector):
+    summary.add(result)
+    if output_format == 'ndjson':
+      out.write(json.dumps(root_record(result)) + '\n')
+      out.flush()
+    else:
+      records.append(root_record(result))
+
+  if output_format == 'ndjson':
+    out.write(json.dumps({'summary': summary.__dict__}) + '\n')
+  else:
+    out.write(json.dumps({'roots': records, 'summary': summary.__dict__}) + '\n')
+  return 0
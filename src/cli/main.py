@@ -0,0 +1,81 @@
+"""Console entry point for aiproj."""
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# ``aiproj list`` options understood by the fast path, mapped to write_listing arguments
+_LIST_VALUE_OPTIONS = {
+  '--format': 'output_format',
+  '--roots': 'roots',
+  '--jobs': 'jobs',
+  '-j': 'jobs',
+}
+_LIST_FLAGS = {'--recursive': 'recursive', '-r': 'recursive', '--no-cache': 'no_cache'}
+
+
+def parse_machine_listing(argv: List[str]) -> Optional[Dict[str, Any]]:
+  """Recognize ``list --format json|ndjson`` invocations that can skip typer.
+
+  Returns:
+      Keyword arguments for ``write_listing``, or None if typer should handle ``argv``
+      (other commands, ``--help``, table output or anything unexpected)
+  """
+  if not argv or argv[0] != 'list':
+    return None
+
+  options: Dict[str, Any] = {}
+  args = iter(argv[1:])
+  for arg in args:
+    name, has_value, value = arg.partition('=')
+    if name in _LIST_VALUE_OPTIONS:
+      if not has_value:
+        value = next(args, None)
+        if value is None:
+          return None
+      options[_LIST_VALUE_OPTIONS[name]] = value
+    elif arg in _LIST_FLAGS:
+      options[_LIST_FLAGS[arg]] = True
+    else:
+      return None
+
+  if options.get('output_format') not in ('json', 'ndjson'):
+    return None
+  if 'jobs' in options:
+    if not options['jobs'].isdigit() or int(options['jobs']) < 1:
+      return None
+    options['jobs'] = int(options['jobs'])
+  return options
+
+
+def main():
+  """Run aiproj.
+
+  Machine-readable listings and cached shell completions are written without
+  importing typer or rich; every other invocation goes through the typer app.
+  """
+  if any(name.endswith('_COMPLETE') for name in os.environ):
+    from .complete import complete
+
+    answer = complete(sys.argv[0])
+    if answer is not None:
+      output, exit_code = answer
+      if output:
+        print(output)
+      sys.exit(exit_code)
+
+  options = parse_machine_listing(sys.argv[1:])
+  if options is not None:
+    started = time.perf_counter()
+    from ..core.metrics import record_run
+    from .machine import write_listing
+
+    exit_code = write_listing(project_dir=Path.cwd(), **options)
+    record_run('list', time.perf_counter() - started, exit_code)
+    sys.exit(exit_code)
+
+  from .cli import app
+
+  app()
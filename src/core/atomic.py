@@ -0,0 +1,261 @@
+"""Atomic file replacement with a configurable fsync policy."""
+
+import hashlib
+import os
+import stat
+import tempfile
+import uuid
+from enum import Enum
+from pathlib import Path
+from typing import BinaryIO, Optional, Set
+
+from . import iostats
+
+_CHUNK_SIZE = 1 << 16
+
+
+class Durability(str, Enum):
+  """How hard to try to get written files onto stable storage.
+
+  ``none`` leaves flushing to the OS. ``batch`` fsyncs each touched directory once
+  after all renames, so the new directory entries survive a crash. ``strict`` fsyncs
+  every file before it is renamed into place and its directory right after.
+  """
+
+  none = 'none'
+  batch = 'batch'
+  strict = 'strict'
+
+
+class LinkMode(str, Enum):
+  """How to materialize an output whose bytes equal an existing source file.
+
+  ``copy`` writes the bytes. ``hard`` and ``sym`` link to the source instead,
+  falling back to a copy where the link cannot be made (e.g. across devices).
+  """
+
+  copy = 'copy'
+  hard = 'hard'
+  sym = 'sym'
+
+
+def same_content(path: Path, data: bytes, st: Optional[os.stat_result] = None) -> bool:
+  """Check whether ``path`` is a regular file holding exactly ``data``.
+
+  The size is compared first so most changed files are detected without reading them.
+  """
+  if st is None:
+    iostats.count('stats')
+    try:
+      st = os.stat(path)
+    except OSError:
+      return False
+  if not stat.S_ISREG(st.st_mode) or st.st_size != len(data):
+    return False
+
+  iostats.count('files_read')
+  try:
+    with open(path, 'rb') as f:
+      offset = 0
+      while chunk := f.read(_CHUNK_SIZE):
+        if chunk != data[offset : offset + len(chunk)]:
+          return False
+        offset += len(chunk)
+  except OSError:
+    return False
+  return offset == len(data)
+
+
+def fsync_dir(directory: Path):
+  """Flush a directory's entries (new names, renames) to disk."""
+  fd = os.open(directory, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+  try:
+    os.fsync(fd)
+  finally:
+    os.close(fd)
+
+
+class AtomicWriter:
+  """Replace files via a temp file and ``os.replace``, skipping unchanged content.
+
+  Readers see either the old or the new file, never a partial write. Call
+  ``finish`` after the last ``write`` so ``batch`` durability can flush directories.
+
+  Args:
+      durability: fsync policy (see ``Durability``)
+  """
+
+  def __init__(self, durability: Durability = Durability.none):
+    self.durability = Durability(durability)
+    self._pending_dirs: Set[Path] = set()
+
+  def write(self, path: Path, data: bytes, st: Optional[os.stat_result] = None) -> bool:
+    """Write ``data`` to ``path`` unless it already holds it.
+
+    Args:
+        path: Destination file; its directory must exist
+        data: New content
+        st: ``os.stat`` of ``path`` if the caller already has it
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    if st is None:
+      iostats.count('stats')
+      try:
+        st = os.stat(path)
+      except OSError:
+        st = None
+    if st is not None and same_content(path, data, st):
+      return False
+
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+      with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+        if self.durability is Durability.strict:
+          f.flush()
+          os.fsync(f.fileno())
+      # mkstemp creates 0600 files; keep the old mode or use what open() would give
+      mode = stat.S_IMODE(st.st_mode) if st is not None else 0o666 & ~_umask()
+      os.chmod(temp_name, mode)
+      os.replace(temp_name, path)
+      iostats.count('files_written')
+      iostats.count('bytes_written', len(data))
+    except BaseException:
+      _discard(temp_name)
+      raise
+
+    self._placed(path)
+    return True
+
+  def copy(
+    self,
+    path: Path,
+    source: BinaryIO,
+    sha256: Optional[str] = None,
+    st: Optional[os.stat_result] = None,
+  ):
+    """Stream ``source`` into ``path`` in chunks, so memory use does not grow with its size.
+
+    Unlike ``write``, the content is not compared with the current file first.
+
+    Args:
+        path: Destination file; its directory must exist
+        source: Binary file object read to its end
+        sha256: Expected hex digest; ``path`` is left untouched if the data differs
+        st: ``os.stat`` of ``path`` if the caller already has it (keeps its mode)
+
+    Raises:
+        ValueError: The data does not match ``sha256``
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+      with os.fdopen(fd, 'wb') as f:
+        while chunk := source.read(_CHUNK_SIZE):
+          digest.update(chunk)
+          f.write(chunk)
+          size += len(chunk)
+        if self.durability is Durability.strict:
+          f.flush()
+          os.fsync(f.fileno())
+      if sha256 is not None and digest.hexdigest() != sha256:
+        raise ValueError(f'{path.name}: content does not match its sha256')
+      mode = stat.S_IMODE(st.st_mode) if st is not None else 0o666 & ~_umask()
+      os.chmod(temp_name, mode)
+      os.replace(temp_name, path)
+      iostats.count('files_written')
+      iostats.count('bytes_written', size)
+    except BaseException:
+      _discard(temp_name)
+      raise
+
+    self._placed(path)
+
+  def link(self, path: Path, source: Path, data: bytes, mode: LinkMode) -> bool:
+    """Make ``path`` a hard or symbolic link to ``source``, whose content is ``data``.
+
+    A source whose size no longer matches ``data`` is not linked. When the link
+    cannot be created (another device, no hard link or symlink support), ``data``
+    is written instead, so the result is the same as ``write`` minus the sharing.
+
+    Args:
+        path: Destination; its directory must exist
+        source: Existing file holding ``data``
+        data: Content ``path`` must end up with
+        mode: ``LinkMode.hard`` or ``LinkMode.sym`` (``copy`` just writes)
+
+    Returns:
+        True if ``path`` was changed, False if it was already up to date
+    """
+    mode = LinkMode(mode)
+    iostats.count('stats', 2)
+    try:
+      source_st = os.stat(source)
+    except OSError:
+      source_st = None
+    try:
+      st = os.lstat(path)
+    except OSError:
+      st = None
+    if mode is LinkMode.copy or source_st is None or source_st.st_size != len(data):
+      return self.write(path, data, None if st is None or stat.S_ISLNK(st.st_mode) else st)
+
+    target = os.path.relpath(source, path.parent) if mode is LinkMode.sym else source
+    if st is not None:
+      if mode is LinkMode.hard and (st.st_ino, st.st_dev) == (source_st.st_ino, source_st.st_dev):
+        return False
+      if mode is LinkMode.sym and stat.S_ISLNK(st.st_mode) and os.readlink(path) == target:
+        return False
+
+    temp_name = os.path.join(path.parent, f'.{path.name}.{uuid.uuid4().hex}.tmp')
+    try:
+      if mode is LinkMode.hard:
+        os.link(source, temp_name)
+      else:
+        os.symlink(target, temp_name)
+    except OSError:
+      return self.write(path, data, None if st is None or stat.S_ISLNK(st.st_mode) else st)
+    try:
+      os.replace(temp_name, path)
+    except BaseException:
+      _discard(temp_name)
+      raise
+
+    iostats.count('files_linked')
+    self._placed(path)
+    return True
+
+  def _placed(self, path: Path):
+    """Apply the durability policy to a new directory entry."""
+    if self.durability is Durability.strict:
+      fsync_dir(path.parent)
+    elif self.durability is Durability.batch:
+      self._pending_dirs.add(path.parent)
+
+  def finish(self):
+    """Flush every directory touched in ``batch`` mode, once each."""
+    for directory in sorted(self._pending_dirs):
+      fsync_dir(directory)
+    self._pending_dirs.clear()
+
+
+def _discard(temp_name: str):
+  try:
+    os.unlink(temp_name)
+  except FileNotFoundError:
+    pass
+
+
+_UMASK: Optional[int] = None
+
+
+def _umask() -> int:
+  """Process umask, read once (os.umask can only be read by setting it)."""
+  global _UMASK
+  if _UMASK is None:
+    _UMASK = os.umask(0o022)
+    os.umask(_UMASK)
+  return _UMASK
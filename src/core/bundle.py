@@ -0,0 +1,316 @@
+"""Export every provider's files to one archive and import them into another project.
+
+A bundle is a tar (optionally gzip-compressed) or zip archive whose first entry,
+``aiproj-manifest.json``, lists each file with its provider, size and SHA-256.
+Import decides what to do with every file from the manifest alone: files whose
+hash already matches are left untouched and existing ones are kept unless
+``force`` is set, following ``ConfigGenerator.write_config_files``. The entries
+are then read in one sequential pass and streamed to disk in chunks, so neither
+side ever holds a whole file, let alone the whole bundle, in memory.
+"""
+
+import hashlib
+import io
+import json
+import os
+import stat
+import tarfile
+import tempfile
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+from . import iostats
+from .atomic import AtomicWriter, Durability
+from .detector import ProjectDetector
+from .sync import file_sha256
+
+MANIFEST_NAME = 'aiproj-manifest.json'
+VERSION = 1
+
+_CHUNK_SIZE = 1 << 16
+
+
+@dataclass
+class ImportResult:
+  """Outcome of one import."""
+
+  written: List[str] = field(default_factory=list)
+  unchanged: int = 0
+  skipped: List[str] = field(default_factory=list)
+
+
+def bundle_mode(path: Path) -> str:
+  """Archive type of a bundle path: ``zip``, ``tar`` or (for anything else) ``tar.gz``."""
+  name = path.name.lower()
+  if name.endswith('.zip'):
+    return 'zip'
+  if name.endswith('.tar'):
+    return 'tar'
+  return 'tar.gz'
+
+
+def export_bundle(
+  project_dir: Path,
+  output: Path,
+  providers: Optional[List[str]] = None,
+  detector: Optional[ProjectDetector] = None,
+) -> Dict[str, Any]:
+  """Write the config and command files of a project's providers into one archive.
+
+  The archive is written next to ``output`` and renamed into place when complete.
+
+  Args:
+      project_dir: Project to export
+      output: Bundle path; its suffix picks the format (see ``bundle_mode``)
+      providers: Providers to export (default: every provider with files)
+      detector: Shared detector (a new one is created if omitted)
+
+  Returns:
+      The manifest stored in the bundle
+
+  Raises:
+      ValueError: A file changed while it was being exported
+  """
+  detector = detector or ProjectDetector()
+  provider_files = detector.get_provider_files(project_dir)
+  files = {}
+  for name, paths in provider_files.items():
+    if providers is not None and name not in providers:
+      continue
+    for rel_path in paths['config'] + paths['commands']:
+      if rel_path not in files:
+        size = os.stat(project_dir / rel_path).st_size
+        sha256 = file_sha256(project_dir / rel_path)
+        files[rel_path] = {'provider': name, 'size': size, 'sha256': sha256}
+  manifest = {'version': VERSION, 'created': time.time(), 'files': files}
+
+  output.parent.mkdir(parents=True, exist_ok=True)
+  fd, temp_name = tempfile.mkstemp(dir=output.parent, prefix=f'.{output.name}.', suffix='.tmp')
+  try:
+    with os.fdopen(fd, 'wb') as f:
+      mode = bundle_mode(output)
+      if mode == 'zip':
+        _write_zip(f, project_dir, manifest)
+      else:
+        _write_tar(f, project_dir, manifest, 'w:gz' if mode == 'tar.gz' else 'w')
+    os.replace(temp_name, output)
+  except BaseException:
+    os.unlink(temp_name)
+    raise
+  return manifest
+
+
+def read_manifest(archive: Path) -> Dict[str, Any]:
+  """The manifest of a bundle, read without touching its other entries."""
+  entries = _entries(archive)
+  try:
+    return _manifest(entries)
+  finally:
+    entries.close()
+
+
+def import_bundle(
+  project_dir: Path,
+  archive: Path,
+  force: bool = False,
+  dry_run: bool = False,
+  durability: Durability = Durability.none,
+  detector: Optional[ProjectDetector] = None,
+) -> ImportResult:
+  """Write the files of a bundle into a project.
+
+  Args:
+      project_dir: Target project
+      archive: Bundle written by ``export_bundle``
+      force: Overwrite existing files whose content differs
+      dry_run: Compute the result from the manifest without writing anything
+      durability: fsync policy for written files
+      detector: Shared detector, invalidated after writing (a new one is created if omitted)
+
+  Returns:
+      What was written, already up to date, or kept
+
+  Raises:
+      ValueError: The archive is not a bundle, names a path outside the providers'
+          files, or an entry is missing or does not match its hash
+  """
+  detector = detector or ProjectDetector()
+  entries = _entries(archive)
+  try:
+    manifest = _manifest(entries)
+    allowed, directories = _provider_paths(detector)
+    result = ImportResult()
+    pending: Dict[str, Optional[os.stat_result]] = {}
+    for rel_path, entry in manifest['files'].items():
+      _check_path(rel_path, allowed, directories)
+      action, st = _plan(project_dir / rel_path, entry, force)
+      if action == 'unchanged':
+        result.unchanged += 1
+      elif action == 'skip':
+        result.skipped.append(rel_path)
+      else:
+        pending[rel_path] = st
+        result.written.append(rel_path)
+    if dry_run or not pending:
+      return result
+
+    writer = AtomicWriter(durability)
+    ready_dirs = set()
+    try:
+      for rel_path, source in entries:
+        if rel_path not in manifest['files']:
+          raise ValueError(f'{rel_path}: not listed in the bundle manifest')
+        if rel_path not in pending:
+          continue  # unchanged or kept; the entry is skipped without being read
+        full_path = project_dir / rel_path
+        parent = full_path.parent
+        if parent not in ready_dirs:
+          blocking = _blocking_file(full_path)
+          if blocking is not None:
+            blocking.unlink()  # only planned with force
+          parent.mkdir(parents=True, exist_ok=True)
+          ready_dirs.add(parent)
+        writer.copy(full_path, source, manifest['files'][rel_path]['sha256'], pending.pop(rel_path))
+    finally:
+      writer.finish()
+      detector.invalidate(project_dir)
+    if pending:
+      raise ValueError(f'{next(iter(pending))}: listed in the manifest but missing from the bundle')
+    return result
+  finally:
+    entries.close()
+
+
+def _plan(
+  full_path: Path, entry: Dict[str, Any], force: bool
+) -> Tuple[str, Optional[os.stat_result]]:
+  """Decide whether a bundled file is ``unchanged``, kept (``skip``) or written (``write``)."""
+  iostats.count('stats')
+  try:
+    st = os.stat(full_path)
+  except OSError:
+    st = None
+  if st is not None:
+    if stat.S_ISREG(st.st_mode) and st.st_size == entry['size']:
+      if file_sha256(full_path) == entry['sha256']:
+        return 'unchanged', st
+    return ('write' if force else 'skip'), st
+  if _blocking_file(full_path) is not None:
+    return ('write' if force else 'skip'), None
+  return 'write', None
+
+
+def _blocking_file(full_path: Path) -> Optional[Path]:
+  """The nearest existing ancestor of ``full_path`` if it is a file, not a directory."""
+  for parent in full_path.parents:
+    if parent.is_file():
+      return parent
+    if parent.is_dir():
+      return None
+  return None
+
+
+def _provider_paths(detector: ProjectDetector) -> Tuple[Set[str], List[str]]:
+  """Config file paths and command directories a bundle may write to."""
+  specs = detector.providers.specs.values()
+  directories = [directory for spec in specs for directory in spec.directories]
+  prefixes = {'/'.join(d.split('/')[: i + 1]) for d in directories for i in range(d.count('/') + 1)}
+  allowed = {path for spec in specs for path in spec.status_paths} - prefixes
+  return allowed, directories
+
+
+def _check_path(rel_path: str, allowed: Set[str], directories: List[str]):
+  path = PurePosixPath(rel_path)
+  if path.is_absolute() or '..' in path.parts or path.as_posix() != rel_path:
+    raise ValueError(f'{rel_path}: unsafe path in bundle')
+  if rel_path not in allowed and not any(rel_path.startswith(f'{d}/') for d in directories):
+    raise ValueError(f'{rel_path}: not a provider config or command file')
+
+
+def _manifest(entries: Iterator[Tuple[str, BinaryIO]]) -> Dict[str, Any]:
+  first = next(entries, None)
+  if first is None or first[0] != MANIFEST_NAME:
+    raise ValueError(f'not an aiproj bundle: {MANIFEST_NAME} must be the first entry')
+  manifest = json.loads(first[1].read())
+  if not isinstance(manifest, dict) or manifest.get('version') != VERSION:
+    raise ValueError('unsupported bundle version')
+  return manifest
+
+
+def _entries(archive: Path) -> Iterator[Tuple[str, BinaryIO]]:
+  """(name, file object) of each file in archive order, read in one sequential pass."""
+  iostats.count('files_read')
+  if zipfile.is_zipfile(archive):
+    with zipfile.ZipFile(archive) as zf:
+      for info in zf.infolist():
+        if not info.is_dir():
+          with zf.open(info) as source:
+            yield info.filename, source
+    return
+
+  # 'r|*' reads the tar as a stream: no seeking, no member index kept in memory
+  try:
+    with tarfile.open(archive, 'r|*') as tar:
+      for member in tar:
+        if member.isdir():
+          continue
+        if not member.isfile():
+          raise ValueError(f'{member.name}: only regular files can be imported')
+        yield member.name, tar.extractfile(member)
+  except tarfile.TarError as e:
+    raise ValueError(f'not an aiproj bundle: {e}') from e
+
+
+def _write_tar(f: BinaryIO, project_dir: Path, manifest: Dict[str, Any], mode: str):
+  with tarfile.open(fileobj=f, mode=mode, format=tarfile.PAX_FORMAT) as tar:
+    data = json.dumps(manifest, indent=2).encode()
+    info = tarfile.TarInfo(MANIFEST_NAME)
+    info.size = len(data)
+    info.mtime = int(manifest['created'])
+    info.mode = 0o644
+    tar.addfile(info, io.BytesIO(data))
+
+    for rel_path, entry in manifest['files'].items():
+      info = tarfile.TarInfo(rel_path)
+      info.size = entry['size']
+      with open(project_dir / rel_path, 'rb') as source:
+        st = os.fstat(source.fileno())
+        info.mtime = int(st.st_mtime)
+        info.mode = stat.S_IMODE(st.st_mode)
+        reader = _HashingReader(source)
+        tar.addfile(info, reader)
+      reader.check(rel_path, entry)
+
+
+def _write_zip(f: BinaryIO, project_dir: Path, manifest: Dict[str, Any]):
+  with zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as zf:
+    zf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+    for rel_path, entry in manifest['files'].items():
+      info = zipfile.ZipInfo.from_file(project_dir / rel_path, rel_path)
+      info.compress_type = zipfile.ZIP_DEFLATED
+      with open(project_dir / rel_path, 'rb') as source, zf.open(info, 'w') as target:
+        reader = _HashingReader(source)
+        while chunk := reader.read(_CHUNK_SIZE):
+          target.write(chunk)
+      reader.check(rel_path, entry)
+
+
+class _HashingReader:
+  """Pass reads through while hashing them, to catch files edited mid-export."""
+
+  def __init__(self, source: BinaryIO):
+    self.source = source
+    self.digest = hashlib.sha256()
+
+  def read(self, size: int = -1) -> bytes:
+    chunk = self.source.read(size)
+    self.digest.update(chunk)
+    iostats.count('bytes_read', len(chunk))
+    return chunk
+
+  def check(self, rel_path: str, entry: Dict[str, Any]):
+    if self.digest.hexdigest() != entry['sha256']:
+      raise ValueError(f'{rel_path} changed while it was being exported; run export again')
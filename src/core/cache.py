@@ -0,0 +1,105 @@
+"""On-disk cache of provider status keyed by file stat signatures."""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import iostats
+from .state import read_json, write_json
+
+# Paths modified this recently may change again within the filesystem's timestamp
+# granularity without their mtime moving, so their status is never cached.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def cache_home() -> Path:
+  """Base directory for aiproj caches (``$XDG_CACHE_HOME/aiproj``)."""
+  base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+  return Path(base) / 'aiproj'
+
+
+def stat_signature(project_dir: Path, paths: List[str]) -> List[Optional[List[int]]]:
+  """Return ``[mtime_ns, inode, size]`` for each path, or None where it is missing."""
+  signature = []
+  iostats.count('stats', len(paths))
+  for rel_path in paths:
+    try:
+      stat = os.stat(project_dir / rel_path)
+    except (FileNotFoundError, NotADirectoryError):
+      signature.append(None)
+    else:
+      signature.append([stat.st_mtime_ns, stat.st_ino, stat.st_size])
+  return signature
+
+
+def is_racy(signature: List[Optional[List[int]]], now_ns: int) -> bool:
+  """Check whether any path was modified too recently to trust its mtime."""
+  return any(entry and now_ns - entry[0] < RACY_WINDOW_NS for entry in signature)
+
+
+class StatusCache:
+  """Per-project provider status, reused while the watched paths are unchanged.
+
+  Each project has one small JSON file holding, per provider, the stat signature
+  of its watched paths and the component counts computed from them. A lookup costs
+  one file read plus a stat of each watched path.
+  """
+
+  def __init__(self, directory: Optional[Path] = None):
+    self.directory = directory or cache_home() / 'status'
+    self._entries: Dict[Path, Dict[str, Any]] = {}
+    self._dirty = set()
+
+  def get(
+    self, project_dir: Path, provider_name: str, signature: List[Optional[List[int]]]
+  ) -> Optional[Dict[str, Any]]:
+    """Return the cached status if the provider's signature is unchanged."""
+    entry = self._load(project_dir).get(provider_name)
+    if entry and entry['signature'] == signature:
+      return entry['status']
+    return None
+
+  def put(
+    self,
+    project_dir: Path,
+    provider_name: str,
+    signature: List[Optional[List[int]]],
+    status: Dict[str, Any],
+  ):
+    """Remember a freshly computed status unless its paths changed too recently."""
+    entries = self._load(project_dir)
+    if is_racy(signature, time.time_ns()):
+      if entries.pop(provider_name, None) is not None:
+        self._dirty.add(project_dir)
+      return
+    entries[provider_name] = {'signature': signature, 'status': status}
+    self._dirty.add(project_dir)
+
+  def save(self):
+    """Write back every project whose entries changed."""
+    for project_dir in self._dirty:
+      data = {'project': str(project_dir), 'providers': self._entries[project_dir]}
+      try:
+        write_json(self._path(project_dir), data)
+      except OSError:
+        # The cache is an optimization; an unwritable cache dir is not an error
+        continue
+    self._dirty.clear()
+
+  def _load(self, project_dir: Path) -> Dict[str, Any]:
+    """Read a project's cache file once per process."""
+    if project_dir not in self._entries:
+      data = read_json(self._path(project_dir))
+      try:
+        entries = data['providers'] if data.get('project') == str(project_dir) else {}
+      except (AttributeError, KeyError, TypeError):
+        entries = {}
+      self._entries[project_dir] = entries
+    return self._entries[project_dir]
+
+  def _path(self, project_dir: Path) -> Path:
+    """Cache file for a project, named after a hash of its absolute path."""
+    digest = hashlib.sha1(os.path.abspath(project_dir).encode()).hexdigest()
+    return self.directory / f'{digest}.json'
@@ -0,0 +1,271 @@
+"""Install a project's Codex prompts into ``$CODEX_HOME/prompts``.
+
+Codex only loads slash-command prompts from its global prompts directory, so
+``.codex/prompts/*.md`` has to be copied there. Two JSON files keep that
+incremental and safe across many projects:
+
+* ``.aiproj/codex-install.json`` in the project records, per prompts directory,
+  the installed names with their source's stat fingerprint, hash and link mode,
+  so unchanged prompts are neither hashed nor rewritten and deleted ones can be
+  removed.
+* An index per prompts directory in ``state_home()/codex-index/`` maps every
+  installed name to the project that owns it, so a name collision with another
+  project is a single dict lookup. It is updated under a lock next to it, and
+  keeps aiproj's own files out of the directory Codex loads prompts from.
+"""
+
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import iostats
+from .atomic import AtomicWriter, LinkMode
+from .cache import is_racy
+from .detector import ProjectDetector
+from .state import read_json, state_dir, state_home, write_json
+from .sync import file_sha256
+
+try:
+  import fcntl
+except ImportError:  # pragma: no cover - Windows
+  fcntl = None
+
+MANIFEST_NAME = 'codex-install.json'
+INDEX_DIR = 'codex-index'
+# Where earlier versions kept the index, inside the prompts directory itself
+LEGACY_INDEX_NAME = '.aiproj-index.json'
+LEGACY_LOCK_NAME = '.aiproj-index.lock'
+VERSION = 1
+
+
+def codex_home() -> Path:
+  """Codex's home directory (``$CODEX_HOME``, default ``~/.codex``)."""
+  return Path(os.environ.get('CODEX_HOME') or Path.home() / '.codex')
+
+
+@dataclass
+class InstallResult:
+  """Outcome of one install pass."""
+
+  installed: List[str] = field(default_factory=list)
+  removed: List[str] = field(default_factory=list)
+  unchanged: int = 0
+  collisions: List[str] = field(default_factory=list)
+
+
+class CodexInstaller:
+  """Mirror one project's ``.codex/prompts`` into a Codex prompts directory.
+
+  Args:
+      project_dir: Project whose prompts are installed
+      prompts_dir: Destination (default: ``codex_home()/prompts``)
+      detector: Shared detector (a new one is created if omitted)
+  """
+
+  def __init__(
+    self,
+    project_dir: Path,
+    prompts_dir: Optional[Path] = None,
+    detector: Optional[ProjectDetector] = None,
+  ):
+    self.project_dir = project_dir
+    self.project_id = str(project_dir.resolve())
+    self.prompts_dir = prompts_dir or codex_home() / 'prompts'
+    self.detector = detector or ProjectDetector()
+    self.manifest_path = project_dir / '.aiproj' / MANIFEST_NAME
+    digest = hashlib.sha1(str(self.prompts_dir.resolve()).encode()).hexdigest()
+    self.index_path = state_home() / INDEX_DIR / f'{digest}.json'
+
+  def install(
+    self,
+    prefix: Optional[str] = None,
+    link: Optional[LinkMode] = None,
+    force: bool = False,
+    dry_run: bool = False,
+  ) -> InstallResult:
+    """Install new and changed prompts and remove ones whose source was deleted.
+
+    Args:
+        prefix: Prepended to every installed name (default: the prefix used last time)
+        link: Copy prompts, or hard/symlink them to the project files (default: the
+            mode used last time, else copy); prompts installed another way are redone
+        force: Take over names installed by another project or not by aiproj
+        dry_run: Compute the result without touching any file
+
+    Returns:
+        What was installed, removed or skipped
+    """
+    manifest = self._load_manifest()
+    home = manifest['homes'].get(str(self.prompts_dir), {'prefix': '', 'prompts': {}})
+    prefix = home['prefix'] if prefix is None else prefix
+    link = LinkMode(home.get('link', LinkMode.copy.value)) if link is None else link
+    previous = home['prompts']
+    codex = self.detector.get_provider('codex')
+    sources = codex.command_files(self.project_dir, self.detector.snapshot(self.project_dir))
+
+    result = InstallResult()
+    prompts = {}
+    writer = AtomicWriter()
+    with self._locked_index(dry_run) as index:
+      for rel_path in sources:
+        name = f'{prefix}{Path(rel_path).name}'
+        fingerprint = self._fingerprint(rel_path, previous.get(name))
+        if fingerprint is None:
+          continue  # deleted since the scan; its installed prompt is removed below
+        entry = {**fingerprint, 'link': link.value}
+        destination = self.prompts_dir / name
+        owner = index.get(name)
+
+        if owner is not None:
+          taken = owner['project'] != self.project_id
+        else:
+          taken = os.path.lexists(destination)
+        if taken and not force:
+          result.collisions.append(_collision_message(name, rel_path, owner))
+          continue
+
+        old = previous.get(name)
+        if (
+          old is not None
+          and old['sha256'] == entry['sha256']
+          and old['source'] == rel_path
+          and old.get('link', LinkMode.copy.value) == entry['link']
+          and owner is not None
+          and owner['project'] == self.project_id
+          and os.path.lexists(destination)
+        ):
+          prompts[name] = entry
+          result.unchanged += 1
+          continue
+
+        if not dry_run:
+          self.prompts_dir.mkdir(parents=True, exist_ok=True)
+          if old is not None and old.get('link', LinkMode.copy.value) != entry['link']:
+            # A copy onto a link to the same bytes would be skipped as already up to date
+            destination.unlink(missing_ok=True)
+          source = self.project_dir / rel_path
+          iostats.count('files_read')
+          try:
+            data = source.read_bytes()
+          except FileNotFoundError:
+            continue  # deleted since it was hashed
+          if link is LinkMode.copy:
+            writer.write(destination, data)
+          else:
+            writer.link(destination, source, data, link)
+          index[name] = {'project': self.project_id, 'source': rel_path}
+        prompts[name] = entry
+        result.installed.append(name)
+
+      # Garbage-collect prompts this project installed earlier but no longer has
+      for name, old in previous.items():
+        if name in prompts:
+          continue
+        if index.get(name, {}).get('project') != self.project_id:
+          continue  # taken over by another project (or already gone)
+        destination = self.prompts_dir / name
+        if os.path.isfile(destination) and file_sha256(destination) != old['sha256']:
+          result.collisions.append(f'{name}: edited in {self.prompts_dir}; kept')
+          continue
+        result.removed.append(name)
+        if not dry_run:
+          Path(destination).unlink(missing_ok=True)
+          del index[name]
+
+    if not dry_run:
+      manifest['homes'][str(self.prompts_dir)] = {
+        'prefix': prefix,
+        'link': link.value,
+        'prompts': prompts,
+      }
+      state_dir(self.project_dir)
+      write_json(self.manifest_path, manifest)
+    return result
+
+  def uninstall(self) -> InstallResult:
+    """Remove every prompt this project installed in ``prompts_dir``."""
+    manifest = self._load_manifest()
+    home = manifest['homes'].pop(str(self.prompts_dir), {'prompts': {}})
+    result = InstallResult()
+    with self._locked_index(False) as index:
+      for name in home['prompts']:
+        if index.get(name, {}).get('project') == self.project_id:
+          (self.prompts_dir / name).unlink(missing_ok=True)
+          del index[name]
+          result.removed.append(name)
+    if self.manifest_path.exists():
+      write_json(self.manifest_path, manifest)
+    return result
+
+  def _load_manifest(self) -> Dict[str, Any]:
+    manifest = read_json(self.manifest_path)
+    if not isinstance(manifest, dict) or manifest.get('version') != VERSION:
+      return {'version': VERSION, 'homes': {}}
+    return manifest
+
+  def _fingerprint(
+    self, rel_path: str, entry: Optional[Dict[str, Any]]
+  ) -> Optional[Dict[str, Any]]:
+    """Stat a source and hash it only if its mtime or size changed.
+
+    Returns:
+        None if the source was deleted since the directory was scanned
+    """
+    path = self.project_dir / rel_path
+    iostats.count('stats')
+    try:
+      stat = os.stat(path)
+      if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        sha256 = entry['sha256']
+      else:
+        sha256 = file_sha256(path)
+    except FileNotFoundError:
+      return None
+
+    mtime_ns = stat.st_mtime_ns
+    if is_racy([[mtime_ns, stat.st_ino, stat.st_size]], time.time_ns()):
+      mtime_ns = 0
+    return {'source': rel_path, 'mtime_ns': mtime_ns, 'size': stat.st_size, 'sha256': sha256}
+
+  @contextmanager
+  def _locked_index(self, read_only: bool):
+    """Yield the name -> owner index, saving it afterwards under an exclusive lock."""
+    legacy_path = self.prompts_dir / LEGACY_INDEX_NAME
+    if read_only:
+      yield _read_index(self.index_path, legacy_path)
+      return
+
+    self.index_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(self.index_path.with_suffix('.lock'), 'a') as lock:
+      if fcntl is not None:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+      index = _read_index(self.index_path, legacy_path)
+      snapshot = dict(index)
+      yield index
+      if index != snapshot or not self.index_path.exists():
+        write_json(
+          self.index_path,
+          {'version': VERSION, 'prompts_dir': str(self.prompts_dir), 'prompts': index},
+        )
+      # The index has moved out of the prompts directory
+      legacy_path.unlink(missing_ok=True)
+      (self.prompts_dir / LEGACY_LOCK_NAME).unlink(missing_ok=True)
+
+
+def _read_index(path: Path, legacy_path: Path) -> Dict[str, Dict[str, str]]:
+  index = read_json(path)
+  if index is None:
+    index = read_json(legacy_path)
+  if not isinstance(index, dict) or index.get('version') != VERSION:
+    return {}
+  return index['prompts']
+
+
+def _collision_message(name: str, rel_path: str, owner: Optional[Dict[str, str]]) -> str:
+  if owner is None:
+    return f'{name}: already exists and was not installed by aiproj; {rel_path} skipped'
+  return f'{name}: installed from {owner["project"]}; {rel_path} skipped (try --prefix)'
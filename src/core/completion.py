@@ -0,0 +1,79 @@
+"""Per-project cache of the words shell completion offers.
+
+``src.cli.complete`` answers a TAB press from this file alone: it holds the CLI
+subcommands, provider names and the command names that exist in the project,
+plus the stat signature of the providers' watched paths. Commands that write
+provider files refresh it, and a signature mismatch (files changed by something
+else) sends completion through typer's slower path, which rebuilds it.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .cache import cache_home, stat_signature
+from .detector import ProjectDetector
+from .state import write_json
+
+# Read by src.cli.complete, which keeps its own copy to stay import-free
+CACHE_VERSION = 1
+
+
+def cache_path(project_dir: Path) -> Path:
+  """Completion cache of a project, named after a hash of its absolute path."""
+  digest = hashlib.sha1(os.path.abspath(project_dir).encode()).hexdigest()
+  return cache_home() / 'completion' / f'{digest}.json'
+
+
+def build(
+  project_dir: Path, subcommands: Iterable[str], detector: Optional[ProjectDetector] = None
+) -> Dict[str, Any]:
+  """Collect provider and command names of a project.
+
+  Args:
+      project_dir: Project to scan
+      subcommands: CLI subcommand names, stored so top-level completion needs no import
+      detector: Shared detector (a new one is created if omitted)
+  """
+  detector = detector or ProjectDetector()
+  specs = detector.providers.specs
+  paths = list(dict.fromkeys(path for spec in specs.values() for path in spec.status_paths))
+  # Taken before scanning, so a change made during the scan shows up as a mismatch
+  signature = stat_signature(project_dir, paths)
+
+  snapshot = detector.snapshot(project_dir)
+  configured = []
+  command_names = {}
+  for name in specs:
+    if not detector.may_be_configured(name, snapshot):
+      continue
+    provider = detector.providers[name]
+    if not provider.detect_existing(project_dir, snapshot):
+      continue
+    configured.append(name)
+    files = provider.command_files(project_dir, snapshot)
+    command_names[name] = sorted({Path(rel_path).stem for rel_path in files})
+
+  return {
+    'version': CACHE_VERSION,
+    'project': os.path.abspath(project_dir),
+    'subcommands': list(subcommands),
+    'providers': list(specs),
+    'configured': configured,
+    'command_names': command_names,
+    'paths': paths,
+    'signature': signature,
+  }
+
+
+def refresh(
+  project_dir: Path, subcommands: Iterable[str], detector: Optional[ProjectDetector] = None
+) -> Dict[str, Any]:
+  """Rebuild and save a project's completion cache."""
+  data = build(project_dir, subcommands, detector)
+  try:
+    write_json(cache_path(project_dir), data)
+  except OSError:
+    pass  # completion falls back to the slow path
+  return data
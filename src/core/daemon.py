@@ -0,0 +1,385 @@
+"""``aiproj serve``: answer status and command queries from a warm in-memory index.
+
+Every project the daemon is asked about gets a ``ProjectIndex``: a long-lived
+detector (and so a cached ``ProjectSnapshot``) plus the status records and loaded
+``ProviderConfig`` of each provider. A watcher thread per project drops the index
+when provider files change. Every request also compares the stat signature of the
+providers' watched paths, so an answer is never staler than the on-disk cache
+would be, even if an event was lost.
+
+See ``daemon_client`` for the wire protocol.
+"""
+
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..providers.base import ProviderConfig
+from ..providers.registry import ProviderRegistry
+from .cache import stat_signature
+from .daemon_client import DaemonUnavailable, call, socket_path
+from .detector import ProjectDetector
+from .watcher import Watcher, create_watcher
+
+# Projects kept warm; the least recently used one is dropped beyond this
+MAX_PROJECTS = 64
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RpcError(Exception):
+  """Error reported to the client as a JSON-RPC error object."""
+
+  def __init__(self, code: int, message: str):
+    super().__init__(message)
+    self.code = code
+
+
+class ProjectIndex:
+  """Warm detector state of one project.
+
+  Args:
+      project_dir: Absolute project root
+      registry: Providers shared by every project of the daemon
+      poll: Poll for changes instead of using inotify
+  """
+
+  def __init__(self, project_dir: Path, registry: ProviderRegistry, poll: bool = False):
+    self.project_dir = project_dir
+    self.detector = ProjectDetector(registry=registry)
+    self.lock = threading.Lock()
+    specs = registry.specs.values()
+    self._paths = list(dict.fromkeys(path for spec in specs for path in spec.status_paths))
+    self._signature: Optional[List] = None
+    self._records: Optional[List[Dict[str, Any]]] = None
+    self._configs: Dict[str, ProviderConfig] = {}
+    self._closed = False
+    self._watcher: Optional[Watcher] = None
+    try:
+      self._watcher = create_watcher(
+        project_dir,
+        config_files=[name for spec in specs for name in spec.config_files],
+        directories=[directory for spec in specs for directory in spec.directories],
+        poll=poll,
+      )
+    except OSError:
+      pass  # fall back to stat signatures alone
+    else:
+      threading.Thread(target=self._watch, name=f'watch {project_dir}', daemon=True).start()
+
+  def invalidate(self):
+    """Forget everything computed so far; the next query rescans the project."""
+    with self.lock:
+      self._invalidate()
+
+  def records(self) -> List[Dict[str, Any]]:
+    """Provider records, as in ``aiproj list --format json``."""
+    with self.lock:
+      self._validate()
+      if self._records is None:
+        self._records = self.detector.get_provider_records(self.project_dir)
+      return self._records
+
+  def config(self, name: str) -> ProviderConfig:
+    """A provider's loaded configuration (commands carry their descriptions)."""
+    with self.lock:
+      self._validate()
+      config = self._configs.get(name)
+      if config is None:
+        provider = self.detector.get_provider(name)
+        snapshot = self.detector.snapshot(self.project_dir)
+        if self.detector.may_be_configured(name, snapshot):
+          config = provider.load_existing_config(self.project_dir, snapshot)
+        else:
+          config = ProviderConfig()
+        self._configs[name] = config
+      return config
+
+  def close(self):
+    """Stop watching the project."""
+    self._closed = True
+
+  def _validate(self):
+    signature = stat_signature(self.project_dir, self._paths)
+    if signature != self._signature:
+      self._invalidate()
+      self._signature = signature
+
+  def _invalidate(self):
+    self.detector.invalidate(self.project_dir)
+    self._records = None
+    self._configs.clear()
+    self._signature = None
+
+  def _watch(self):
+    try:
+      while not self._closed:
+        if self._watcher.next_batch(timeout=1.0, debounce=0.02, max_delay=0.2):
+          self.invalidate()
+    except OSError:
+      pass
+    finally:
+      self._watcher.close()
+
+
+class Daemon:
+  """Dispatch JSON-RPC requests to per-project indexes.
+
+  Args:
+      poll: Poll for changes instead of using inotify
+      max_projects: Projects kept warm at once
+  """
+
+  def __init__(self, poll: bool = False, max_projects: int = MAX_PROJECTS):
+    self.poll = poll
+    self.max_projects = max_projects
+    self.registry = ProviderRegistry()
+    self.requests = 0
+    self.last_request = time.monotonic()
+    self.started = time.time()
+    self.server: Optional[socketserver.BaseServer] = None
+    self._projects: 'OrderedDict[Path, ProjectIndex]' = OrderedDict()
+    self._lock = threading.Lock()
+    self._methods: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+      'ping': self.ping,
+      'status': self.status,
+      'commands': self.commands,
+      'invalidate': self.invalidate,
+      'shutdown': self.shutdown,
+    }
+
+  def handle(self, request: Any) -> Optional[Dict[str, Any]]:
+    """Answer one decoded request (None for a notification, which has no id)."""
+    self.requests += 1
+    self.last_request = time.monotonic()
+    request_id = request.get('id') if isinstance(request, dict) else None
+    try:
+      if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+        raise RpcError(INVALID_REQUEST, 'invalid request')
+      method = self._methods.get(request['method'])
+      if method is None:
+        raise RpcError(METHOD_NOT_FOUND, f'unknown method: {request["method"]}')
+      params = request.get('params') or {}
+      if not isinstance(params, dict):
+        raise RpcError(INVALID_PARAMS, 'params must be an object')
+      response = {'jsonrpc': '2.0', 'id': request_id, 'result': method(params)}
+    except RpcError as e:
+      response = _error(request_id, e.code, str(e))
+    except Exception as e:
+      response = _error(request_id, INTERNAL_ERROR, f'{type(e).__name__}: {e}')
+    if isinstance(request, dict) and 'id' not in request:
+      return None
+    return response
+
+  def ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Daemon liveness and counters."""
+    with self._lock:
+      projects = [str(path) for path in self._projects]
+    return {
+      'pid': os.getpid(),
+      'started': self.started,
+      'requests': self.requests,
+      'projects': projects,
+    }
+
+  def status(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Provider records of ``params['project']``."""
+    return self._project(params).records()
+
+  def commands(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Commands and prompts of every provider (or ``params['provider']``) in a project."""
+    index = self._project(params)
+    names = list(self.registry)
+    if params.get('provider') is not None:
+      if params['provider'] not in self.registry:
+        raise RpcError(INVALID_PARAMS, f'unknown provider: {params["provider"]}')
+      names = [params['provider']]
+
+    entries = []
+    for name in names:
+      config = index.config(name)
+      for kind, commands in (('command', config.commands), ('prompt', config.prompts)):
+        for command in commands:
+          entries.append(
+            {
+              'provider': name,
+              'kind': kind,
+              'name': command.name,
+              'description': command.description,
+              'path': _relative(command.path, index.project_dir),
+            }
+          )
+    return entries
+
+  def invalidate(self, params: Dict[str, Any]) -> bool:
+    """Drop the index of ``params['project']`` (or of every project when omitted)."""
+    with self._lock:
+      if params.get('project') is None:
+        indexes = list(self._projects.values())
+      else:
+        index = self._projects.get(_project_path(params))
+        indexes = [index] if index is not None else []
+    for index in indexes:
+      index.invalidate()
+    return True
+
+  def shutdown(self, params: Dict[str, Any]) -> bool:
+    """Stop serving once the current request is answered."""
+    if self.server is not None:
+      threading.Thread(target=self.server.shutdown, daemon=True).start()
+    return True
+
+  def close(self):
+    """Stop every project watcher."""
+    with self._lock:
+      for index in self._projects.values():
+        index.close()
+      self._projects.clear()
+
+  def _project(self, params: Dict[str, Any]) -> ProjectIndex:
+    project_dir = _project_path(params)
+    with self._lock:
+      index = self._projects.get(project_dir)
+      if index is not None:
+        self._projects.move_to_end(project_dir)
+        return index
+    if not project_dir.is_dir():
+      raise RpcError(INVALID_PARAMS, f'not a directory: {project_dir}')
+
+    index = ProjectIndex(project_dir, self.registry, self.poll)
+    with self._lock:
+      if project_dir in self._projects:  # another request got there first
+        index.close()
+        return self._projects[project_dir]
+      self._projects[project_dir] = index
+      while len(self._projects) > self.max_projects:
+        self._projects.popitem(last=False)[1].close()
+    return index
+
+
+class _Handler(socketserver.StreamRequestHandler):
+  """One connection: a request per line until the client closes it."""
+
+  def handle(self):
+    for line in self.rfile:
+      try:
+        request = json.loads(line)
+      except ValueError:
+        response = _error(None, PARSE_ERROR, 'parse error')
+      else:
+        response = self.server.daemon.handle(request)
+      if response is not None:
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+        self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+  """Threaded Unix socket server for a ``Daemon``, readable by the owner only.
+
+  Raises:
+      OSError: Another daemon is already listening on ``path``
+  """
+
+  daemon_threads = True
+
+  def __init__(self, path: Path, daemon: Daemon):
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    if os.path.lexists(path):
+      try:
+        call('ping', path=path, timeout=0.5)
+      except DaemonUnavailable:
+        path.unlink()  # left behind by a daemon that did not exit cleanly
+      else:
+        raise OSError(f'a daemon is already listening on {path}')
+
+    self.path = path
+    self.daemon = daemon
+    daemon.server = self
+    old_umask = os.umask(0o177)
+    try:
+      super().__init__(str(path), _Handler)
+    finally:
+      os.umask(old_umask)
+
+  def server_close(self):
+    """Close the socket, remove its file and stop the project watchers."""
+    super().server_close()
+    self.daemon.close()
+    try:
+      if self.path.is_socket():
+        self.path.unlink()
+    except OSError:
+      pass
+
+
+def serve(
+  path: Optional[Path] = None,
+  poll: bool = False,
+  idle_timeout: Optional[float] = None,
+  ready: Optional[Callable[[DaemonServer], None]] = None,
+):
+  """Run a daemon until ``shutdown`` is requested or it has been idle too long.
+
+  Args:
+      path: Socket path (default: ``daemon_client.socket_path()``)
+      poll: Poll for changes instead of using inotify
+      idle_timeout: Exit after this many seconds without a request
+      ready: Called with the server once it is listening
+  """
+  server = DaemonServer(path or socket_path(), Daemon(poll=poll))
+  if idle_timeout:
+    threading.Thread(target=_exit_when_idle, args=(server, idle_timeout), daemon=True).start()
+  try:
+    if ready is not None:
+      ready(server)
+    server.serve_forever(poll_interval=0.2)
+  finally:
+    server.server_close()
+
+
+def _exit_when_idle(server: DaemonServer, idle_timeout: float):
+  while True:
+    idle = time.monotonic() - server.daemon.last_request
+    if idle >= idle_timeout:
+      server.shutdown()
+      return
+    time.sleep(min(idle_timeout - idle, 1.0))
+
+
+def _project_path(params: Dict[str, Any]) -> Path:
+  project = params.get('project')
+  if not isinstance(project, str) or not project:
+    raise RpcError(INVALID_PARAMS, 'project must be a path')
+  return Path(project).resolve()
+
+
+def _relative(path: Optional[Path], project_dir: Path) -> Optional[str]:
+  if path is None:
+    return None
+  try:
+    return Path(path).relative_to(project_dir).as_posix()
+  except ValueError:
+    return str(path)
+
+
+def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+  return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def is_running(path: Optional[Path] = None) -> bool:
+  """Whether a daemon answers on ``path``."""
+  try:
+    call('ping', path=path, timeout=0.5)
+  except DaemonUnavailable:
+    return False
+  return True
@@ -0,0 +1,95 @@
+"""Client side of the ``aiproj serve`` protocol.
+
+Only the standard library's ``socket`` and ``json`` are imported, so CLI fast
+paths can ask a running daemon before paying for the detector, typer or rich.
+The only such path is the single-project ``aiproj list``; ``commands`` is there
+for editor plugins, since no subcommand lists commands.
+
+The protocol is JSON-RPC 2.0 over a Unix domain socket, one request and one
+response per line::
+
+    {"jsonrpc": "2.0", "id": 1, "method": "status", "params": {"project": "/src/app"}}
+    {"jsonrpc": "2.0", "id": 1, "result": [{"provider": "claude", ...}]}
+"""
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# A live daemon answers from memory; anything slower is treated as unavailable
+DEFAULT_TIMEOUT = 2.0
+
+
+class DaemonUnavailable(Exception):
+  """No daemon is listening (or it did not answer in time)."""
+
+
+class DaemonError(Exception):
+  """The daemon answered with a JSON-RPC error."""
+
+  def __init__(self, code: int, message: str):
+    super().__init__(message)
+    self.code = code
+
+
+def socket_path() -> Path:
+  """Where the daemon listens: ``$AIPROJ_SOCKET``, else under the runtime or state dir."""
+  if os.environ.get('AIPROJ_SOCKET'):
+    return Path(os.environ['AIPROJ_SOCKET'])
+  if os.environ.get('XDG_RUNTIME_DIR'):
+    return Path(os.environ['XDG_RUNTIME_DIR']) / 'aiproj' / 'daemon.sock'
+  base = os.environ.get('XDG_STATE_HOME') or Path.home() / '.local' / 'state'
+  return Path(base) / 'aiproj' / 'daemon.sock'
+
+
+def daemon_enabled() -> bool:
+  """``aiproj list`` uses a running daemon unless ``AIPROJ_DAEMON`` is 0, false or off."""
+  return os.environ.get('AIPROJ_DAEMON', '1').lower() not in ('0', 'false', 'off', 'no')
+
+
+def call(
+  method: str,
+  params: Optional[Dict[str, Any]] = None,
+  path: Optional[Path] = None,
+  timeout: float = DEFAULT_TIMEOUT,
+) -> Any:
+  """Send one request and return its result.
+
+  Raises:
+      DaemonUnavailable: Nothing is listening on the socket
+      DaemonError: The daemon reported an error
+  """
+  request = {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params or {}}
+  try:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+      sock.settimeout(timeout)
+      sock.connect(str(path or socket_path()))
+      sock.sendall(json.dumps(request).encode() + b'\n')
+      chunks = []
+      while not chunks or not chunks[-1].endswith(b'\n'):
+        chunk = sock.recv(65536)
+        if not chunk:
+          break
+        chunks.append(chunk)
+  except OSError as e:  # missing socket, refused, timed out, path too long
+    raise DaemonUnavailable(str(e)) from e
+
+  try:
+    response = json.loads(b''.join(chunks))
+  except ValueError as e:
+    raise DaemonUnavailable(f'invalid response: {e}') from e
+  if 'error' in response:
+    raise DaemonError(response['error'].get('code', 0), response['error'].get('message', ''))
+  return response.get('result')
+
+
+def try_call(method: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+  """Like ``call``, but None when the daemon is disabled, not running or failing."""
+  if not daemon_enabled():
+    return None
+  try:
+    return call(method, params)
+  except (DaemonUnavailable, DaemonError):
+    return None
@@ -1,48 +1,168 @@
 """Core detection logic for AI provider configurations."""
 
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Optional
 
 from ..providers.base import Provider
-from ..providers.claude import ClaudeProvider
-from ..providers.codex import CodexProvider
-from ..providers.gemini import GeminiProvider
+from ..providers.registry import ProviderRegistry
+from .cache import StatusCache, stat_signature
+from .gitindex import GitIndex, git_index_enabled
+from .profiling import profiled, span
+from .snapshot import ProjectSnapshot, TargetedSnapshot
 
 
 class ProjectDetector:
   """Detect existing AI provider configurations in a project."""
 
-  def __init__(self):
-    self.providers = {
-      'claude': ClaudeProvider(),
-      'gemini': GeminiProvider(),
-      'codex': CodexProvider(),
-    }
+  def __init__(
+    self, cache: Optional[StatusCache] = None, registry: Optional[ProviderRegistry] = None
+  ):
+    """Create a detector.
+
+    Args:
+        cache: Persistent status cache used by get_provider_status, if any
+        registry: Available providers (default: built-ins plus entry-point plugins)
+    """
+    self.cache = cache
+    self.providers = registry if registry is not None else ProviderRegistry()
+    self._snapshots: Dict[Path, ProjectSnapshot] = {}
+    self._git_indexes: Dict[Path, Optional[GitIndex]] = {}
+
+  @property
+  def root_names(self) -> List[str]:
+    """Project root entries any provider looks at (markers and watched paths)."""
+    names = {}
+    for spec in self.providers.specs.values():
+      for path in spec.markers + spec.status_paths:
+        names[path.split('/')[0]] = None
+    return list(names)
+
+  def git_index(self, project_dir: Path) -> Optional[GitIndex]:
+    """Index of the git worktree containing ``project_dir`` (None if there is none).
+
+    Set ``AIPROJ_GIT_INDEX=0`` to always detect by listing directories.
+    """
+    if project_dir not in self._git_indexes:
+      self._git_indexes[project_dir] = GitIndex.find(project_dir) if git_index_enabled() else None
+    return self._git_indexes[project_dir]
+
+  def new_snapshot(self, project_dir: Path) -> ProjectSnapshot:
+    """Scan a project without caching the result.
+
+    In a git worktree the root is not listed: the entries providers care about are
+    stat'ed instead, since a monorepo root can hold thousands of entries.
+    """
+    directories = [d for spec in self.providers.specs.values() for d in spec.directories]
+    if self.git_index(project_dir) is not None:
+      return TargetedSnapshot.scan(project_dir, directories, self.root_names)
+    return ProjectSnapshot.scan(project_dir, directories)
+
+  def snapshot(self, project_dir: Path) -> ProjectSnapshot:
+    """Get the shared snapshot of a project, scanning it on first use."""
+    snapshot = self._snapshots.get(project_dir)
+    if snapshot is None:
+      with span('detector.snapshot'):
+        snapshot = self.new_snapshot(project_dir)
+      self._snapshots[project_dir] = snapshot
+    return snapshot
+
+  def invalidate(self, project_dir: Optional[Path] = None):
+    """Drop cached snapshots after files changed on disk.
+
+    Args:
+        project_dir: Project to invalidate, or None to invalidate every project
+    """
+    if project_dir is None:
+      self._snapshots.clear()
+    else:
+      self._snapshots.pop(project_dir, None)
 
   def get_provider(self, name: str) -> Provider:
     """Get provider by name."""
     return self.providers.get(name)
 
-  def get_all_providers(self) -> Dict[str, Provider]:
-    """Get all available providers."""
-    return self.providers.copy()
+  def get_all_providers(self) -> Mapping[str, Provider]:
+    """Get all available providers (each is imported when first accessed)."""
+    return self.providers
+
+  def may_be_configured(self, name: str, snapshot: ProjectSnapshot) -> bool:
+    """Check a provider's markers without importing it; False means not configured."""
+    return any(snapshot.exists(marker) for marker in self.providers.specs[name].markers)
 
+  @profiled('detector.detect_existing_providers')
   def detect_existing_providers(self, project_dir: Path) -> Dict[str, bool]:
     """Detect which providers are already configured."""
+    snapshot = self.snapshot(project_dir)
     return {
-      name: provider.detect_existing(project_dir) for name, provider in self.providers.items()
+      name: self.may_be_configured(name, snapshot)
+      and self.providers[name].detect_existing(project_dir, snapshot)
+      for name in self.providers
     }
 
-  def get_provider_status(self, project_dir: Path) -> Dict[str, Dict[str, Any]]:
-    """Get detailed status of all providers including component counts."""
+  @profiled('detector.get_provider_status')
+  def get_provider_status(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> Dict[str, Dict[str, Any]]:
+    """Get detailed status of all providers including component counts.
+
+    With a cache, only providers whose watched paths changed since the cached
+    result was computed are recomputed. An explicit snapshot bypasses the cache.
+    """
+    use_cache = self.cache is not None and snapshot is None
     status = {}
-    for name, provider in self.providers.items():
-      if provider.detect_existing(project_dir):
-        status[name] = provider.get_existing_components(project_dir)
-      else:
-        status[name] = {'config': False, 'commands': 0, 'prompts': 0, 'agents': False}
+    for name, spec in self.providers.specs.items():
+      if use_cache:
+        signature = stat_signature(project_dir, spec.status_paths)
+        cached = self.cache.get(project_dir, name, signature)
+        if cached is not None:
+          status[name] = cached
+          continue
+
+      snapshot = snapshot or self.snapshot(project_dir)
+      status[name] = {'config': False, 'commands': 0, 'prompts': 0, 'agents': False}
+      if self.may_be_configured(name, snapshot):
+        provider = self.providers[name]
+        if provider.detect_existing(project_dir, snapshot):
+          status[name] = provider.get_existing_components(project_dir, snapshot)
+
+      if use_cache:
+        self.cache.put(project_dir, name, signature, status[name])
+
+    if use_cache:
+      self.cache.save()
     return status
 
+  @profiled('detector.get_provider_files')
+  def get_provider_files(self, project_dir: Path) -> Dict[str, Dict[str, List[str]]]:
+    """Project-relative paths of each provider's existing config and command files."""
+    snapshot = self.snapshot(project_dir)
+    files = {}
+    for name, spec in self.providers.specs.items():
+      configured = self.may_be_configured(name, snapshot)
+      files[name] = {
+        'config': [path for path in spec.status_paths if snapshot.is_file(path)],
+        'commands': self.providers[name].command_files(project_dir, snapshot) if configured else [],
+      }
+    return files
+
+  def get_provider_records(
+    self, project_dir: Path, status: Optional[Dict[str, Dict[str, Any]]] = None
+  ) -> List[Dict[str, Any]]:
+    """Status, component counts and file paths of every provider in a project.
+
+    Args:
+        project_dir: Project to describe
+        status: Provider status already computed for it (e.g. during discovery)
+    """
+    if status is None:
+      status = self.get_provider_status(project_dir)
+    files = self.get_provider_files(project_dir)
+    return [
+      {'provider': name, 'configured': any(components.values()), **components, 'files': files[name]}
+      for name, components in status.items()
+    ]
+
+  @profiled('detector.get_configured_providers')
   def get_configured_providers(self, project_dir: Path) -> List[str]:
     """Get list of provider names that are already configured."""
     return [
@@ -0,0 +1,246 @@
+"""Recursive discovery of provider configurations in monorepos."""
+
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .detector import ProjectDetector
+from .gitindex import GitIndex
+from .snapshot import ProjectSnapshot, TargetedSnapshot
+
+# Directory trees that never contain project provider configs worth reporting
+SKIP_DIRS = {'.git', '.hg', '.svn', '.aiproj', 'node_modules', '.venv', 'venv', '__pycache__'}
+
+
+@dataclass
+class DiscoveredProject:
+  """A directory containing at least one provider configuration."""
+
+  path: Path
+  status: Dict[str, Dict[str, Any]]
+
+  @property
+  def configured_providers(self) -> List[str]:
+    """Names of providers with any component present."""
+    return [name for name, components in self.status.items() if any(components.values())]
+
+
+class GitignoreRules:
+  """Patterns from one ``.gitignore`` file, matched relative to its directory."""
+
+  def __init__(self, base: str, text: str):
+    self.base = base
+    self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+
+    for line in text.splitlines():
+      line = line.rstrip()
+      if not line or line.startswith('#'):
+        continue
+
+      negate = line.startswith('!')
+      if negate:
+        line = line[1:]
+      dir_only = line.endswith('/')
+      line = line.rstrip('/')
+      # A slash anywhere but the end anchors the pattern to the .gitignore directory
+      anchored = '/' in line
+      line = line.lstrip('/')
+      if line:
+        self.rules.append((self._compile(line, anchored), negate, dir_only))
+
+  def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+    """Return True if ignored, False if re-included, or None if no pattern matched."""
+    if self.base:
+      if not rel_path.startswith(self.base + '/'):
+        return None
+      rel_path = rel_path[len(self.base) + 1 :]
+
+    result = None
+    for pattern, negate, dir_only in self.rules:
+      if dir_only and not is_dir:
+        continue
+      if pattern.match(rel_path):
+        result = not negate
+    return result
+
+  @staticmethod
+  def _compile(pattern: str, anchored: bool) -> re.Pattern:
+    """Translate a gitignore glob into a regular expression."""
+    regex = ''
+    i = 0
+    while i < len(pattern):
+      if pattern.startswith('**/', i):
+        regex += '(?:.*/)?'
+        i += 3
+      elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+        regex += '/.*'
+        i += 3
+      elif pattern[i] == '*':
+        regex += '[^/]*'
+        i += 1
+      elif pattern[i] == '?':
+        regex += '[^/]'
+        i += 1
+      elif pattern[i] == '[' and ']' in pattern[i + 1 :]:
+        end = pattern.index(']', i + 1)
+        regex += '[' + pattern[i + 1 : end].replace('!', '^', 1) + ']'
+        i = end + 1
+      else:
+        regex += re.escape(pattern[i])
+        i += 1
+
+    # Unanchored patterns match a name at any depth
+    prefix = '' if anchored else '(?:.*/)?'
+    return re.compile(f'^{prefix}{regex}$')
+
+
+def is_ignored(rules: List[GitignoreRules], rel_path: str, is_dir: bool) -> bool:
+  """Apply gitignore rule sets from the outermost directory inwards; last match wins."""
+  ignored = False
+  for rule_set in rules:
+    result = rule_set.match(rel_path, is_dir)
+    if result is not None:
+      ignored = result
+  return ignored
+
+
+def _read_directory(path: Path) -> Tuple[Dict[str, bool], Set[str], Optional[str]]:
+  """List a directory and read its ``.gitignore``.
+
+  Returns:
+      Tuple of ({name: is_dir}, names of symlinked directories, .gitignore text or None)
+  """
+  listing = {}
+  symlinks = set()
+  try:
+    with os.scandir(path) as entries:
+      for entry in entries:
+        listing[entry.name] = entry.is_dir()
+        if entry.is_symlink():
+          symlinks.add(entry.name)
+  except (FileNotFoundError, NotADirectoryError, PermissionError):
+    return {}, set(), None
+
+  gitignore = None
+  if listing.get('.gitignore') is False:
+    try:
+      gitignore = (path / '.gitignore').read_text(errors='replace')
+    except OSError:
+      gitignore = None
+  return listing, symlinks, gitignore
+
+
+def discover_provider_configs(
+  root: Path, detector: ProjectDetector = None, max_workers: int = 16
+) -> List[DiscoveredProject]:
+  """Walk ``root`` once and classify every directory holding provider configs.
+
+  Directory reads and the status of each project found run concurrently in one
+  thread pool. Provider config directories (``.claude/`` etc.), VCS metadata,
+  dependency trees and gitignored directories are not descended into. Inside a
+  git worktree the candidates come from the index instead of a walk (see
+  ``_discover_from_index``).
+
+  Args:
+      root: Directory to start the walk from
+      detector: Detector whose providers define what to look for
+      max_workers: Maximum number of concurrent directory reads and status checks
+
+  Returns:
+      Discovered projects sorted by path
+  """
+  detector = detector or ProjectDetector()
+  specs = detector.providers.specs.values()
+
+  # Entries that mark a directory as configured, for all providers at once
+  markers = set()
+  provider_dirs = set()
+  for spec in specs:
+    markers.update(spec.markers)
+    provider_dirs.update(directory.split('/')[0] for directory in spec.directories)
+
+  index = detector.git_index(root)
+  if index is not None:
+    try:
+      return _discover_from_index(root, detector, index, markers, max_workers)
+    except OSError:
+      pass  # unreadable index and no git binary: walk instead
+
+  # (relative path, future of its provider status), computed in the same pool as the reads
+  statuses = []
+  with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    # future -> (relative path, inherited gitignore rules)
+    pending = {executor.submit(_read_directory, root): ('', [])}
+
+    while pending:
+      done, _ = wait(pending, return_when=FIRST_COMPLETED)
+      for future in done:
+        rel_dir, rules = pending.pop(future)
+        listing, symlinks, gitignore = future.result()
+
+        if gitignore:
+          rules = rules + [GitignoreRules(rel_dir, gitignore)]
+
+        if markers.intersection(listing):
+          project_dir = root / rel_dir if rel_dir else root
+          snapshot = ProjectSnapshot(project_dir, listings={'': listing})
+          status = executor.submit(detector.get_provider_status, project_dir, snapshot)
+          statuses.append((rel_dir, status))
+
+        for name, is_dir in listing.items():
+          if not is_dir or name in symlinks or name in SKIP_DIRS or name in provider_dirs:
+            continue
+          child = f'{rel_dir}/{name}' if rel_dir else name
+          if is_ignored(rules, child, is_dir=True):
+            continue
+          pending[executor.submit(_read_directory, root / child)] = (child, rules)
+
+  found = [
+    DiscoveredProject(path=Path(rel_dir or '.'), status=status.result())
+    for rel_dir, status in statuses
+  ]
+  return sorted(found, key=lambda project: project.path.parts)
+
+
+def _discover_from_index(
+  root: Path, detector: ProjectDetector, index: GitIndex, markers: Set[str], max_workers: int
+) -> List[DiscoveredProject]:
+  """Classify the directories whose tracked or untracked files include a provider marker.
+
+  Each candidate is then checked on disk with a ``TargetedSnapshot``, which stats
+  the root entries and lists the provider directories, so deleted files and
+  untracked commands are accounted for. ``root`` itself is always checked, and
+  candidates are scanned and classified concurrently.
+  """
+  prefix = index.relative(root)
+  candidates = {''}
+  paths = [*index.provider_paths(markers), *index.untracked_paths(markers, prefix)]
+  for path in paths:
+    if prefix:
+      if not path.startswith(prefix + '/'):
+        continue
+      path = path[len(prefix) + 1 :]
+    parts = path.split('/')
+    for i, part in enumerate(parts):
+      if part in SKIP_DIRS:
+        break
+      if part in markers:
+        candidates.add('/'.join(parts[:i]))
+        break
+
+  directories = [d for spec in detector.providers.specs.values() for d in spec.directories]
+  root_names = detector.root_names
+
+  def classify(rel_dir: str) -> Optional[DiscoveredProject]:
+    snapshot = TargetedSnapshot.scan(root / rel_dir if rel_dir else root, directories, root_names)
+    if not any(snapshot.exists(marker) for marker in markers):
+      return None
+    status = detector.get_provider_status(snapshot.project_dir, snapshot)
+    return DiscoveredProject(path=Path(rel_dir or '.'), status=status)
+
+  with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    found = [project for project in executor.map(classify, sorted(candidates)) if project]
+  return sorted(found, key=lambda project: project.path.parts)
@@ -0,0 +1,116 @@
+"""Provider status across many repositories at once."""
+
+import glob
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .cache import StatusCache
+from .detector import ProjectDetector
+
+
+@dataclass
+class RootStatus:
+  """Provider status of one repository, or the error that prevented reading it."""
+
+  root: Path
+  status: Optional[Dict[str, Dict[str, Any]]] = None
+  error: Optional[str] = None
+  elapsed: float = 0.0
+
+  @property
+  def configured_providers(self) -> List[str]:
+    """Names of providers with any component present."""
+    if not self.status:
+      return []
+    return [name for name, components in self.status.items() if any(components.values())]
+
+
+@dataclass
+class FleetSummary:
+  """Aggregate counts over every scanned repository."""
+
+  roots: int = 0
+  errors: int = 0
+  unconfigured: int = 0
+  providers: Dict[str, int] = field(default_factory=dict)
+  commands: Dict[str, int] = field(default_factory=dict)
+  prompts: Dict[str, int] = field(default_factory=dict)
+
+  def add(self, result: RootStatus):
+    """Fold one repository's result into the totals."""
+    self.roots += 1
+    if result.error is not None:
+      self.errors += 1
+      return
+
+    configured = result.configured_providers
+    if not configured:
+      self.unconfigured += 1
+    for name, components in result.status.items():
+      self.providers[name] = self.providers.get(name, 0) + (name in configured)
+      self.commands[name] = self.commands.get(name, 0) + components['commands']
+      self.prompts[name] = self.prompts.get(name, 0) + components['prompts']
+
+
+def expand_roots(spec: str) -> List[Path]:
+  """Resolve ``--roots`` into directories.
+
+  Args:
+      spec: A file listing one root per line (blank lines and ``#`` comments are
+          ignored), or a glob pattern such as ``~/src/*``
+
+  Returns:
+      Directories in the order given by the file, or sorted glob matches
+  """
+  spec_path = Path(spec).expanduser()
+  if spec_path.is_file():
+    lines = (line.strip() for line in spec_path.read_text().splitlines())
+    return [Path(line).expanduser() for line in lines if line and not line.startswith('#')]
+
+  matches = glob.glob(str(spec_path), recursive=True)
+  return [Path(match) for match in sorted(matches) if Path(match).is_dir()]
+
+
+def _root_status(root: Path, detector: Optional[ProjectDetector]) -> RootStatus:
+  """Read one repository's provider status, capturing any failure."""
+  start = time.perf_counter()
+  try:
+    if not root.is_dir():
+      raise NotADirectoryError(f'not a directory: {root}')
+    # StatusCache is not thread-safe, so each root gets its own over the same directory
+    cache = StatusCache(detector.cache.directory) if detector and detector.cache else None
+    registry = detector.providers if detector else None
+    status = ProjectDetector(cache=cache, registry=registry).get_provider_status(root)
+    return RootStatus(root=root, status=status, elapsed=time.perf_counter() - start)
+  except OSError as e:
+    return RootStatus(root=root, error=str(e), elapsed=time.perf_counter() - start)
+  except Exception as e:
+    # A broken provider plugin or malformed file must not abort the whole scan
+    error = f'{type(e).__name__}: {e}'
+    return RootStatus(root=root, error=error, elapsed=time.perf_counter() - start)
+
+
+def iter_fleet_status(
+  roots: Iterable[Path], max_workers: int = 32, detector: Optional[ProjectDetector] = None
+) -> Iterator[RootStatus]:
+  """Yield each repository's status as soon as it is ready.
+
+  Roots are read concurrently in a bounded thread pool, so a slow or unreadable
+  repository delays only its own result.
+
+  Args:
+      roots: Repository directories to inspect
+      max_workers: Maximum number of repositories read at the same time
+      detector: Detector whose provider registry and status cache setting are used
+          (default: a fresh registry and no cache)
+
+  Yields:
+      RootStatus per root, in completion order
+  """
+  with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    futures = [executor.submit(_root_status, root, detector) for root in roots]
+    for future in as_completed(futures):
+      yield future.result()
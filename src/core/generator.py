@@ -1,18 +1,87 @@
 """Core generator logic for AI provider configurations."""
 
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from ..providers.base import ProviderConfig
+from . import iostats
+from .atomic import AtomicWriter, Durability, LinkMode, same_content
 from .detector import ProjectDetector
+from .merge import MergeConflict, MergeIndex
+from .profiling import profiled, span
+
+
+class LinkIndex:
+  """Migrated command and prompt files, looked up by content to find link sources.
+
+  Each source is stat'ed once; an output is compared byte for byte only with
+  sources of the same size, so no body has to stay in memory for the lookup.
+  """
+
+  def __init__(self, config: Optional[ProviderConfig]):
+    self._by_size: Dict[int, List[Path]] = {}
+    commands = [*config.commands, *config.prompts] if config is not None else []
+    for command in commands:
+      if command.path is None:
+        continue
+      iostats.count('stats')
+      try:
+        size = os.stat(command.path).st_size
+      except OSError:
+        continue
+      self._by_size.setdefault(size, []).append(command.path)
+
+  def find(self, content: str) -> Optional[Path]:
+    """A source file holding exactly ``content``, if there is one."""
+    data = content.encode()
+    for path in self._by_size.get(len(data), ()):
+      if same_content(path, data):
+        return path
+    return None
+
+
+def link_sources(files: Dict[str, str], config: Optional[ProviderConfig]) -> Dict[str, Path]:
+  """Map outputs whose text is exactly a migrated command's or prompt's to that file."""
+  if config is None:
+    return {}
+  index = LinkIndex(config)
+  sources = {}
+  for path, content in files.items():
+    source = index.find(content)
+    if source is not None:
+      sources[path] = source
+  return sources
 
 
 class ConfigGenerator:
-  """Generate AI provider configurations with content migration."""
+  """Generate AI provider configurations with content migration.
+
+  Args:
+      detector: Shared detector (a new one is created if omitted)
+      durability: fsync policy for ``write_config_files``
+      link: How ``write_config_files`` materializes outputs identical to their source
+  """
 
-  def __init__(self):
-    self.detector = ProjectDetector()
+  def __init__(
+    self,
+    detector: ProjectDetector = None,
+    durability: Durability = Durability.none,
+    link: LinkMode = LinkMode.copy,
+  ):
+    self.detector = detector or ProjectDetector()
+    self.durability = Durability(durability)
+    self.link = LinkMode(link)
+    # Name conflicts resolved by the most recent migration (per target for generate_targets)
+    self.conflicts: List[MergeConflict] = []
+    self.target_conflicts: Dict[str, List[MergeConflict]] = {}
+    # Generated outputs that are byte-for-byte copies of a migrated file, and that file
+    self.link_sources: Dict[str, Path] = {}
+    # Paths produced per target by the most recent stream_targets
+    self.target_files: Dict[str, List[str]] = {}
 
   def generate_provider_config(
     self,
@@ -20,6 +89,7 @@ class ConfigGenerator:
     provider_name: str,
     components: List[str] = None,
     migrate_from: List[str] = None,
+    priority: List[str] = None,
   ) -> Dict[str, str]:
     """Generate configuration for a provider, optionally migrating content from others.
 
@@ -28,6 +98,8 @@ class ConfigGenerator:
         provider_name: Provider to generate config for
         components: List of components to generate (config, commands, prompts, agents)
         migrate_from: List of provider names to migrate content from
+        priority: Providers to prefer when migrated commands share a name
+            (default: the order of ``migrate_from``)
 
     Returns:
         Dict mapping file paths to content
@@ -39,50 +111,315 @@ class ConfigGenerator:
     # Load existing content from source providers
     base_config = None
     if migrate_from:
-      base_config = self._merge_source_configs(project_dir, migrate_from)
+      base_config = self._merge_source_configs(project_dir, migrate_from, priority)
 
     # Generate new configuration
-    return provider.generate_config(project_dir, components, base_config)
+    with span(f'generate:{provider_name}'):
+      files = provider.generate_config(project_dir, components, base_config)
+    if self.link is not LinkMode.copy:
+      self.link_sources.update(link_sources(files, base_config))
+    return files
+
+  def generate_targets(
+    self,
+    project_dir: Path,
+    targets: Dict[str, List[str]],
+    migrate_from: List[str] = None,
+    priority: List[str] = None,
+    max_workers: int = 4,
+    errors: Optional[Dict[str, Exception]] = None,
+  ) -> Dict[str, Dict[str, str]]:
+    """Generate configuration for several providers in one pass.
+
+    Source providers are loaded once and shared by every target; each target
+    migrates from ``migrate_from`` minus itself. Targets are generated
+    concurrently, and their name conflicts are stored in ``self.target_conflicts``.
+
+    Args:
+        project_dir: Target project directory
+        targets: Provider name -> components to generate
+        migrate_from: Providers to migrate content from
+        priority: Providers to prefer when migrated commands share a name
+        max_workers: Targets generated at once
+        errors: If given, a target whose generation fails is left out of the result
+            and its exception is stored here; otherwise the first failure is raised
+
+    Returns:
+        Provider name -> dict mapping file paths to content, in ``targets`` order
+    """
+    for provider_name in targets:
+      if not self.detector.get_provider(provider_name):
+        raise ValueError(f'Unknown provider: {provider_name}')
+
+    migrate_from = migrate_from or []
+    sources = self._load_source_configs(project_dir, migrate_from)
+
+    def generate(
+      provider_name: str,
+    ) -> Tuple[Dict[str, str], List[MergeConflict], Dict[str, Path]]:
+      base_config, conflicts = None, []
+      own_sources = [name for name in migrate_from if name != provider_name]
+      if own_sources:
+        base_config, conflicts = self._merge_configs(sources, own_sources, priority)
+      provider = self.detector.get_provider(provider_name)
+      with span(f'generate:{provider_name}'):
+        files = provider.generate_config(project_dir, targets[provider_name], base_config)
+      linked = link_sources(files, base_config) if self.link is not LinkMode.copy else {}
+      return files, conflicts, linked
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as executor:
+      futures = {name: executor.submit(generate, name) for name in targets}
+    results = {}
+    for name, future in futures.items():
+      try:
+        results[name] = future.result()
+      except Exception as e:
+        if errors is None:
+          raise
+        errors[name] = e
+
+    self.target_conflicts = {name: conflicts for name, (_, conflicts, _) in results.items()}
+    for _, _, linked in results.values():
+      self.link_sources.update(linked)
+    return {name: files for name, (files, _, _) in results.items()}
+
+  def stream_targets(
+    self,
+    project_dir: Path,
+    targets: Dict[str, List[str]],
+    migrate_from: List[str] = None,
+    priority: List[str] = None,
+    max_workers: int = 4,
+  ) -> Iterator[Tuple[str, str]]:
+    """Generate several providers' files lazily, for ``write_config_stream``.
+
+    Like ``generate_targets``, but only the sources are loaded and merged up front
+    (so ``self.target_conflicts`` is set on return). Once the iterator is consumed,
+    targets are generated concurrently by up to ``max_workers`` threads that feed
+    a small bounded queue, and each migrated body is read when its item is
+    produced. A streaming write therefore holds a few files at a time instead of
+    the whole corpus. The paths produced per target are recorded in
+    ``self.target_files``. A producer waits while the queue is full, so each
+    target's ``generate:<name>`` profiling span also covers that wait.
+
+    Args:
+        project_dir: Target project directory
+        targets: Provider name -> components to generate
+        migrate_from: Providers to migrate content from
+        priority: Providers to prefer when migrated commands share a name
+        max_workers: Targets generated at once
+
+    Returns:
+        Iterator of ``(filepath, content)``; items of different targets interleave
+    """
+    for provider_name in targets:
+      if not self.detector.get_provider(provider_name):
+        raise ValueError(f'Unknown provider: {provider_name}')
+
+    migrate_from = migrate_from or []
+    sources = self._load_source_configs(project_dir, migrate_from)
+    if len(targets) > 1:
+      # A target that is also another target's source gets overwritten mid-stream;
+      # read its bodies now so the others migrate what was there before
+      for name in set(targets).intersection(sources):
+        for command in [*sources[name].commands, *sources[name].prompts]:
+          command.content = command.read_content()
+    base_configs = {}
+    self.target_conflicts = {}
+    for provider_name in targets:
+      own_sources = [name for name in migrate_from if name != provider_name]
+      base_configs[provider_name], self.target_conflicts[provider_name] = (
+        self._merge_configs(sources, own_sources, priority) if own_sources else (None, [])
+      )
+    self.target_files = {name: [] for name in targets}
+    if len(targets) == 1:
+      (provider_name,) = targets
+      return self._target_items(project_dir, provider_name, targets[provider_name], base_configs)
+    return self._stream(project_dir, targets, base_configs, max_workers)
+
+  def _stream(
+    self,
+    project_dir: Path,
+    targets: Dict[str, List[str]],
+    base_configs: Dict[str, Optional[ProviderConfig]],
+    max_workers: int,
+  ) -> Iterator[Tuple[str, str]]:
+    """Run one producer per target in a thread pool and yield their items as they arrive."""
+    workers = max(1, min(max_workers, len(targets)))
+    # Room for one waiting item per producer, so memory stays at a few files
+    items: queue.Queue = queue.Queue(maxsize=workers)
+    stop = threading.Event()
+    finished = object()
+
+    def put(item) -> bool:
+      while not stop.is_set():
+        try:
+          items.put(item, timeout=0.1)
+          return True
+        except queue.Full:
+          continue
+      return False
+
+    def produce(provider_name: str):
+      try:
+        for item in self._target_items(
+          project_dir, provider_name, targets[provider_name], base_configs
+        ):
+          if not put(item):
+            return
+      except BaseException as e:
+        put((finished, e))
+      else:
+        put((finished, None))
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+      for provider_name in targets:
+        executor.submit(produce, provider_name)
+      remaining = len(targets)
+      while remaining:
+        file_path, content = items.get()
+        if file_path is finished:
+          remaining -= 1
+          if content is not None:
+            raise content
+          continue
+        yield file_path, content
+    finally:
+      # Unblock producers if the consumer stopped early (e.g. a write failed)
+      stop.set()
+      executor.shutdown(wait=True, cancel_futures=True)
+
+  def _target_items(
+    self,
+    project_dir: Path,
+    provider_name: str,
+    components: List[str],
+    base_configs: Dict[str, Optional[ProviderConfig]],
+  ) -> Iterator[Tuple[str, str]]:
+    provider = self.detector.get_provider(provider_name)
+    base_config = base_configs.pop(provider_name)
+    index = LinkIndex(base_config) if self.link is not LinkMode.copy else None
+    with span(f'generate:{provider_name}'):
+      for file_path, content in provider.iter_config(project_dir, components, base_config):
+        self.target_files[provider_name].append(file_path)
+        if index is not None:
+          source = index.find(content)
+          if source is not None:
+            self.link_sources[file_path] = source
+        yield file_path, content
 
   def write_config_files(
-    self, project_dir: Path, files: Dict[str, str], force: bool = False
+    self,
+    project_dir: Path,
+    files: Dict[str, str],
+    force: bool = False,
+    sources: Optional[Dict[str, Path]] = None,
+    errors: Optional[Dict[str, Exception]] = None,
   ) -> List[str]:
     """Write configuration files to disk.
 
+    Each file is written to a temp file and renamed into place, so an interrupted
+    run never leaves a half-written file. Files that already hold the generated
+    content are left untouched (even with ``force``), keeping their mtimes stable
+    for file watchers. Unless ``self.link`` is ``copy``, files listed in ``sources``
+    become hard or symbolic links to their source instead.
+
     Args:
         project_dir: Target directory
         files: Dict of filepath -> content
         force: Overwrite existing files
+        sources: Filepath -> file with identical bytes (default: ``self.link_sources``)
+        errors: If given, a file that cannot be written is skipped and its exception
+            is stored here under its filepath; otherwise the first failure is raised
 
     Returns:
         List of files that were written
     """
-    written_files = []
+    return self.write_config_stream(project_dir, files.items(), force, sources, errors)
 
-    for file_path, content in files.items():
-      full_path = project_dir / file_path
+  @profiled('write_config_files')
+  def write_config_stream(
+    self,
+    project_dir: Path,
+    items: Iterable[Tuple[str, str]],
+    force: bool = False,
+    sources: Optional[Dict[str, Path]] = None,
+    errors: Optional[Dict[str, Exception]] = None,
+  ) -> List[str]:
+    """Write ``(filepath, content)`` items as they arrive, as ``write_config_files`` does.
 
-      # Check if file exists and force is not set
-      if full_path.exists() and not force:
+    Nothing is kept of an item once it is written, so with a lazy iterable (see
+    ``stream_targets``) memory use is bounded by the largest file. A link source is
+    looked up when its item arrives, so ``sources`` may be filled while iterating.
+
+    Returns:
+        List of files that were written
+    """
+    sources = self.link_sources if sources is None else sources
+    written_files = []
+    writer = AtomicWriter(self.durability)
+    ready_dirs = set()
+
+    for file_path, content in items:
+      try:
+        changed = self._write_file(
+          writer, ready_dirs, project_dir, file_path, content, force, sources
+        )
+      except Exception as e:
+        if errors is None:
+          raise
+        errors[file_path] = e
         continue
+      if changed:
+        written_files.append(file_path)
+
+    writer.finish()
+    if written_files:
+      self.detector.invalidate(project_dir)
+
+    return written_files
+
+  def _write_file(
+    self,
+    writer: AtomicWriter,
+    ready_dirs: Set[Path],
+    project_dir: Path,
+    file_path: str,
+    content: str,
+    force: bool,
+    sources: Dict[str, Path],
+  ) -> bool:
+    full_path = project_dir / file_path
+
+    # Check if file exists and force is not set
+    iostats.count('stats')
+    try:
+      st = os.stat(full_path)
+    except OSError:
+      st = None
+    if st is not None and not force:
+      return False
 
-      # Handle case where parent directory conflicts with existing file
-      parent = full_path.parent
-      if parent.exists() and parent.is_file():
+    # Handle case where parent directory conflicts with existing file
+    parent = full_path.parent
+    if parent not in ready_dirs:
+      if parent.is_file():
         if force:
           parent.unlink()  # Remove conflicting file
         else:
-          continue
+          return False
 
       # Create directory if needed
       parent.mkdir(parents=True, exist_ok=True)
+      ready_dirs.add(parent)
 
-      # Write file
-      full_path.write_text(content)
-      written_files.append(file_path)
-
-    return written_files
+    source = sources.get(file_path) if self.link is not LinkMode.copy else None
+    if source is not None:
+      return writer.link(full_path, source, content.encode(), self.link)
+    return writer.write(full_path, content.encode(), st)
 
+  @profiled('open_in_editor')
   def open_in_editor(
     self, project_dir: Path, provider_name: str, components: List[str] = None
   ) -> bool:
@@ -118,30 +455,65 @@ class ConfigGenerator:
     except (subprocess.SubprocessError, FileNotFoundError):
       return False
 
-  def _merge_source_configs(self, project_dir: Path, source_providers: List[str]) -> ProviderConfig:
-    """Merge configuration from multiple source providers."""
-    merged_config = ProviderConfig()
+  def _merge_source_configs(
+    self, project_dir: Path, source_providers: List[str], priority: List[str] = None
+  ) -> ProviderConfig:
+    """Merge configuration from multiple source providers.
 
+    Commands and prompts are merged through a ``MergeIndex``: identical commands
+    with the same name collapse into one, and differing ones are resolved by
+    ``priority`` (default: ``source_providers`` order) and recorded in
+    ``self.conflicts``.
+    """
+    sources = self._load_source_configs(project_dir, source_providers)
+    merged_config, self.conflicts = self._merge_configs(sources, source_providers, priority)
+    return merged_config
+
+  def _load_source_configs(
+    self, project_dir: Path, source_providers: List[str]
+  ) -> Dict[str, ProviderConfig]:
+    """Load the existing configuration of every source provider that is set up."""
+    snapshot = self.detector.snapshot(project_dir)
+    sources = {}
     for provider_name in source_providers:
       provider = self.detector.get_provider(provider_name)
-      if provider and provider.detect_existing(project_dir):
-        source_config = provider.load_existing_config(project_dir)
+      if provider and provider.detect_existing(project_dir, snapshot):
+        with span(f'load:{provider_name}'):
+          sources[provider_name] = provider.load_existing_config(project_dir, snapshot)
+    return sources
 
-        # Merge main config (use first non-empty one)
-        if source_config.main_config and not merged_config.main_config:
-          merged_config.main_config = source_config.main_config
+  @profiled('merge')
+  def _merge_configs(
+    self,
+    sources: Dict[str, ProviderConfig],
+    source_providers: List[str],
+    priority: List[str] = None,
+  ) -> Tuple[ProviderConfig, List[MergeConflict]]:
+    """Merge loaded source configurations in ``source_providers`` order."""
+    merged_config = ProviderConfig()
+    index = MergeIndex(priority or source_providers)
 
-        # Merge commands (combine all)
-        merged_config.commands.extend(source_config.commands)
+    for provider_name in source_providers:
+      source_config = sources.get(provider_name)
+      if source_config is None:
+        continue
 
-        # Merge prompts (combine all)
-        merged_config.prompts.extend(source_config.prompts)
+      # Merge main config (use first non-empty one)
+      if source_config.main_config and not merged_config.main_config:
+        merged_config.main_config = source_config.main_config
 
-        # Merge agents (use first non-empty one)
-        if source_config.agents and not merged_config.agents:
-          merged_config.agents = source_config.agents
+      # Merge commands and prompts, which share one file name space per target
+      for command in source_config.commands:
+        index.add(provider_name, 'commands', command)
+      for prompt in source_config.prompts:
+        index.add(provider_name, 'prompts', prompt)
 
-        # Merge additional files
-        merged_config.additional_files.update(source_config.additional_files)
+      # Merge agents (use first non-empty one)
+      if source_config.agents and not merged_config.agents:
+        merged_config.agents = source_config.agents
 
-    return merged_config
+      # Merge additional files
+      merged_config.additional_files.update(source_config.additional_files)
+
+    merged_config.commands, merged_config.prompts = index.results()
+    return merged_config, index.conflicts
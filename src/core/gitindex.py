@@ -0,0 +1,366 @@
+"""Tracked provider files read from the git index instead of walking the tree.
+
+In a large monorepo, finding every directory with provider configs means listing
+millions of directories. The index already names every tracked file, so
+``GitIndex.provider_paths`` reads ``.git/index`` once (parsed directly, or through
+``git ls-files`` for layouts the parser does not handle), keeps the few paths that
+have a provider marker as a component, and caches them on disk until the index
+changes. Callers still stat the candidates, so deleted and untracked provider
+files are seen. Projects whose provider files are all untracked come from
+``GitIndex.untracked_paths``, which asks ``git ls-files --others`` for paths
+matching the markers and caches them until a searched directory changes.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import struct
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import iostats
+from .cache import cache_home, is_racy, stat_signature
+from .state import read_json, write_json
+
+CACHE_VERSION = 1
+
+_HEADER = struct.Struct('>4sII')
+_STAT_FIELDS = 40  # ctime, mtime, dev, ino, mode, uid, gid, size
+_MODE_OFFSET = 24
+_S_IFMT = 0o170000
+_S_IFDIR = 0o040000
+_EXTENDED_FLAG = 0x4000
+_NAME_MASK = 0x0FFF
+
+
+class UnsupportedIndex(ValueError):
+  """The index uses a layout this parser does not read (e.g. split or sparse)."""
+
+
+def git_index_enabled() -> bool:
+  """Detection uses the git index unless ``AIPROJ_GIT_INDEX`` is 0, false or off."""
+  return os.environ.get('AIPROJ_GIT_INDEX', '1').lower() not in ('0', 'false', 'off', 'no')
+
+
+def parse_index(data: bytes, hash_size: int = 20) -> List[bytes]:
+  """Paths of the entries in an index file (versions 2 to 4), in index order.
+
+  Raises:
+      UnsupportedIndex: Split index, sparse directory entries or an unknown version
+      ValueError: The data is not a git index
+  """
+  signature, version, count = _HEADER.unpack_from(data)
+  if signature != b'DIRC':
+    raise ValueError('not a git index')
+  if version not in (2, 3, 4):
+    raise UnsupportedIndex(f'index version {version}')
+
+  flags_offset = _STAT_FIELDS + hash_size
+  names = []
+  offset = _HEADER.size
+  previous = b''
+  for _ in range(count):
+    mode = int.from_bytes(data[offset + _MODE_OFFSET : offset + _MODE_OFFSET + 4], 'big')
+    if mode & _S_IFMT == _S_IFDIR:
+      raise UnsupportedIndex('sparse index')
+    flags = int.from_bytes(data[offset + flags_offset : offset + flags_offset + 2], 'big')
+    name_start = offset + flags_offset + 2
+    if flags & _EXTENDED_FLAG and version >= 3:
+      name_start += 2
+
+    if version == 4:
+      strip, name_start = _varint(data, name_start)
+      end = data.index(b'\0', name_start)
+      name = previous[: len(previous) - strip] + data[name_start:end]
+      offset = end + 1
+      previous = name
+    else:
+      length = flags & _NAME_MASK
+      end = name_start + length if length < _NAME_MASK else data.index(b'\0', name_start)
+      name = data[name_start:end]
+      # Entries are NUL-padded to a multiple of 8 bytes
+      offset += (name_start - offset + (end - name_start) + 8) & ~7
+    names.append(name)
+
+  if b'link' in _extensions(data, offset, hash_size):
+    raise UnsupportedIndex('split index')
+  return names
+
+
+def _varint(data: bytes, offset: int) -> Tuple[int, int]:
+  """Decode git's offset varint; return (value, next offset)."""
+  byte = data[offset]
+  offset += 1
+  value = byte & 0x7F
+  while byte & 0x80:
+    value += 1
+    byte = data[offset]
+    offset += 1
+    value = (value << 7) + (byte & 0x7F)
+  return value, offset
+
+
+def _extensions(data: bytes, offset: int, hash_size: int) -> List[bytes]:
+  """Signatures of the extensions between the entries and the trailing checksum."""
+  signatures = []
+  end = len(data) - hash_size
+  while offset + 8 <= end:
+    signature = data[offset : offset + 4]
+    size = int.from_bytes(data[offset + 4 : offset + 8], 'big')
+    signatures.append(signature)
+    offset += 8 + size
+  return signatures
+
+
+def matching_paths(names: List[bytes], components: Iterable[str]) -> List[str]:
+  """Paths that have one of ``components`` as a path component.
+
+  The names are joined into one buffer and searched with ``bytes.find`` per
+  component, so the cost is a few linear scans rather than a loop over entries.
+  """
+  blob = b'\n' + b'\n'.join(names) + b'\n'
+  found = set()
+  for component in components:
+    needle = component.encode()
+    start = 0
+    while True:
+      position = blob.find(needle, start)
+      if position < 0:
+        break
+      after = position + len(needle)
+      start = after
+      if blob[position - 1] not in b'/\n' or blob[after] not in b'/\n':
+        continue
+      line_start = blob.rfind(b'\n', 0, position) + 1
+      line_end = blob.index(b'\n', after)
+      found.add(blob[line_start:line_end].decode('utf-8', 'surrogateescape'))
+      start = line_end
+  return sorted(found)
+
+
+class GitIndex:
+  """The index of one git worktree.
+
+  Args:
+      worktree: Top of the working tree
+      git_dir: Its git directory (``.git``, or the target of a ``.git`` file)
+  """
+
+  def __init__(self, worktree: Path, git_dir: Path):
+    self.worktree = worktree
+    self.git_dir = git_dir
+    self.index_path = git_dir / 'index'
+    self._memo: Dict[Tuple[str, ...], Tuple[List, List[str]]] = {}
+    self._untracked_memo: Dict[str, Dict] = {}
+
+  @classmethod
+  def find(cls, path: Path) -> Optional['GitIndex']:
+    """The worktree containing ``path``, or None outside git repositories."""
+    path = Path(os.path.abspath(path))
+    for directory in (path, *path.parents):
+      dot_git = directory / '.git'
+      iostats.count('stats')
+      if dot_git.is_dir():
+        return cls(directory, dot_git)
+      if dot_git.is_file():
+        try:
+          text = dot_git.read_text()
+        except OSError:
+          return None
+        if not text.startswith('gitdir:'):
+          return None
+        return cls(directory, (directory / text[len('gitdir:') :].strip()).resolve())
+    return None
+
+  def relative(self, path: Path) -> str:
+    """``path`` relative to the worktree, as a POSIX path ('' for the top)."""
+    rel_path = Path(os.path.abspath(path)).relative_to(self.worktree).as_posix()
+    return '' if rel_path == '.' else rel_path
+
+  def provider_paths(self, components: Iterable[str]) -> List[str]:
+    """Tracked paths with one of ``components`` (e.g. provider markers) as a component.
+
+    Cached in memory and on disk until the index file changes.
+    """
+    key = tuple(sorted(components))
+    signature = stat_signature(self.index_path.parent, [self.index_path.name])
+    memo = self._memo.get(key)
+    if memo is not None and memo[0] == signature:
+      return memo[1]
+
+    cache_path = self._cache_path()
+    cached = read_json(cache_path)
+    if (
+      isinstance(cached, dict)
+      and cached.get('version') == CACHE_VERSION
+      and cached.get('index') == signature
+      and cached.get('components') == list(key)
+    ):
+      paths = cached['paths']
+    else:
+      paths = matching_paths(self.tracked_names(), key)
+      try:
+        write_json(
+          cache_path,
+          {'version': CACHE_VERSION, 'index': signature, 'components': list(key), 'paths': paths},
+        )
+      except OSError:
+        pass
+    self._memo[key] = (signature, paths)
+    return paths
+
+  def untracked_paths(self, components: Iterable[str], under: str = '') -> List[str]:
+    """Untracked, not ignored paths with one of ``components`` as a component.
+
+    Found with ``git ls-files --others`` and cached on disk, like ``provider_paths``.
+    Untracked files change without touching the index, so the cache also holds the
+    mtimes of every directory git searched (tracked and untracked, not ignored ones)
+    and of the ignore files: while none of them changes, a pass costs a stat per
+    directory instead of a git process walking the tree.
+
+    Args:
+        components: Path components to look for (e.g. provider markers)
+        under: Worktree-relative directory to limit the search to ('' for all)
+
+    Returns:
+        Worktree-relative POSIX paths, sorted
+    """
+    key = sorted(components)
+    cache_path = self._cache_path(f'untracked:{under}')
+    index = stat_signature(self.index_path.parent, [self.index_path.name])
+    cached = self._untracked_memo.get(under) or read_json(cache_path)
+    if (
+      isinstance(cached, dict)
+      and cached.get('version') == CACHE_VERSION
+      and cached.get('index') == index
+      and cached.get('components') == key
+      and cached.get('mtimes') == self._mtimes(cached.get('watched', []))
+    ):
+      self._untracked_memo[under] = cached
+      return cached['paths']
+
+    # Stat before asking git, so a change made while git runs invalidates the result
+    watched = self._searched_paths(under)
+    mtimes = self._mtimes(watched)
+    # Directory names are literal; only the patterns below use glob magic
+    base = re.sub(r'([*?[\\])', r'\\\1', under) + '/' if under else ''
+    pathspecs = []
+    for component in key:
+      pathspecs += [f':(glob){base}**/{component}', f':(glob){base}**/{component}/**']
+    names = self._git('ls-files', '--others', '--exclude-standard', '-z', '--', *pathspecs)
+    paths = matching_paths(names, key) if names else []
+
+    cached = {
+      'version': CACHE_VERSION,
+      'index': index,
+      'components': key,
+      'watched': watched,
+      'mtimes': mtimes,
+      'paths': paths,
+    }
+    if not is_racy([*index, *([mtime] for mtime in mtimes)], time.time_ns()):
+      self._untracked_memo[under] = cached
+      try:
+        write_json(cache_path, cached)
+      except OSError:
+        pass
+    return paths
+
+  def _mtimes(self, paths: List[str]) -> List[Optional[int]]:
+    """``st_mtime_ns`` of each worktree-relative path, or None where it is missing."""
+    top = str(self.worktree)
+    iostats.count('stats', len(paths))
+    mtimes = []
+    for rel_path in paths:
+      try:
+        mtimes.append(os.stat(os.path.join(top, rel_path)).st_mtime_ns)
+      except OSError:
+        mtimes.append(None)
+    return mtimes
+
+  def _searched_paths(self, under: str) -> List[str]:
+    """Directories ``git ls-files --others`` searches below ``under``, and the ignore files.
+
+    Adding or removing an untracked file changes the mtime of one of these
+    directories, and editing an ignore file changes which files git reports.
+    """
+    prefix = under + '/' if under else ''
+    directories = {under}
+    ignore_files = [str(self.common_dir / 'info' / 'exclude')]
+    for name in self.tracked_names():
+      path = name.decode('utf-8', 'surrogateescape')
+      if path == '.gitignore' or path.endswith('/.gitignore'):
+        ignore_files.append(path)
+      if not path.startswith(prefix):
+        continue
+      parent = path.rpartition('/')[0]
+      while parent not in directories and len(parent) > len(under):
+        directories.add(parent)
+        parent = parent.rpartition('/')[0]
+
+    # Untracked directories are listed once, collapsed; everything below them is searched
+    pathspec = [f':(literal){under}'] if under else []
+    for name in self._git(
+      'ls-files', '--others', '--exclude-standard', '--directory', '-z', '--', *pathspec
+    ):
+      path = name.decode('utf-8', 'surrogateescape')
+      if not path.endswith('/'):
+        continue
+      for directory, _, files in os.walk(self.worktree / path):
+        rel_dir = Path(directory).relative_to(self.worktree).as_posix()
+        directories.add(rel_dir)
+        if '.gitignore' in files:
+          ignore_files.append(f'{rel_dir}/.gitignore')
+    return sorted(directories) + sorted(set(ignore_files))
+
+  def tracked_names(self) -> List[bytes]:
+    """Every tracked path, from the index file or else ``git ls-files``."""
+    try:
+      data = self.index_path.read_bytes()
+    except FileNotFoundError:
+      return []  # a fresh repository with nothing staged
+    iostats.count('files_read')
+    iostats.count('bytes_read', len(data))
+    try:
+      return parse_index(data, self._hash_size())
+    except (ValueError, IndexError, struct.error):
+      return self._ls_files()
+
+  @property
+  def common_dir(self) -> Path:
+    """Git directory shared by all worktrees (holds ``config``); ``git_dir`` unless linked."""
+    try:
+      common = (self.git_dir / 'commondir').read_text().strip()
+    except OSError:
+      return self.git_dir
+    return (self.git_dir / common).resolve()
+
+  def _hash_size(self) -> int:
+    try:
+      config = (self.common_dir / 'config').read_text(errors='replace')
+    except OSError:
+      return 20
+    return 32 if re.search(r'objectformat\s*=\s*sha256', config, re.IGNORECASE) else 20
+
+  def _ls_files(self) -> List[bytes]:
+    return self._git('ls-files', '-z')
+
+  def _git(self, *args: str) -> List[bytes]:
+    """Run ``git <args>`` in the worktree and split its NUL-terminated output."""
+    if shutil.which('git') is None:
+      raise OSError(f'git {args[0]} is needed and git is not installed')
+    try:
+      result = subprocess.run(
+        ['git', '-C', str(self.worktree), *args], capture_output=True, check=True
+      )
+    except subprocess.CalledProcessError as e:
+      raise OSError(f'git {args[0]} failed: {e.stderr.decode(errors="replace").strip()}') from e
+    return result.stdout.split(b'\0')[:-1]
+
+  def _cache_path(self, kind: str = 'tracked') -> Path:
+    name = str(self.worktree) if kind == 'tracked' else f'{self.worktree}\0{kind}'
+    digest = hashlib.sha1(name.encode()).hexdigest()
+    return cache_home() / 'gitindex' / f'{digest}.json'
@@ -0,0 +1,25 @@
+"""Process-wide I/O counters recorded with each run's metrics."""
+
+import threading
+from typing import Dict
+
+_counters: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def count(name: str, amount: int = 1):
+  """Add ``amount`` to counter ``name`` (e.g. 'files_read', 'bytes_written', 'stats')."""
+  with _lock:
+    _counters[name] = _counters.get(name, 0) + amount
+
+
+def snapshot() -> Dict[str, int]:
+  """Current counter values."""
+  with _lock:
+    return dict(_counters)
+
+
+def reset():
+  """Zero every counter."""
+  with _lock:
+    _counters.clear()
@@ -0,0 +1,115 @@
+"""Deduplicating merge of commands and prompts from several source providers."""
+
+import hashlib
+import re
+import tomllib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..providers.base import Command
+
+_FRONTMATTER = re.compile(r'^---\s*\n.*?\n---[ \t]*\n?', re.DOTALL)
+
+
+def normalized_body(content: str) -> str:
+  """Provider-independent form of a command body for comparison.
+
+  Drops markdown frontmatter, unwraps the ``prompt`` of a Gemini TOML command and
+  ignores line-ending and trailing-whitespace differences.
+  """
+  try:
+    data = tomllib.loads(content)
+  except tomllib.TOMLDecodeError:
+    data = None
+  if isinstance(data, dict) and isinstance(data.get('prompt'), str):
+    content = data['prompt']
+  else:
+    content = _FRONTMATTER.sub('', content, count=1)
+  lines = content.replace('\r\n', '\n').split('\n')
+  return '\n'.join(line.rstrip() for line in lines).strip()
+
+
+def content_hash(command: Command) -> str:
+  """Hex SHA-256 of a command's normalized body."""
+  return hashlib.sha256(normalized_body(command.read_content()).encode()).hexdigest()
+
+
+@dataclass
+class MergeConflict:
+  """Commands with the same name but different content; only ``kept`` is migrated."""
+
+  name: str
+  kept: str
+  dropped: List[str] = field(default_factory=list)
+
+
+@dataclass
+class _Entry:
+  provider: str
+  kind: str
+  command: Command
+  digest: Optional[str] = None
+
+  def hash(self) -> str:
+    if self.digest is None:
+      self.digest = content_hash(self.command)
+    return self.digest
+
+
+class MergeIndex:
+  """Index of merged commands keyed by name, with content hashes to tell duplicates apart.
+
+  Targets write one file per command name, so two sources contributing the same
+  name would overwrite each other. Identical commands (same normalized content)
+  collapse into one; different ones are resolved by provider priority and
+  recorded as conflicts. Bodies are only read and hashed when names collide.
+
+  Args:
+      priority: Providers in order of preference; unlisted providers rank last
+  """
+
+  def __init__(self, priority: Optional[List[str]] = None):
+    self.priority = {name: rank for rank, name in enumerate(priority or [])}
+    self.duplicates = 0
+    self._entries: Dict[str, _Entry] = {}
+    self._conflicts: Dict[str, MergeConflict] = {}
+
+  def add(self, provider: str, kind: str, command: Command):
+    """Add a command (``kind`` 'commands' or 'prompts') from ``provider``."""
+    entry = _Entry(provider, kind, command)
+    existing = self._entries.get(command.name)
+    if existing is None:
+      self._entries[command.name] = entry
+      return
+
+    # The winner keeps its own kind, so a prompt that wins is migrated as a prompt
+    winner, loser = existing, entry
+    if self._rank(entry) < self._rank(existing):
+      winner, loser = entry, existing
+    self._entries[command.name] = winner
+    if winner.hash() == loser.hash():
+      self.duplicates += 1
+      return
+
+    conflict = self._conflicts.setdefault(
+      command.name, MergeConflict(command.name, winner.provider)
+    )
+    if conflict.kept != winner.provider:
+      conflict.dropped.append(conflict.kept)
+      conflict.kept = winner.provider
+    if loser.provider not in conflict.dropped:
+      conflict.dropped.append(loser.provider)
+
+  def results(self) -> Tuple[List[Command], List[Command]]:
+    """Merged (commands, prompts), each in insertion order of their names."""
+    commands = [e.command for e in self._entries.values() if e.kind == 'commands']
+    prompts = [e.command for e in self._entries.values() if e.kind == 'prompts']
+    return commands, prompts
+
+  @property
+  def conflicts(self) -> List[MergeConflict]:
+    """Name conflicts that were resolved by priority, sorted by name."""
+    return [self._conflicts[name] for name in sorted(self._conflicts)]
+
+  def _rank(self, entry: _Entry) -> int:
+    return self.priority.get(entry.provider, len(self.priority))
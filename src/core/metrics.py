@@ -0,0 +1,229 @@
+"""Persistent per-run metrics and Prometheus textfile export."""
+
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import iostats
+from .atomic import AtomicWriter
+from .state import state_home
+
+METRICS_FILE = 'runs.jsonl'
+# Running totals of runs that rotation has dropped, so exported counters never go down
+TOTALS_FILE = 'totals.json'
+# Counters every record carries (missing ones are written as 0)
+COUNTERS = ('files_read', 'bytes_read', 'files_written', 'bytes_written', 'stats', 'dirs_scanned')
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def metrics_enabled() -> bool:
+  """Metrics are on unless ``AIPROJ_METRICS`` is set to 0, false or off."""
+  return os.environ.get('AIPROJ_METRICS', '1').lower() not in ('0', 'false', 'off', 'no')
+
+
+class MetricsStore:
+  """Append-only JSON-lines log of runs, rotated by size.
+
+  ``runs.jsonl`` is renamed to ``runs.jsonl.1`` (shifting older generations up)
+  once it exceeds ``max_bytes``; at most ``keep`` rotated files are kept. Runs in
+  the generation that rotation drops are first added to ``totals.json``.
+
+  Args:
+      directory: Where the log lives (default: ``state_home()/metrics``)
+      max_bytes: Size that triggers rotation
+      keep: Rotated generations to keep
+  """
+
+  def __init__(self, directory: Optional[Path] = None, max_bytes: int = 1 << 20, keep: int = 3):
+    self.directory = directory or state_home() / 'metrics'
+    self.path = self.directory / METRICS_FILE
+    self.totals_path = self.directory / TOTALS_FILE
+    self.max_bytes = max_bytes
+    self.keep = keep
+
+  def append(self, record: Dict[str, Any]):
+    """Add one run record, rotating first if the log is full."""
+    self.directory.mkdir(parents=True, exist_ok=True)
+    try:
+      if self.path.stat().st_size >= self.max_bytes:
+        self._rotate()
+    except FileNotFoundError:
+      pass
+    # One short write in append mode, so concurrent runs do not interleave lines
+    line = json.dumps(record, separators=(',', ':')) + '\n'
+    with open(self.path, 'a') as f:
+      f.write(line)
+
+  def records(self) -> Iterator[Dict[str, Any]]:
+    """Every stored run, oldest first; unreadable lines are skipped."""
+    paths = [self.directory / f'{METRICS_FILE}.{i}' for i in range(self.keep, 0, -1)]
+    for path in [*paths, self.path]:
+      yield from _read_records(path)
+
+  def totals(self) -> Dict[str, Dict[str, Any]]:
+    """Per-command totals of the runs that rotation has dropped (see ``add_totals``)."""
+    try:
+      return json.loads(self.totals_path.read_text())
+    except (FileNotFoundError, ValueError):
+      return {}
+
+  def _rotate(self):
+    oldest = self.directory / f'{METRICS_FILE}.{self.keep}'
+    dropped = list(_read_records(oldest))
+    if dropped:
+      totals = add_totals(self.totals(), dropped)
+      AtomicWriter().write(self.totals_path, json.dumps(totals, sort_keys=True).encode())
+    oldest.unlink(missing_ok=True)
+    for i in range(self.keep - 1, 0, -1):
+      source = self.directory / f'{METRICS_FILE}.{i}'
+      if source.exists():
+        os.replace(source, self.directory / f'{METRICS_FILE}.{i + 1}')
+    os.replace(self.path, self.directory / f'{METRICS_FILE}.1')
+
+
+def _read_records(path: Path) -> Iterator[Dict[str, Any]]:
+  try:
+    with open(path) as f:
+      for line in f:
+        try:
+          yield json.loads(line)
+        except ValueError:
+          continue
+  except FileNotFoundError:
+    return
+
+
+def add_totals(
+  totals: Dict[str, Dict[str, Any]], records: List[Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+  """Add runs to per-command totals of runs, failures, duration and I/O counters.
+
+  Args:
+      totals: Existing totals (not modified)
+      records: Runs to add
+
+  Returns:
+      New totals; the latest run time is kept as a maximum rather than a sum
+  """
+  result = {command: dict(values) for command, values in totals.items()}
+  for record in records:
+    values = result.setdefault(record['command'], {})
+    values['runs'] = values.get('runs', 0) + 1
+    values['failures'] = values.get('failures', 0) + (1 if record.get('exit_code') else 0)
+    values['duration_ms'] = values.get('duration_ms', 0) + record['duration_ms']
+    values['last_ts'] = max(values.get('last_ts', 0), record['ts'])
+    for name in COUNTERS:
+      values[name] = values.get(name, 0) + record.get(name, 0)
+  return result
+
+
+def run_record(command: str, duration_s: float, exit_code: int) -> Dict[str, Any]:
+  """Build a record from the current process's I/O counters."""
+  counters = iostats.snapshot()
+  return {
+    'ts': round(time.time(), 3),
+    'command': command,
+    'duration_ms': round(duration_s * 1000, 3),
+    'exit_code': exit_code,
+    **{name: counters.get(name, 0) for name in COUNTERS},
+  }
+
+
+def record_run(command: str, duration_s: float, exit_code: int, store: MetricsStore = None):
+  """Append a run to the store; metrics must never break the command itself."""
+  if not metrics_enabled():
+    return
+  try:
+    (store or MetricsStore()).append(run_record(command, duration_s, exit_code))
+  except OSError:
+    pass
+
+
+def percentile(values: List[float], quantile: float) -> float:
+  """Nearest-rank percentile of ``values`` (which must not be empty)."""
+  ordered = sorted(values)
+  rank = max(1, math.ceil(quantile * len(ordered)))
+  return ordered[rank - 1]
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+  """Per-command run counts, duration percentiles and I/O totals."""
+  by_command: Dict[str, List[Dict[str, Any]]] = {}
+  for record in records:
+    by_command.setdefault(record['command'], []).append(record)
+
+  summary = {}
+  for command in sorted(by_command):
+    runs = by_command[command]
+    durations = [run['duration_ms'] for run in runs]
+    summary[command] = {
+      'runs': len(runs),
+      'failures': sum(1 for run in runs if run.get('exit_code')),
+      **{f'p{int(q * 100)}_ms': percentile(durations, q) for q in QUANTILES},
+      'max_ms': max(durations),
+      'last_ts': max(run['ts'] for run in runs),
+      **{name: sum(run.get(name, 0) for run in runs) for name in COUNTERS},
+    }
+  return summary
+
+
+def prometheus_text(
+  records: List[Dict[str, Any]], totals: Optional[Dict[str, Dict[str, Any]]] = None
+) -> str:
+  """Render records in the Prometheus text format read by node_exporter's textfile collector.
+
+  Counters and the duration summary's ``_count``/``_sum`` include ``totals`` (the
+  runs rotated out of the log), so they only ever increase. Quantiles cover the
+  runs still in the log.
+
+  Args:
+      records: Runs still in the log
+      totals: Per-command totals from ``MetricsStore.totals``
+  """
+  durations: Dict[str, List[float]] = {}
+  for record in records:
+    durations.setdefault(record['command'], []).append(record['duration_ms'] / 1000)
+  cumulative = add_totals(totals or {}, records)
+  commands = sorted(cumulative)
+
+  lines = [
+    '# HELP aiproj_command_duration_seconds Wall time of aiproj commands.',
+    '# TYPE aiproj_command_duration_seconds summary',
+  ]
+  for command in commands:
+    label = f'command="{command}"'
+    for q in QUANTILES if command in durations else ():
+      value = percentile(durations[command], q)
+      lines.append(f'aiproj_command_duration_seconds{{{label},quantile="{q}"}} {value}')
+    total_s = cumulative[command]['duration_ms'] / 1000
+    lines.append(f'aiproj_command_duration_seconds_sum{{{label}}} {total_s}')
+    lines.append(f'aiproj_command_duration_seconds_count{{{label}}} {cumulative[command]["runs"]}')
+
+  # In the Prometheus text format a family is named exactly like its samples, so a
+  # counter's TYPE line carries ``_total`` too (unlike OpenMetrics)
+  families = [
+    ('aiproj_runs_total', 'counter', 'Recorded aiproj runs.', 'runs'),
+    ('aiproj_failures_total', 'counter', 'Runs that exited non-zero.', 'failures'),
+    *(
+      (f'aiproj_{name}_total', 'counter', f'Sum of {name.replace("_", " ")} over runs.', name)
+      for name in COUNTERS
+    ),
+    ('aiproj_last_run_timestamp_seconds', 'gauge', 'Unix time of the latest run.', 'last_ts'),
+  ]
+  for metric, metric_type, help_text, key in families:
+    lines.append(f'# HELP {metric} {help_text}')
+    lines.append(f'# TYPE {metric} {metric_type}')
+    for command in commands:
+      lines.append(f'{metric}{{command="{command}"}} {cumulative[command].get(key, 0)}')
+  return '\n'.join(lines) + '\n'
+
+
+def write_textfile(
+  path: Path, records: List[Dict[str, Any]], totals: Optional[Dict[str, Dict[str, Any]]] = None
+):
+  """Atomically write a Prometheus textfile (the collector must never see a partial file)."""
+  path.parent.mkdir(parents=True, exist_ok=True)
+  AtomicWriter().write(path, prometheus_text(records, totals).encode())
@@ -0,0 +1,171 @@
+"""Opt-in per-phase timing spans for ``aiproj --profile``.
+
+Code marks phases with ``span(name)`` or the ``profiled(name)`` decorator. Until
+``start()`` is called both reduce to a global lookup, so instrumented paths cost
+close to nothing when profiling is off.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+_NULL_SPAN = nullcontext()
+_active: Optional['Profiler'] = None
+
+
+class Profiler:
+  """Collect spans as Chrome trace events, optionally with cProfile dumps per phase.
+
+  Args:
+      cprofile_dir: If set, each top-level span on the main thread is also run under
+          cProfile and dumped there as ``<n>-<name>.prof``
+  """
+
+  def __init__(self, cprofile_dir: Optional[Path] = None):
+    self.cprofile_dir = cprofile_dir
+    self.events: List[Dict[str, Any]] = []
+    self.started_ns = time.perf_counter_ns()
+    self.wall_ns = 0
+    self._lock = threading.Lock()
+    self._threads: Dict[int, int] = {}
+    self._depth = threading.local()
+    self._dumps = 0
+
+  @contextmanager
+  def span(self, name: str, **args) -> Iterator[None]:
+    """Record the time spent inside the block as one complete event."""
+    depth = getattr(self._depth, 'value', 0)
+    self._depth.value = depth + 1
+    profile = None
+    if self.cprofile_dir and depth == 0 and threading.current_thread() is threading.main_thread():
+      profile = cProfile.Profile()
+      profile.enable()
+
+    start = time.perf_counter_ns()
+    try:
+      yield
+    finally:
+      end = time.perf_counter_ns()
+      self._depth.value = depth
+      if profile is not None:
+        profile.disable()
+        self._dump(profile, name)
+      self._record(name, start, end, args)
+
+  def stop(self, root_name: Optional[str] = None):
+    """Mark the end of the profiled run, recording it as a ``root_name`` span if given."""
+    end = time.perf_counter_ns()
+    self.wall_ns = end - self.started_ns
+    if root_name:
+      self._record(root_name, self.started_ns, end, {})
+
+  def trace(self) -> Dict[str, Any]:
+    """Chrome trace-event document (load in chrome://tracing or Perfetto)."""
+    return {'traceEvents': self.events, 'displayTimeUnit': 'ms'}
+
+  def write_trace(self, path: Path):
+    """Write the trace as JSON."""
+    path.write_text(json.dumps(self.trace()))
+
+  def summary(self) -> List[Dict[str, Any]]:
+    """Per-span totals, slowest first.
+
+    Returns:
+        Rows with ``name``, ``count``, ``total_ms``, ``max_ms`` and ``percent`` of the
+        run's wall time (nested and concurrent spans may add up to more than 100)
+    """
+    durations: Dict[str, List[float]] = {}
+    for event in self.events:
+      durations.setdefault(event['name'], []).append(event['dur'])
+
+    wall_us = (self.wall_ns or time.perf_counter_ns() - self.started_ns) / 1000
+    rows = [
+      {
+        'name': name,
+        'count': len(values),
+        'total_ms': round(sum(values) / 1000, 3),
+        'max_ms': round(max(values) / 1000, 3),
+        'percent': round(100 * sum(values) / wall_us, 1) if wall_us else 0.0,
+      }
+      for name, values in durations.items()
+    ]
+    return sorted(rows, key=lambda row: -row['total_ms'])
+
+  def format_summary(self, limit: int = 15) -> str:
+    """Plain-text summary table."""
+    lines = [f"{'phase':<36} {'calls':>6} {'total ms':>10} {'max ms':>10} {'% wall':>7}"]
+    for row in self.summary()[:limit]:
+      lines.append(
+        f"{row['name'][:36]:<36} {row['count']:>6} {row['total_ms']:>10.2f} "
+        f"{row['max_ms']:>10.2f} {row['percent']:>6.1f}%"
+      )
+    lines.append(f'wall time: {(self.wall_ns or 0) / 1e6:.2f} ms')
+    return '\n'.join(lines)
+
+  def _record(self, name: str, start: int, end: int, args: Dict[str, Any]):
+    event = {
+      'name': name,
+      'cat': name.split('.', 1)[0].split(':', 1)[0],
+      'ph': 'X',
+      'ts': (start - self.started_ns) / 1000,
+      'dur': (end - start) / 1000,
+      'pid': os.getpid(),
+      'tid': 0,
+    }
+    if args:
+      event['args'] = {key: str(value) for key, value in args.items()}
+    with self._lock:
+      event['tid'] = self._threads.setdefault(threading.get_ident(), len(self._threads))
+      self.events.append(event)
+
+  def _dump(self, profile: cProfile.Profile, name: str):
+    self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+    self._dumps += 1
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+    profile.dump_stats(self.cprofile_dir / f'{self._dumps:03d}-{safe_name}.prof')
+
+
+def start(cprofile_dir: Optional[Path] = None) -> Profiler:
+  """Enable profiling for the rest of the process."""
+  global _active
+  _active = Profiler(cprofile_dir)
+  return _active
+
+
+def stop(root_name: Optional[str] = None) -> Optional[Profiler]:
+  """Disable profiling and return the profiler that was active, if any."""
+  global _active
+  profiler, _active = _active, None
+  if profiler is not None:
+    profiler.stop(root_name)
+  return profiler
+
+
+def span(name: str, **args):
+  """Context manager timing a phase; a shared no-op when profiling is off."""
+  if _active is None:
+    return _NULL_SPAN
+  return _active.span(name, **args)
+
+
+def profiled(name: str):
+  """Decorator recording every call of a function as a span named ``name``."""
+
+  def decorator(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+      if _active is None:
+        return func(*args, **kwargs)
+      with _active.span(name):
+        return func(*args, **kwargs)
+
+    return wrapper
+
+  return decorator
@@ -0,0 +1,156 @@
+"""Cached directory listings of a project for provider detection."""
+
+import os
+import stat
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from . import iostats
+
+
+class ProjectSnapshot:
+  """One-shot view of the project root and provider directories.
+
+  Every directory is listed with a single ``os.scandir`` call the first time it is
+  queried; later ``exists``/``list_files`` calls are answered from memory. Call
+  ``invalidate()`` after changing files on disk.
+  """
+
+  def __init__(self, project_dir: Path, listings: Optional[Dict[str, Dict[str, bool]]] = None):
+    """Create a snapshot that lists directories on demand.
+
+    Args:
+        project_dir: Project root all queries are relative to
+        listings: Already-read listings (relative dir -> {name: is_dir}) to reuse
+    """
+    self.project_dir = project_dir
+    self._listings: Dict[str, Optional[Dict[str, bool]]] = dict(listings or {})
+
+  @classmethod
+  def scan(cls, project_dir: Path, directories: Iterable[str] = ()) -> 'ProjectSnapshot':
+    """Create a snapshot and list the root and ``directories`` up front."""
+    snapshot = cls(project_dir)
+    snapshot._listing('')
+    for directory in directories:
+      snapshot._listing(directory)
+    return snapshot
+
+  def invalidate(self):
+    """Forget all cached listings so the next query reads the disk again."""
+    self._listings.clear()
+
+  def exists(self, rel_path: str) -> bool:
+    """Check whether a file or directory exists relative to the project root."""
+    return self._entry(rel_path) is not None
+
+  def is_dir(self, rel_path: str) -> bool:
+    """Check whether ``rel_path`` is an existing directory."""
+    return self._entry(rel_path) is True
+
+  def is_file(self, rel_path: str) -> bool:
+    """Check whether ``rel_path`` is an existing non-directory entry."""
+    return self._entry(rel_path) is False
+
+  def list_files(self, rel_dir: str, suffix: str = '') -> List[str]:
+    """Names of files in ``rel_dir`` ending with ``suffix``, sorted."""
+    listing = self._listing(rel_dir) or {}
+    return sorted(name for name, is_dir in listing.items() if not is_dir and name.endswith(suffix))
+
+  def _entry(self, rel_path: str) -> Optional[bool]:
+    """Return True for a directory, False for a file and None if missing."""
+    parent, _, name = rel_path.strip('/').rpartition('/')
+    listing = self._listing(parent)
+    if listing is None:
+      return None
+    return listing.get(name)
+
+  def _listing(self, rel_dir: str) -> Optional[Dict[str, bool]]:
+    """Map entry names to ``is_dir`` for ``rel_dir``; None if it is not a directory."""
+    rel_dir = rel_dir.strip('/')
+    if rel_dir in self._listings:
+      return self._listings[rel_dir]
+
+    listing = None
+    if rel_dir:
+      # Only list directories whose parent listing says they exist
+      parent, _, name = rel_dir.rpartition('/')
+      parent_listing = self._listing(parent) or {}
+      should_scan = parent_listing.get(name) is True
+    else:
+      should_scan = True
+
+    if should_scan:
+      try:
+        iostats.count('dirs_scanned')
+        with os.scandir(self.project_dir / rel_dir) as entries:
+          listing = {entry.name: entry.is_dir() for entry in entries}
+      except (FileNotFoundError, NotADirectoryError, PermissionError):
+        listing = None
+
+    self._listings[rel_dir] = listing
+    return listing
+
+
+class TargetedSnapshot(ProjectSnapshot):
+  """Snapshot that never lists the project root.
+
+  Root entries are looked up with one ``stat`` each (``root_names`` up front,
+  anything else on first query), which stays cheap however many entries the root
+  of a large repository has. Directories below the root are listed as usual.
+  """
+
+  def __init__(self, project_dir: Path, root_names: Iterable[str]):
+    """Create a snapshot that stats root entries instead of listing the root.
+
+    Args:
+        project_dir: Project root all queries are relative to
+        root_names: Root entries resolved on the first query
+    """
+    super().__init__(project_dir)
+    self.root_names = list(root_names)
+    self._missing: Set[str] = set()
+
+  @classmethod
+  def scan(
+    cls, project_dir: Path, directories: Iterable[str] = (), root_names: Iterable[str] = ()
+  ) -> 'TargetedSnapshot':
+    """Create a snapshot, stat ``root_names`` and list ``directories`` up front."""
+    snapshot = cls(project_dir, root_names)
+    snapshot._listing('')
+    for directory in directories:
+      snapshot._listing(directory)
+    return snapshot
+
+  def invalidate(self):
+    """Forget all cached listings and lookups."""
+    super().invalidate()
+    self._missing.clear()
+
+  def _entry(self, rel_path: str) -> Optional[bool]:
+    parent, _, name = rel_path.strip('/').rpartition('/')
+    if not parent:
+      listing = self._listing('')
+      if name not in listing and name not in self._missing:
+        self._probe(listing, name)
+    return super()._entry(rel_path)
+
+  def _listing(self, rel_dir: str) -> Optional[Dict[str, bool]]:
+    rel_dir = rel_dir.strip('/')
+    if rel_dir:
+      self._entry(rel_dir.split('/')[0])  # the parent chain starts at a probed root entry
+      return super()._listing(rel_dir)
+    if '' in self._listings:
+      return self._listings['']
+    listing: Dict[str, bool] = {}
+    for name in self.root_names:
+      self._probe(listing, name)
+    self._listings[''] = listing
+    return listing
+
+  def _probe(self, listing: Dict[str, bool], name: str):
+    """Add ``name`` to the root listing if it exists (following symlinks, like scandir)."""
+    iostats.count('stats')
+    try:
+      listing[name] = stat.S_ISDIR(os.stat(self.project_dir / name).st_mode)
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+      self._missing.add(name)
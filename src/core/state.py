@@ -0,0 +1,45 @@
+"""aiproj state: per project under ``.aiproj/``, per user under ``state_home()``."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+STATE_DIR = '.aiproj'
+
+
+def state_home() -> Path:
+  """Base directory for aiproj state (``$XDG_STATE_HOME/aiproj``)."""
+  base = os.environ.get('XDG_STATE_HOME') or Path.home() / '.local' / 'state'
+  return Path(base) / 'aiproj'
+
+
+def state_dir(project_dir: Path) -> Path:
+  """Return ``.aiproj/`` for a project, creating it with a catch-all .gitignore."""
+  directory = project_dir / STATE_DIR
+  if not directory.is_dir():
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / '.gitignore').write_text('*\n')
+  return directory
+
+
+def read_json(path: Path, default: Any = None) -> Any:
+  """Read a JSON file, returning ``default`` if it is missing or unreadable."""
+  try:
+    return json.loads(path.read_text())
+  except (OSError, ValueError):
+    return default
+
+
+def write_json(path: Path, data: Any):
+  """Atomically replace ``path`` with ``data`` serialized as JSON."""
+  path.parent.mkdir(parents=True, exist_ok=True)
+  fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+  try:
+    with os.fdopen(fd, 'w') as f:
+      json.dump(data, f)
+    os.replace(temp_name, path)
+  except BaseException:
+    os.unlink(temp_name)
+    raise
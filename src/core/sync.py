@@ -0,0 +1,265 @@
+"""Incremental propagation of commands between configured providers."""
+
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..providers.base import ProviderConfig
+from . import iostats
+from .atomic import same_content
+from .cache import is_racy
+from .generator import ConfigGenerator
+from .profiling import profiled
+from .state import read_json, state_dir, write_json
+
+MANIFEST_NAME = 'sync.json'
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class SyncResult:
+  """Outcome of one sync pass."""
+
+  written: List[str] = field(default_factory=list)
+  deleted: List[str] = field(default_factory=list)
+  unchanged: int = 0
+  conflicts: List[str] = field(default_factory=list)
+
+
+def file_sha256(path: Path) -> str:
+  """Hex SHA-256 of a file's bytes."""
+  iostats.count('files_read')
+  with open(path, 'rb') as f:
+    return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def text_sha256(content: str) -> str:
+  """Hex SHA-256 of text as it is written to disk."""
+  return hashlib.sha256(content.encode()).hexdigest()
+
+
+class CommandSync:
+  """Mirror every provider's commands into the other configured providers.
+
+  A manifest in ``.aiproj/sync.json`` records, for each source command file, its
+  stat fingerprint and content hash plus the outputs generated from it, and for
+  each output the hash that was written. A pass only converts sources whose hash
+  changed (hashing only files whose mtime or size moved), writes only missing or
+  outdated outputs, and deletes outputs whose source disappeared. Outputs edited
+  by hand are reported as conflicts and left alone unless ``force`` is set.
+  """
+
+  def __init__(self, project_dir: Path, generator: ConfigGenerator = None):
+    self.project_dir = project_dir
+    self.generator = generator or ConfigGenerator()
+    self.detector = self.generator.detector
+    self.manifest_path = project_dir / '.aiproj' / MANIFEST_NAME
+
+  def load_manifest(self) -> Dict[str, Any]:
+    """Read the manifest, starting fresh if it is missing or from another version."""
+    manifest = read_json(self.manifest_path)
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+      return {'version': MANIFEST_VERSION, 'sources': {}, 'outputs': {}}
+    return manifest
+
+  @profiled('sync.run')
+  def run(
+    self, providers: Optional[List[str]] = None, dry_run: bool = False, force: bool = False
+  ) -> SyncResult:
+    """Run one incremental sync pass.
+
+    Args:
+        providers: Providers to mirror between (default: every configured provider)
+        dry_run: Compute the result without touching any file
+        force: Overwrite outputs that were edited since they were generated
+
+    Returns:
+        What was written, deleted or skipped
+    """
+    project_dir = self.project_dir
+    providers = providers or self.detector.get_configured_providers(project_dir)
+    snapshot = self.detector.snapshot(project_dir)
+    manifest = self.load_manifest()
+    previous_sources = manifest['sources']
+    previous_outputs = manifest['outputs']
+    result = SyncResult()
+
+    # Every command file that was not itself generated by a previous sync is a source
+    sources = {}
+    for name in providers:
+      provider = self.detector.get_provider(name)
+      for rel_path in provider.command_files(project_dir, snapshot):
+        if rel_path not in previous_outputs:
+          sources[rel_path] = name
+
+    new_sources = {}
+    new_outputs = {}
+    files_to_write = {}
+    link_sources = {}
+
+    for rel_path in list(sources):
+      if rel_path not in sources:  # adopted as another source's output below
+        continue
+      source_name = sources[rel_path]
+      entry = previous_sources.get(rel_path)
+      fingerprint = self._fingerprint(rel_path, entry)
+      if fingerprint is None:
+        continue  # deleted since the scan; its outputs are removed below
+      changed = entry is None or entry['sha256'] != fingerprint['sha256']
+      command = None
+      outputs = {}
+      blocked = False
+      pending = (len(files_to_write), len(result.conflicts))
+
+      for target_name in providers:
+        if target_name == source_name:
+          continue
+
+        previous_output = None if changed else entry['outputs'].get(target_name)
+        if previous_output in previous_outputs and snapshot.exists(previous_output):
+          outputs[target_name] = previous_output
+          new_outputs[previous_output] = previous_outputs[previous_output]
+          continue
+
+        if command is None:
+          source_provider = self.detector.get_provider(source_name)
+          command = source_provider.load_command(project_dir / rel_path)
+        target = self.detector.get_provider(target_name)
+        files = target.generate_config(
+          project_dir, ['commands'], ProviderConfig(commands=[command])
+        )
+
+        for out_path, content in files.items():
+          content_hash = text_sha256(content)
+          action, message = self._check_output(
+            out_path, content_hash, rel_path, sources, new_sources, new_outputs, previous_outputs
+          )
+          if action == 'skip':
+            continue
+          if action == 'conflict':
+            result.conflicts.append(message)
+            continue
+          if action == 'edited' and not force:
+            # Keep managing the hand-edited output, but do not overwrite it
+            result.conflicts.append(message)
+            outputs[target_name] = out_path
+            new_outputs[out_path] = previous_outputs[out_path]
+            blocked = True
+            continue
+
+          if action == 'adopt':
+            # An identical file already exists (e.g. from `aiproj add --migrate`)
+            sources.pop(out_path)
+          else:
+            files_to_write[out_path] = content
+            # Compared on disk (size first) so the source body is not kept in memory
+            if same_content(command.path, content.encode()):
+              link_sources[out_path] = command.path
+          outputs[target_name] = out_path
+          new_outputs[out_path] = {'source': rel_path, 'sha256': content_hash}
+
+      # Nothing to write, including outputs adopted from an earlier `aiproj add`
+      if (len(files_to_write), len(result.conflicts)) == pending:
+        result.unchanged += 1
+      if blocked:
+        # Leave the source marked as changed so the next pass retries its outputs
+        fingerprint['sha256'] = None
+      new_sources[rel_path] = {**fingerprint, 'provider': source_name, 'outputs': outputs}
+
+    # Outputs whose source (or target provider) is gone
+    for out_path, output in previous_outputs.items():
+      if out_path in new_outputs:
+        continue
+      full_path = project_dir / out_path
+      if not full_path.is_file():
+        if full_path.is_symlink():  # --link=sym output whose source was removed
+          result.deleted.append(out_path)
+          if not dry_run:
+            full_path.unlink()
+        continue
+      if not force and file_sha256(full_path) != output['sha256']:
+        result.conflicts.append(f'{out_path}: edited after sync, source removed; kept')
+        continue
+      result.deleted.append(out_path)
+      if not dry_run:
+        full_path.unlink()
+
+    if dry_run:
+      result.written = sorted(files_to_write)
+      return result
+
+    result.written = self.generator.write_config_files(
+      project_dir, files_to_write, force=True, sources=link_sources
+    )
+    if result.deleted:
+      self.detector.invalidate(project_dir)
+
+    state_dir(project_dir)
+    write_json(
+      self.manifest_path,
+      {'version': MANIFEST_VERSION, 'sources': new_sources, 'outputs': new_outputs},
+    )
+    return result
+
+  def _fingerprint(
+    self, rel_path: str, entry: Optional[Dict[str, Any]]
+  ) -> Optional[Dict[str, Any]]:
+    """Stat a source and hash it only if its mtime or size changed.
+
+    Returns:
+        None if the source was deleted since the directory was scanned
+    """
+    path = self.project_dir / rel_path
+    iostats.count('stats')
+    try:
+      stat = os.stat(path)
+      if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        sha256 = entry['sha256']
+      else:
+        sha256 = file_sha256(path)
+    except FileNotFoundError:
+      return None
+
+    # A file modified within the timestamp granularity could change again unseen
+    mtime_ns = stat.st_mtime_ns
+    if is_racy([[mtime_ns, stat.st_ino, stat.st_size]], time.time_ns()):
+      mtime_ns = 0
+    return {'mtime_ns': mtime_ns, 'size': stat.st_size, 'sha256': sha256}
+
+  def _check_output(
+    self,
+    out_path: str,
+    content_hash: str,
+    rel_path: str,
+    sources: Dict[str, str],
+    new_sources: Dict[str, Any],
+    new_outputs: Dict[str, Any],
+    previous_outputs: Dict[str, Any],
+  ) -> Tuple[str, Optional[str]]:
+    """Decide what to do with output ``out_path`` generated from ``rel_path``.
+
+    Returns:
+        Tuple of (action, conflict message). Actions: 'write'; 'adopt' an identical
+        unmanaged file as the output; 'skip' because an identical source already
+        exists; 'conflict' with another source; 'edited' by hand since last sync.
+    """
+    full_path = self.project_dir / out_path
+    if out_path in new_outputs:
+      other = new_outputs[out_path]['source']
+      return 'conflict', f'{out_path}: also generated from {other}; kept that one'
+
+    if out_path in sources or out_path in new_sources:
+      if file_sha256(full_path) == content_hash:
+        return ('adopt' if out_path in sources else 'skip'), None
+      return 'conflict', f'{out_path}: existing command differs from {rel_path}; not overwritten'
+
+    previous = previous_outputs.get(out_path)
+    if previous and full_path.is_file():
+      # An output hard-linked to its source already shows the source's edits
+      current = file_sha256(full_path)
+      if current != previous['sha256'] and current != content_hash:
+        return 'edited', f'{out_path}: edited after sync; not overwritten'
+    return 'write', None
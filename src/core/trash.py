@@ -0,0 +1,210 @@
+"""Project-local trash for ``aiproj clean`` and ``aiproj undo``.
+
+Cleaned files and directories are renamed into ``.aiproj/trash/<timestamp>/``
+instead of being deleted, which costs one rename per path however large the
+tree is (paths on another filesystem are copied and deleted instead). ``undo``
+renames them back. Older batches are purged later, normally by a detached
+``python -m src.core.trash`` process so ``clean`` never waits on ``rmtree``.
+"""
+
+import errno
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .state import read_json, state_dir, write_json
+
+TRASH_DIR = 'trash'
+MANIFEST_NAME = 'manifest.json'
+FILES_DIR = 'files'
+# Batches being deleted are renamed to this prefix first, so undo never sees half of one
+PURGING_PREFIX = '.purging-'
+# Batches older than this are purged even if they are the latest
+MAX_AGE_S = 7 * 24 * 3600
+
+
+def _rename(source: Path, target: Path):
+  """Rename, or copy and delete when ``source`` is on another filesystem (a mount point)."""
+  try:
+    os.rename(source, target)
+  except OSError as e:
+    if e.errno != errno.EXDEV:
+      raise
+    shutil.move(source, target)
+
+
+class TrashBatch:
+  """The paths moved to the trash by one ``clean`` run.
+
+  Args:
+      project_dir: Project the paths are relative to
+      directory: ``.aiproj/trash/<timestamp>``
+  """
+
+  def __init__(self, project_dir: Path, directory: Path):
+    self.project_dir = project_dir
+    self.directory = directory
+    self.entries: List[str] = []
+    self.description = ''
+    self.created = time.time()
+    self._lock = threading.Lock()
+
+  @property
+  def name(self) -> str:
+    """Batch directory name (its creation timestamp)."""
+    return self.directory.name
+
+  def move(self, rel_path: str) -> bool:
+    """Rename ``project_dir/rel_path`` into the batch; safe to call from several threads.
+
+    Returns:
+        False if the path did not exist
+    """
+    source = self.project_dir / rel_path
+    target = self.directory / FILES_DIR / rel_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+      _rename(source, target)
+    except FileNotFoundError:
+      return False
+    with self._lock:
+      self.entries.append(rel_path)
+    return True
+
+  def save(self):
+    """Record what was moved, so ``restore`` knows where everything goes back."""
+    manifest = {
+      'created': self.created,
+      'description': self.description,
+      'entries': sorted(self.entries),
+    }
+    write_json(self.directory / MANIFEST_NAME, manifest)
+
+  def load(self) -> 'TrashBatch':
+    """Read the manifest of an existing batch."""
+    manifest = read_json(self.directory / MANIFEST_NAME, {})
+    self.entries = list(manifest.get('entries', []))
+    self.description = manifest.get('description', '')
+    self.created = manifest.get('created', 0)
+    return self
+
+  def discard(self):
+    """Remove the batch directory (used when nothing was moved into it)."""
+    shutil.rmtree(self.directory, ignore_errors=True)
+
+  def restore(self) -> Tuple[List[str], List[str]]:
+    """Rename every entry back to its original place.
+
+    Entries whose original path exists again are left in the trash.
+
+    Returns:
+        (restored paths, paths skipped because something now occupies them)
+    """
+    restored, skipped = [], []
+    for rel_path in self.entries:
+      source = self.directory / FILES_DIR / rel_path
+      target = self.project_dir / rel_path
+      if not os.path.lexists(source):
+        continue
+      if os.path.lexists(target):
+        skipped.append(rel_path)
+        continue
+      target.parent.mkdir(parents=True, exist_ok=True)
+      _rename(source, target)
+      restored.append(rel_path)
+
+    if skipped:
+      self.entries = skipped
+      self.save()
+    else:
+      self.discard()
+    return restored, skipped
+
+
+class Trash:
+  """Batches of cleaned paths under a project's ``.aiproj/trash``."""
+
+  def __init__(self, project_dir: Path):
+    self.project_dir = project_dir
+    self.directory = project_dir / '.aiproj' / TRASH_DIR
+
+  def new_batch(self) -> TrashBatch:
+    """Create an empty batch named after the current time."""
+    self.directory = state_dir(self.project_dir) / TRASH_DIR
+    self.directory.mkdir(exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%dT%H%M%S-%f')
+    directory = self.directory / stamp
+    directory.mkdir()
+    return TrashBatch(self.project_dir, directory)
+
+  def batches(self) -> List[TrashBatch]:
+    """Completed batches, oldest first."""
+    try:
+      names = sorted(
+        entry.name
+        for entry in os.scandir(self.directory)
+        if entry.is_dir() and not entry.name.startswith('.')
+      )
+    except FileNotFoundError:
+      return []
+    batches = [TrashBatch(self.project_dir, self.directory / name) for name in names]
+    return [batch for batch in batches if (batch.directory / MANIFEST_NAME).exists()]
+
+  def latest(self) -> Optional[TrashBatch]:
+    """The most recent batch, or None if the trash is empty."""
+    batches = self.batches()
+    return batches[-1].load() if batches else None
+
+  def expired(self, keep: int = 1, max_age_s: float = MAX_AGE_S) -> List[TrashBatch]:
+    """Batches ``purge`` would delete."""
+    batches = self.batches()
+    cutoff = time.time() - max_age_s
+    doomed = batches[: max(len(batches) - keep, 0)]
+    return doomed + [batch for batch in batches[len(doomed) :] if batch.load().created < cutoff]
+
+  def purge(self, keep: int = 1, max_age_s: float = MAX_AGE_S) -> int:
+    """Delete all but the newest ``keep`` batches, and any batch older than ``max_age_s``.
+
+    Returns:
+        Number of batches deleted
+    """
+    doomed = self.expired(keep, max_age_s)
+    for batch in doomed:
+      self.delete(batch)
+
+    # Finish purges an earlier process was interrupted in
+    for entry in self.directory.glob(f'{PURGING_PREFIX}*'):
+      shutil.rmtree(entry, ignore_errors=True)
+    return len(doomed)
+
+  def delete(self, batch: TrashBatch):
+    """Delete one batch, renaming it out of ``batches()`` first."""
+    purging = self.directory / f'{PURGING_PREFIX}{batch.name}'
+    try:
+      os.rename(batch.directory, purging)
+    except OSError:
+      return
+    shutil.rmtree(purging, ignore_errors=True)
+
+  def purge_in_background(self) -> subprocess.Popen:
+    """Run ``purge`` in a detached process that outlives this command."""
+    return subprocess.Popen(
+      [sys.executable, '-m', __name__, str(self.project_dir.resolve())],
+      # The directory holding the top-level package, so -m can import it
+      cwd=Path(__file__).resolve().parents[2],
+      stdin=subprocess.DEVNULL,
+      stdout=subprocess.DEVNULL,
+      stderr=subprocess.DEVNULL,
+      start_new_session=True,
+      close_fds=True,
+    )
+
+
+if __name__ == '__main__':
+  Trash(Path(sys.argv[1])).purge()
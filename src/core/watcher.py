@@ -0,0 +1,294 @@
+"""File change notification for provider directories."""
+
+import ctypes
+import ctypes.util
+import functools
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# inotify(7) event masks
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+  IN_CLOSE_WRITE
+  | IN_ATTRIB
+  | IN_MOVED_FROM
+  | IN_MOVED_TO
+  | IN_CREATE
+  | IN_DELETE
+  | IN_DELETE_SELF
+  | IN_MOVE_SELF
+)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Reported in a batch when individual changes were lost and everything must be rescanned
+RESCAN = '*'
+
+
+class Watcher(ABC):
+  """Report changes to provider config files and command directories.
+
+  Subclasses implement ``read(timeout)``; ``next_batch`` turns a burst of changes
+  (an editor save, a ``git checkout`` touching hundreds of files) into one batch.
+
+  Args:
+      project_dir: Project root
+      config_files: Root-level files to watch (e.g. CLAUDE.md)
+      directories: Command directories to watch (e.g. .claude/commands), which may
+          not exist yet
+  """
+
+  # File names providers use for commands; anything else in a command directory
+  # (editor swap files, AtomicWriter's ``.<name>.*.tmp`` files) is not a change
+  command_suffixes = ('.md', '.toml')
+
+  def __init__(self, project_dir: Path, config_files: Iterable[str], directories: Iterable[str]):
+    self.project_dir = project_dir
+    self.config_files = set(config_files)
+    self.directories = sorted(set(directories))
+    # Every directory on the way to a command directory, including the root ('')
+    self.watched_dirs = {''}
+    for directory in self.directories:
+      parts = directory.split('/')
+      self.watched_dirs.update('/'.join(parts[: i + 1]) for i in range(len(parts)))
+    self._suppressed: Dict[str, float] = {}
+
+  @abstractmethod
+  def read(self, timeout: Optional[float]) -> Set[str]:
+    """Wait up to ``timeout`` seconds and return changed project-relative paths."""
+    pass
+
+  def close(self):
+    """Release OS resources."""
+
+  def suppress(self, paths: Iterable[str], seconds: float = 1.0):
+    """Ignore upcoming events for ``paths``, e.g. files the caller just wrote itself."""
+    expires = time.monotonic() + seconds
+    for path in paths:
+      self._suppressed[path] = expires
+
+  def next_batch(
+    self, timeout: Optional[float] = None, debounce: float = 0.3, max_delay: float = 2.0
+  ) -> Set[str]:
+    """Wait for a change, then keep collecting until the tree is quiet.
+
+    Args:
+        timeout: Max seconds to wait for the first change (None waits forever)
+        debounce: Quiet period that ends a batch
+        max_delay: Upper bound on how long a continuous burst is held back
+
+    Returns:
+        Changed paths (empty if ``timeout`` expired first)
+    """
+    batch = self._filter(self.read(timeout))
+    if not batch:
+      return batch
+
+    started = time.monotonic()
+    while True:
+      remaining = min(debounce, max_delay - (time.monotonic() - started))
+      if remaining <= 0:
+        break
+      more = self._filter(self.read(remaining))
+      if not more:
+        break
+      batch |= more
+    return batch
+
+  def is_relevant(self, rel_path: str) -> bool:
+    """Check whether a path is a config file or a command file in a watched directory."""
+    parent, _, name = rel_path.rpartition('/')
+    if parent in self.directories and rel_path not in self.watched_dirs:
+      return not name.startswith('.') and name.endswith(self.command_suffixes)
+    return rel_path in self.config_files or rel_path in self.watched_dirs or rel_path == RESCAN
+
+  def _filter(self, paths: Set[str]) -> Set[str]:
+    """Drop irrelevant and suppressed paths."""
+    now = time.monotonic()
+    self._suppressed = {p: t for p, t in self._suppressed.items() if t > now}
+    return {p for p in paths if self.is_relevant(p) and p not in self._suppressed}
+
+
+class InotifyWatcher(Watcher):
+  """Linux inotify watcher using libc through ctypes.
+
+  Watches the project root and each command directory (plus their parents), and
+  adds watches for command directories that are created later.
+  """
+
+  def __init__(self, project_dir: Path, config_files: Iterable[str], directories: Iterable[str]):
+    super().__init__(project_dir, config_files, directories)
+    self._libc = _load_libc()
+    self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if self._fd < 0:
+      raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+    self._watches: Dict[int, str] = {}
+    for rel_dir in sorted(self.watched_dirs):
+      self._add_watch(rel_dir)
+
+  @staticmethod
+  def available() -> bool:
+    """Check whether inotify can be used on this platform."""
+    return sys.platform.startswith('linux') and _load_libc() is not None
+
+  def read(self, timeout: Optional[float]) -> Set[str]:
+    """Read pending inotify events."""
+    ready, _, _ = select.select([self._fd], [], [], timeout)
+    if not ready:
+      return set()
+
+    changed = set()
+    try:
+      data = os.read(self._fd, 1 << 16)
+    except BlockingIOError:
+      return changed
+
+    for rel_dir, mask, name in self._parse(data):
+      if mask & IN_Q_OVERFLOW:
+        changed.add(RESCAN)
+        continue
+      rel_path = f'{rel_dir}/{name}' if rel_dir and name else rel_dir or name
+      if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and rel_path in self.watched_dirs:
+        changed.update(self._watch_tree(rel_path))
+      changed.add(rel_path)
+    return changed
+
+  def close(self):
+    """Close the inotify file descriptor."""
+    if self._fd >= 0:
+      os.close(self._fd)
+      self._fd = -1
+
+  def _add_watch(self, rel_dir: str):
+    path = self.project_dir / rel_dir if rel_dir else self.project_dir
+    if not path.is_dir():
+      return
+    wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+    if wd >= 0:
+      self._watches[wd] = rel_dir
+
+  def _watch_tree(self, rel_dir: str) -> List[str]:
+    """Watch a newly created directory and any watched directories already inside it.
+
+    Returns:
+        Entries that appeared before the watches existed (e.g. after ``mkdir -p``)
+    """
+    existing = []
+    for watched in sorted(self.watched_dirs):
+      if watched != rel_dir and not watched.startswith(rel_dir + '/'):
+        continue
+      self._add_watch(watched)
+      try:
+        existing.extend(f'{watched}/{name}' for name in os.listdir(self.project_dir / watched))
+      except OSError:
+        continue
+    return existing
+
+  def _parse(self, data: bytes) -> List[Tuple[str, int, str]]:
+    """Decode raw inotify events into (watched dir, mask, name)."""
+    events = []
+    offset = 0
+    while offset + _EVENT_HEADER.size <= len(data):
+      wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+      offset += _EVENT_HEADER.size
+      name = os.fsdecode(data[offset : offset + length].rstrip(b'\0'))
+      offset += length
+
+      if mask & IN_IGNORED:
+        self._watches.pop(wd, None)
+        continue
+      if wd in self._watches or mask & IN_Q_OVERFLOW:
+        events.append((self._watches.get(wd, ''), mask, name))
+    return events
+
+
+class PollingWatcher(Watcher):
+  """Portable fallback that compares stat signatures on an interval."""
+
+  def __init__(
+    self,
+    project_dir: Path,
+    config_files: Iterable[str],
+    directories: Iterable[str],
+    interval: float = 1.0,
+  ):
+    super().__init__(project_dir, config_files, directories)
+    self.interval = interval
+    self._state = self._scan()
+
+  def read(self, timeout: Optional[float]) -> Set[str]:
+    """Poll until something changed or ``timeout`` expired."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+      wait = self.interval
+      if deadline is not None:
+        wait = min(wait, deadline - time.monotonic())
+        if wait <= 0:
+          return set()
+      time.sleep(wait)
+
+      state = self._scan()
+      changed = {p for p in state.keys() | self._state.keys() if state.get(p) != self._state.get(p)}
+      self._state = state
+      if changed:
+        return changed
+
+  def _scan(self) -> Dict[str, Tuple[int, int]]:
+    """(mtime_ns, size) of every config file and command file."""
+    state = {}
+    for name in self.config_files:
+      try:
+        stat = os.stat(self.project_dir / name)
+        state[name] = (stat.st_mtime_ns, stat.st_size)
+      except OSError:
+        pass
+    for rel_dir in self.directories:
+      try:
+        with os.scandir(self.project_dir / rel_dir) as entries:
+          for entry in entries:
+            stat = entry.stat()
+            state[f'{rel_dir}/{entry.name}'] = (stat.st_mtime_ns, stat.st_size)
+      except OSError:
+        continue
+    return state
+
+
+def create_watcher(
+  project_dir: Path, config_files: Iterable[str], directories: Iterable[str], poll: bool = False
+) -> Watcher:
+  """Use inotify where available, otherwise poll."""
+  if not poll and InotifyWatcher.available():
+    try:
+      return InotifyWatcher(project_dir, config_files, directories)
+    except OSError:
+      pass
+  return PollingWatcher(project_dir, config_files, directories)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_libc() -> Optional[ctypes.CDLL]:
+  """Load libc once; None if it is unavailable or lacks inotify."""
+  try:
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+  except (OSError, AttributeError):
+    return None
+  return libc
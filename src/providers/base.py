@@ -1,19 +1,98 @@
 """Base provider interface for AI coding tools."""
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..core import iostats
+from ..core.snapshot import ProjectSnapshot
+
+# Descriptions (frontmatter, first heading) are expected within this many bytes
+HEAD_BYTES = 16384
+
+# Bulk loads below this many files are not worth a thread pool
+PARALLEL_LOAD_THRESHOLD = 32
+LOAD_WORKERS = 16
+
+
+def read_head(path: Path, size: int = HEAD_BYTES) -> Tuple[str, bool]:
+  """Read at most ``size`` bytes from the start of a text file.
+
+  Returns:
+      Tuple of (text, complete). An incomplete head is cut back to its last full line.
+  """
+  with open(path, 'rb') as f:
+    data = f.read(size + 1)
+  iostats.count('files_read')
+  iostats.count('bytes_read', len(data))
+  if len(data) <= size:
+    return data.decode(), True
+  data = data[:size]
+  newline = data.rfind(b'\n')
+  if newline >= 0:
+    data = data[: newline + 1]
+  return data.decode(errors='ignore'), False
+
+
+def read_description(path: Path, extract: Callable[[str], str]) -> str:
+  """Extract a description from the head of a file, reading it fully only if needed."""
+  head, complete = read_head(path)
+  description = extract(head)
+  if not description and not complete:
+    description = extract(path.read_text())
+  return description
+
+
+class _LazyContent:
+  """Data descriptor for ``Command.content`` that reads ``Command.path`` on first access."""
+
+  def __set_name__(self, owner, name):
+    self.attr = f'_{name}'
+
+  def __get__(self, obj, objtype=None):
+    if obj is None:
+      return None  # dataclass default
+    value = obj.__dict__.get(self.attr)
+    if value is None and obj.path is not None:
+      value = obj.path.read_text()
+      obj.__dict__[self.attr] = value
+      iostats.count('files_read')
+      iostats.count('bytes_read', len(value))
+    return value
+
+  def __set__(self, obj, value):
+    obj.__dict__[self.attr] = value
 
 
 @dataclass
 class Command:
-  """Represents a custom command/prompt for an AI provider."""
+  """Represents a custom command/prompt for an AI provider.
+
+  Commands loaded from disk carry their ``path`` and read ``content`` only when it is
+  first accessed, so status checks and planning never read full bodies.
+  """
 
   name: str
   description: str
-  content: str
+  content: str = _LazyContent()
   metadata: Dict[str, Any] = None
+  path: Optional[Path] = None
+
+  @property
+  def is_loaded(self) -> bool:
+    """Whether ``content`` is in memory (always true for commands built from text)."""
+    return self.__dict__.get('_content') is not None or self.path is None
+
+  def read_content(self) -> str:
+    """The body, read from ``path`` without keeping it in memory if it is not loaded yet."""
+    if self.is_loaded:
+      return self.content
+    content = self.path.read_text()
+    iostats.count('files_read')
+    iostats.count('bytes_read', len(content))
+    return content
 
   def __post_init__(self):
     if self.metadata is None:
@@ -60,16 +139,68 @@ class Provider(ABC):
     """Required directories (e.g., ['.claude/commands', '.claude/prompts'])."""
     pass
 
+  @property
+  def status_paths(self) -> List[str]:
+    """Paths whose stat signature determines ``get_existing_components``."""
+    paths = list(self.config_files)
+    for directory in self.directories:
+      parts = directory.split('/')
+      paths.extend('/'.join(parts[: i + 1]) for i in range(len(parts)))
+    return list(dict.fromkeys(paths))
+
+  @property
+  def markers(self) -> List[str]:
+    """Root entries whose presence may mean the provider is configured.
+
+    ``detect_existing`` must return False when none of them exist, which lets the
+    registry rule a provider out without importing it.
+    """
+    paths = list(self.config_files)
+    paths.extend(directory.split('/')[0] for directory in self.directories)
+    return list(dict.fromkeys(paths))
+
   @abstractmethod
-  def detect_existing(self, project_dir: Path) -> bool:
+  def detect_existing(self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None) -> bool:
     """Check if provider is already configured."""
     pass
 
   @abstractmethod
-  def load_existing_config(self, project_dir: Path) -> ProviderConfig:
+  def load_existing_config(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> ProviderConfig:
     """Load existing configuration and content from project directory."""
     pass
 
+  @abstractmethod
+  def command_files(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> List[str]:
+    """Project-relative paths of existing command/prompt files, sorted."""
+    pass
+
+  @abstractmethod
+  def load_command(self, path: Path) -> Command:
+    """Load a single command/prompt file, deferring its body (see ``Command``)."""
+    pass
+
+  def load_commands(
+    self, project_dir: Path, rel_paths: List[str], max_workers: int = LOAD_WORKERS
+  ) -> List[Command]:
+    """Load many command files, in the order given.
+
+    File reads release the GIL, so large directories (and slow network mounts) are
+    read by a bounded thread pool; small ones are loaded inline.
+    """
+    paths = [project_dir / rel_path for rel_path in rel_paths]
+    if len(paths) < PARALLEL_LOAD_THRESHOLD or max_workers <= 1:
+      return [self.load_command(path) for path in paths]
+    # Hand each worker a contiguous chunk to keep per-task overhead low
+    chunk_size = -(-len(paths) // (max_workers * 4))
+    chunks = [paths[i : i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+      loaded = executor.map(lambda chunk: [self.load_command(path) for path in chunk], chunks)
+      return [command for chunk in loaded for command in chunk]
+
   @abstractmethod
   def generate_config(
     self,
@@ -80,8 +211,24 @@ class Provider(ABC):
     """Generate config files for specified components. Returns {filepath: content}."""
     pass
 
+  def iter_config(
+    self,
+    project_dir: Path,
+    components: List[str] = None,
+    base_config: Optional[ProviderConfig] = None,
+  ) -> Iterator[Tuple[str, str]]:
+    """Yield the ``(filepath, content)`` items of ``generate_config`` one at a time.
+
+    Providers that override this read each migrated body only when its item is
+    produced and do not keep it, so a consumer that writes items as they arrive
+    holds one file at a time. The default just iterates ``generate_config``.
+    """
+    yield from self.generate_config(project_dir, components, base_config).items()
+
   @abstractmethod
-  def get_existing_components(self, project_dir: Path) -> Dict[str, Any]:
+  def get_existing_components(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> Dict[str, Any]:
     """Get status of existing components (config, commands count, prompts count, agents)."""
     pass
 
@@ -90,6 +237,14 @@ class Provider(ABC):
     """Files to open in editor after generation for specified components."""
     pass
 
+  def get_snapshot(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> ProjectSnapshot:
+    """Return the shared snapshot, or scan this provider's directories if none was given."""
+    if snapshot is not None:
+      return snapshot
+    return ProjectSnapshot.scan(project_dir, self.directories)
+
   def migrate_content_from(self, source_config: ProviderConfig) -> ProviderConfig:
     """Migrate content from another provider's configuration.
 
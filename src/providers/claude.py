@@ -2,9 +2,10 @@
 
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from .base import Command, Provider, ProviderConfig
+from ..core.snapshot import ProjectSnapshot
+from .base import Command, Provider, ProviderConfig, read_description
 
 
 class ClaudeProvider(Provider):
@@ -25,60 +26,71 @@ class ClaudeProvider(Provider):
     """Required directories."""
     return ['.claude/commands']
 
-  def detect_existing(self, project_dir: Path) -> bool:
+  @property
+  def status_paths(self) -> List[str]:
+    """Watched paths, including agents.md."""
+    return super().status_paths + ['agents.md']
+
+  def detect_existing(self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None) -> bool:
     """Check if Claude Code is already configured."""
-    claude_md = project_dir / 'CLAUDE.md'
-    claude_dir = project_dir / '.claude'
-    return claude_md.exists() or claude_dir.exists()
+    snapshot = self.get_snapshot(project_dir, snapshot)
+    return snapshot.exists('CLAUDE.md') or snapshot.exists('.claude')
 
-  def get_existing_components(self, project_dir: Path) -> Dict[str, Any]:
+  def get_existing_components(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> Dict[str, Any]:
     """Get status of existing Claude components."""
+    snapshot = self.get_snapshot(project_dir, snapshot)
     status = {
-      'config': (project_dir / 'CLAUDE.md').exists(),
+      'config': snapshot.exists('CLAUDE.md'),
       'commands': 0,
       'prompts': 0,
-      'agents': (project_dir / 'agents.md').exists(),
+      'agents': snapshot.exists('agents.md'),
     }
 
     # Count existing commands
-    commands_dir = project_dir / '.claude' / 'commands'
-    if commands_dir.exists():
-      status['commands'] = len(list(commands_dir.glob('*.md')))
+    status['commands'] = len(self.command_files(project_dir, snapshot))
 
     # For Claude Code, prompts are just commands in .claude/commands/
     # No separate prompts count needed - they're included in commands count
 
     return status
 
-  def load_existing_config(self, project_dir: Path) -> ProviderConfig:
+  def load_existing_config(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> ProviderConfig:
     """Load existing Claude configuration and content."""
+    snapshot = self.get_snapshot(project_dir, snapshot)
     config = ProviderConfig()
 
     # Load main CLAUDE.md config
-    claude_md = project_dir / 'CLAUDE.md'
-    if claude_md.exists():
-      config.main_config = claude_md.read_text()
+    if snapshot.exists('CLAUDE.md'):
+      config.main_config = (project_dir / 'CLAUDE.md').read_text()
 
     # Load commands from .claude/commands/
-    commands_dir = project_dir / '.claude' / 'commands'
-    if commands_dir.exists():
-      for cmd_file in commands_dir.glob('*.md'):
-        content = cmd_file.read_text()
-        description = self._extract_description(content)
-        config.commands.append(
-          Command(name=cmd_file.stem, description=description, content=content)
-        )
+    config.commands = self.load_commands(project_dir, self.command_files(project_dir, snapshot))
 
     # For Claude Code, prompts are just commands in .claude/commands/
     # No separate prompts directory
 
     # Check for agents.md
-    agents_file = project_dir / 'agents.md'
-    if agents_file.exists():
-      config.agents = agents_file.read_text()
+    if snapshot.exists('agents.md'):
+      config.agents = (project_dir / 'agents.md').read_text()
 
     return config
 
+  def command_files(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> List[str]:
+    """Command files in .claude/commands/."""
+    snapshot = self.get_snapshot(project_dir, snapshot)
+    return [f'.claude/commands/{name}' for name in snapshot.list_files('.claude/commands', '.md')]
+
+  def load_command(self, path: Path) -> Command:
+    """Load a markdown command file."""
+    description = read_description(path, self._extract_description)
+    return Command(name=path.stem, description=description, path=path)
+
   def generate_config(
     self,
     project_dir: Path,
@@ -86,42 +98,49 @@ class ClaudeProvider(Provider):
     base_config: Optional[ProviderConfig] = None,
   ) -> Dict[str, str]:
     """Generate Claude Code configuration files for specified components."""
+    return dict(self.iter_config(project_dir, components, base_config))
+
+  def iter_config(
+    self,
+    project_dir: Path,
+    components: List[str] = None,
+    base_config: Optional[ProviderConfig] = None,
+  ) -> Iterator[Tuple[str, str]]:
+    """Yield Claude Code configuration files one at a time (see ``generate_config``)."""
     if components is None:
       components = ['config', 'commands']
 
-    files = {}
-
     # Generate main CLAUDE.md
     if 'config' in components:
       if base_config and base_config.main_config:
-        files['CLAUDE.md'] = base_config.main_config
+        yield 'CLAUDE.md', base_config.main_config
       else:
-        files['CLAUDE.md'] = (
+        content = (
           '# Claude Code Configuration\n\nProject configured for Claude Code AI assistance.\n'
         )
+        yield 'CLAUDE.md', content
 
     # Generate command files
     if 'commands' in components:
       if base_config and base_config.commands:
         for command in base_config.commands:
-          files[f'.claude/commands/{command.name}.md'] = command.content
+          yield f'.claude/commands/{command.name}.md', command.read_content()
       else:
         # Example command template
-        files['.claude/commands/example.md'] = (
+        content = (
           '---\ndescription: "Example command"\n---\n\n'
           '# Example Command\n\nThis is an example command template.\n'
         )
+        yield '.claude/commands/example.md', content
 
     # Generate prompt files - for Claude Code, prompts are stored as commands
     if 'prompts' in components and base_config and base_config.prompts:
       for prompt in base_config.prompts:
-        files[f'.claude/commands/{prompt.name}.md'] = prompt.content
+        yield f'.claude/commands/{prompt.name}.md', prompt.read_content()
 
     # Generate agents.md
     if 'agents' in components and base_config and base_config.agents:
-      files['agents.md'] = base_config.agents
-
-    return files
+      yield 'agents.md', base_config.agents
 
   def get_editor_files(self, project_dir: Path, components: List[str] = None) -> List[str]:
     """Files to open in editor after generation for specified components."""
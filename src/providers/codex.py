@@ -1,9 +1,10 @@
 """OpenAI Codex provider implementation."""
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from .base import Command, Provider, ProviderConfig
+from ..core.snapshot import ProjectSnapshot
+from .base import Command, Provider, ProviderConfig, read_description
 
 
 class CodexProvider(Provider):
@@ -24,52 +25,59 @@ class CodexProvider(Provider):
     """Required directories."""
     return ['.codex/prompts']
 
-  def detect_existing(self, project_dir: Path) -> bool:
+  def detect_existing(self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None) -> bool:
     """Check if Codex is already configured."""
-    agents_md = project_dir / 'AGENTS.md'
-    codex_dir = project_dir / '.codex'
-    return agents_md.exists() or codex_dir.exists()
+    snapshot = self.get_snapshot(project_dir, snapshot)
+    return snapshot.exists('AGENTS.md') or snapshot.exists('.codex')
 
-  def get_existing_components(self, project_dir: Path) -> Dict[str, Any]:
+  def get_existing_components(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> Dict[str, Any]:
     """Get status of existing Codex components."""
+    snapshot = self.get_snapshot(project_dir, snapshot)
     status = {
-      'config': (project_dir / 'AGENTS.md').exists(),
+      'config': snapshot.exists('AGENTS.md'),
       'commands': 0,  # Codex doesn't have commands directory
       'prompts': 0,
-      'agents': (project_dir / 'AGENTS.md').exists(),  # Same file as config
+      'agents': snapshot.exists('AGENTS.md'),  # Same file as config
     }
 
     # Count existing prompts
-    prompts_dir = project_dir / '.codex' / 'prompts'
-    if prompts_dir.exists():
-      status['prompts'] = len(list(prompts_dir.glob('*.md')))
+    status['prompts'] = len(self.command_files(project_dir, snapshot))
 
     return status
 
-  def load_existing_config(self, project_dir: Path) -> ProviderConfig:
+  def load_existing_config(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> ProviderConfig:
     """Load existing Codex configuration and content."""
+    snapshot = self.get_snapshot(project_dir, snapshot)
     config = ProviderConfig()
 
     # Load main AGENTS.md
-    agents_md = project_dir / 'AGENTS.md'
-    if agents_md.exists():
-      config.main_config = agents_md.read_text()
-      config.agents = agents_md.read_text()  # Same file serves as both config and agents
+    if snapshot.exists('AGENTS.md'):
+      config.main_config = (project_dir / 'AGENTS.md').read_text()
+      config.agents = config.main_config  # Same file serves as both config and agents
 
     # Codex doesn't have commands directory - only prompts
 
     # Load prompts from .codex/prompts/
-    prompts_dir = project_dir / '.codex' / 'prompts'
-    if prompts_dir.exists():
-      for prompt_file in prompts_dir.glob('*.md'):
-        content = prompt_file.read_text()
-        description = self._extract_description(content)
-        config.prompts.append(
-          Command(name=prompt_file.stem, description=description, content=content)
-        )
+    config.prompts = self.load_commands(project_dir, self.command_files(project_dir, snapshot))
 
     return config
 
+  def command_files(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> List[str]:
+    """Prompt files in .codex/prompts/."""
+    snapshot = self.get_snapshot(project_dir, snapshot)
+    return [f'.codex/prompts/{name}' for name in snapshot.list_files('.codex/prompts', '.md')]
+
+  def load_command(self, path: Path) -> Command:
+    """Load a markdown prompt file."""
+    description = read_description(path, self._extract_description)
+    return Command(name=path.stem, description=description, path=path)
+
   def generate_config(
     self,
     project_dir: Path,
@@ -77,19 +85,26 @@ class CodexProvider(Provider):
     base_config: Optional[ProviderConfig] = None,
   ) -> Dict[str, str]:
     """Generate Codex configuration files for specified components."""
+    return dict(self.iter_config(project_dir, components, base_config))
+
+  def iter_config(
+    self,
+    project_dir: Path,
+    components: List[str] = None,
+    base_config: Optional[ProviderConfig] = None,
+  ) -> Iterator[Tuple[str, str]]:
+    """Yield Codex configuration files one at a time (see ``generate_config``)."""
     if components is None:
       components = ['config', 'commands']
 
-    files = {}
-
     # Generate main AGENTS.md
     if 'config' in components:
       if base_config and base_config.main_config:
-        files['AGENTS.md'] = base_config.main_config
+        yield 'AGENTS.md', base_config.main_config
       elif base_config and base_config.agents:
-        files['AGENTS.md'] = base_config.agents
+        yield 'AGENTS.md', base_config.agents
       else:
-        files['AGENTS.md'] = (
+        content = (
           '# OpenAI Codex Project Notes\n\n'
           'Codex only loads custom prompts from the global `$CODEX_HOME/prompts/` directory '
           '(typically `~/.codex/prompts`). '
@@ -97,36 +112,37 @@ class CodexProvider(Provider):
           'or symlink into that global folder when you want them available as slash commands.\n\n'
           '## Using project prompts\n'
           '1. Review prompts under `.codex/prompts/` in this project.\n'
-          '2. Copy or symlink any prompt into `~/.codex/prompts/`.\n'
+          '2. Run `aiproj codex install` to copy new and changed prompts into '
+          '`~/.codex/prompts/` (add `--prefix NAME-` to avoid clashes with other projects).\n'
           '3. Restart your Codex session so the slash command list refreshes.\n\n'
           'Tip: keep the project versions editable here, then sync updates to your '
           'global Codex prompts.\n'
         )
+        yield 'AGENTS.md', content
 
     # Generate prompt files (Codex commands are stored as prompts)
     if 'commands' in components:
       if base_config and base_config.commands:
         for command in base_config.commands:
-          files[f'.codex/prompts/{command.name}.md'] = self._convert_command_to_codex(command)
+          yield f'.codex/prompts/{command.name}.md', self._convert_command_to_codex(command)
       else:
         # Example prompt template when no commands to migrate
-        files['.codex/prompts/example.md'] = (
+        content = (
           '# Example Prompt\n\n'
           'Copy this file to `~/.codex/prompts/example.md` so Codex can load it as a slash '
           'command.\n\n'
           'You can safely keep editing the project version and resync it to your global Codex '
           'prompt directory when changes are ready.\n'
         )
+        yield '.codex/prompts/example.md', content
 
     # Generate prompt files
     if 'prompts' in components:
       if base_config and base_config.prompts:
         for prompt in base_config.prompts:
-          files[f'.codex/prompts/{prompt.name}.md'] = prompt.content
+          yield f'.codex/prompts/{prompt.name}.md', prompt.read_content()
       # Don't create duplicate example if commands already created one
 
-    return files
-
   def get_editor_files(self, project_dir: Path, components: List[str] = None) -> List[str]:
     """Files to open in editor after generation for specified components."""
     if components is None or 'config' in components:
@@ -136,7 +152,7 @@ class CodexProvider(Provider):
   def _convert_command_to_codex(self, command: Command) -> str:
     """Convert a command from another provider to Codex format."""
     # Remove Claude-specific frontmatter and adapt for Codex
-    content = command.content
+    content = command.read_content()
 
     # Remove frontmatter if present
     if content.startswith('---'):
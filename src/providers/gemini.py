@@ -1,9 +1,10 @@
 """Gemini CLI provider implementation."""
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from .base import Command, Provider, ProviderConfig
+from ..core.snapshot import ProjectSnapshot
+from .base import Command, Provider, ProviderConfig, read_description
 
 
 class GeminiProvider(Provider):
@@ -24,53 +25,62 @@ class GeminiProvider(Provider):
     """Required directories."""
     return ['.gemini/commands']
 
-  def detect_existing(self, project_dir: Path) -> bool:
+  def detect_existing(self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None) -> bool:
     """Check if Gemini CLI is already configured."""
-    gemini_md = project_dir / 'GEMINI.md'
-    gemini_dir = project_dir / '.gemini'
-    return gemini_md.exists() or gemini_dir.exists()
+    snapshot = self.get_snapshot(project_dir, snapshot)
+    return snapshot.exists('GEMINI.md') or snapshot.exists('.gemini')
 
-  def get_existing_components(self, project_dir: Path) -> Dict[str, Any]:
+  def get_existing_components(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> Dict[str, Any]:
     """Get status of existing Gemini components."""
+    snapshot = self.get_snapshot(project_dir, snapshot)
     status = {
-      'config': (project_dir / 'GEMINI.md').exists(),
+      'config': snapshot.exists('GEMINI.md'),
       'commands': 0,
       'prompts': 0,
       'agents': False,  # Gemini doesn't use agents.md by default
     }
 
     # Count existing commands (.toml files)
-    commands_dir = project_dir / '.gemini' / 'commands'
-    if commands_dir.exists():
-      status['commands'] = len(list(commands_dir.glob('*.toml')))
+    status['commands'] = len(self.command_files(project_dir, snapshot))
 
     # Gemini doesn't have separate prompts directory
 
     return status
 
-  def load_existing_config(self, project_dir: Path) -> ProviderConfig:
+  def load_existing_config(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> ProviderConfig:
     """Load existing Gemini configuration and content."""
+    snapshot = self.get_snapshot(project_dir, snapshot)
     config = ProviderConfig()
 
     # Load main GEMINI.md
-    gemini_md = project_dir / 'GEMINI.md'
-    if gemini_md.exists():
-      config.main_config = gemini_md.read_text()
+    if snapshot.exists('GEMINI.md'):
+      config.main_config = (project_dir / 'GEMINI.md').read_text()
 
     # Load commands from .gemini/commands/ (.toml files)
-    commands_dir = project_dir / '.gemini' / 'commands'
-    if commands_dir.exists():
-      for cmd_file in commands_dir.glob('*.toml'):
-        content = cmd_file.read_text()
-        description = self._extract_description_from_toml(content)
-        config.commands.append(
-          Command(name=cmd_file.stem, description=description, content=content)
-        )
+    config.commands = self.load_commands(project_dir, self.command_files(project_dir, snapshot))
 
     # Gemini doesn't have separate prompts directory
 
     return config
 
+  def command_files(
+    self, project_dir: Path, snapshot: Optional[ProjectSnapshot] = None
+  ) -> List[str]:
+    """Command files in .gemini/commands/."""
+    snapshot = self.get_snapshot(project_dir, snapshot)
+    return [
+      f'.gemini/commands/{name}' for name in snapshot.list_files('.gemini/commands', '.toml')
+    ]
+
+  def load_command(self, path: Path) -> Command:
+    """Load a TOML command file."""
+    description = read_description(path, self._extract_description_from_toml)
+    return Command(name=path.stem, description=description, path=path)
+
   def generate_config(
     self,
     project_dir: Path,
@@ -78,37 +88,41 @@ class GeminiProvider(Provider):
     base_config: Optional[ProviderConfig] = None,
   ) -> Dict[str, str]:
     """Generate Gemini CLI configuration files for specified components."""
+    return dict(self.iter_config(project_dir, components, base_config))
+
+  def iter_config(
+    self,
+    project_dir: Path,
+    components: List[str] = None,
+    base_config: Optional[ProviderConfig] = None,
+  ) -> Iterator[Tuple[str, str]]:
+    """Yield Gemini CLI configuration files one at a time (see ``generate_config``)."""
     if components is None:
       components = ['config', 'commands']
 
-    files = {}
-
     # Generate main GEMINI.md
     if 'config' in components:
       if base_config and base_config.main_config:
-        files['GEMINI.md'] = base_config.main_config
+        yield 'GEMINI.md', base_config.main_config
       else:
-        files['GEMINI.md'] = (
-          '# Gemini CLI Configuration\n\nProject configured for Gemini CLI assistance.\n'
-        )
+        content = '# Gemini CLI Configuration\n\nProject configured for Gemini CLI assistance.\n'
+        yield 'GEMINI.md', content
 
     # Generate command files (.toml format)
     if 'commands' in components:
       if base_config and base_config.commands:
         for command in base_config.commands:
-          files[f'.gemini/commands/{command.name}.toml'] = self._convert_command_to_gemini_toml(
-            command
-          )
+          content = self._convert_command_to_gemini_toml(command)
+          yield f'.gemini/commands/{command.name}.toml', content
       else:
         # Example command template
-        files['.gemini/commands/example.toml'] = (
+        content = (
           'description = "Example command"\n' 'prompt = "This is an example command template"\n'
         )
+        yield '.gemini/commands/example.toml', content
 
     # Gemini doesn't have separate prompts - they would be commands
 
-    return files
-
   def get_editor_files(self, project_dir: Path, components: List[str] = None) -> List[str]:
     """Files to open in editor after generation for specified components."""
     if components is None or 'config' in components:
@@ -118,7 +132,7 @@ class GeminiProvider(Provider):
   def _convert_command_to_gemini_toml(self, command: Command) -> str:
     """Convert a command from another provider to Gemini TOML format."""
     # Extract content without frontmatter
-    content = command.content
+    content = command.read_content()
 
     # Remove frontmatter if present
     if content.startswith('---'):
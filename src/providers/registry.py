@@ -0,0 +1,200 @@
+"""Provider registry discovered from ``aiproj.providers`` entry points.
+
+Other packages add providers by declaring an entry point::
+
+    [project.entry-points."aiproj.providers"]
+    cursor = "acme_aiproj.cursor:CursorProvider"
+
+Discovery imports every provider once to record its static layout (config files
+and directories) and caches the result until the installed packages or a provider
+module change. After that, a provider module is imported only when it is used:
+detection answers "not configured" from the cached markers alone, so a run only
+imports the providers that exist in the project or that it targets.
+"""
+
+import importlib
+import os
+import sys
+import warnings
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..core.cache import cache_home
+from ..core.state import read_json, write_json
+from .base import Provider
+
+ENTRY_POINT_GROUP = 'aiproj.providers'
+CACHE_FILE = 'providers.json'
+CACHE_VERSION = 1
+
+# Built-in providers, in display order; also declared as entry points in pyproject.toml
+BUILTIN_PROVIDERS = {
+  'claude': f'{__package__}.claude:ClaudeProvider',
+  'gemini': f'{__package__}.gemini:GeminiProvider',
+  'codex': f'{__package__}.codex:CodexProvider',
+}
+
+
+@dataclass(frozen=True)
+class ProviderSpec:
+  """What is known about a provider without importing it.
+
+  Attributes:
+      name: Provider name
+      target: ``module:attribute`` of the provider class
+      origin: Source file of the provider module (its mtime invalidates the cache)
+      config_files: ``Provider.config_files``
+      directories: ``Provider.directories``
+      status_paths: ``Provider.status_paths``
+      markers: ``Provider.markers``
+  """
+
+  name: str
+  target: str
+  origin: Optional[str]
+  config_files: List[str]
+  directories: List[str]
+  status_paths: List[str]
+  markers: List[str]
+
+  @classmethod
+  def from_provider(cls, name: str, target: str, provider: Provider) -> 'ProviderSpec':
+    """Record the layout of an instantiated provider."""
+    module = sys.modules.get(type(provider).__module__)
+    return cls(
+      name=name,
+      target=target,
+      origin=getattr(module, '__file__', None),
+      config_files=list(provider.config_files),
+      directories=list(provider.directories),
+      status_paths=list(provider.status_paths),
+      markers=list(provider.markers),
+    )
+
+  def load(self) -> Provider:
+    """Import the provider module and instantiate the provider."""
+    module_name, attribute = self.target.split(':')
+    return getattr(importlib.import_module(module_name), attribute)()
+
+
+def provider_targets() -> Dict[str, str]:
+  """Built-in providers followed by entry-point plugins (which may replace them)."""
+  from importlib.metadata import entry_points
+
+  targets = dict(BUILTIN_PROVIDERS)
+  plugins = {ep.name: ep.value for ep in entry_points(group=ENTRY_POINT_GROUP)}
+  for name in sorted(plugins):
+    targets[name] = plugins[name]
+  return targets
+
+
+_discovered: Optional[Dict[str, ProviderSpec]] = None
+
+
+def discover(use_cache: bool = True) -> Dict[str, ProviderSpec]:
+  """Specs of every available provider, from the on-disk cache when it is current."""
+  global _discovered
+  if _discovered is not None and use_cache:
+    return _discovered
+
+  cache_path = cache_home() / CACHE_FILE
+  fingerprint = _environment_fingerprint()
+  specs = _specs_from_cache(read_json(cache_path), fingerprint) if use_cache else None
+  if specs is None:
+    specs = _scan_providers()
+    origins = {spec.origin: _mtime_ns(spec.origin) for spec in specs.values() if spec.origin}
+    try:
+      write_json(
+        cache_path,
+        {
+          'version': CACHE_VERSION,
+          'fingerprint': fingerprint,
+          'origins': origins,
+          'providers': [asdict(spec) for spec in specs.values()],
+        },
+      )
+    except OSError:
+      pass
+  _discovered = specs
+  return specs
+
+
+def clear_cache():
+  """Forget discovered providers, in this process and on disk."""
+  global _discovered
+  _discovered = None
+  (cache_home() / CACHE_FILE).unlink(missing_ok=True)
+
+
+def _scan_providers() -> Dict[str, ProviderSpec]:
+  specs = {}
+  for name, target in provider_targets().items():
+    spec = ProviderSpec(name, target, None, [], [], [], [])
+    try:
+      provider = spec.load()
+    except Exception as e:
+      warnings.warn(f'Skipping provider plugin {name} ({target}): {e}', stacklevel=2)
+      continue
+    specs[name] = ProviderSpec.from_provider(name, target, provider)
+  return specs
+
+
+def _specs_from_cache(cached: Any, fingerprint: List) -> Optional[Dict[str, ProviderSpec]]:
+  if not isinstance(cached, dict) or cached.get('version') != CACHE_VERSION:
+    return None
+  if cached.get('fingerprint') != fingerprint:
+    return None
+  # A provider module edited since discovery may have a different layout
+  for origin, mtime_ns in cached.get('origins', {}).items():
+    if _mtime_ns(origin) != mtime_ns:
+      return None
+  try:
+    return {entry['name']: ProviderSpec(**entry) for entry in cached['providers']}
+  except (KeyError, TypeError):
+    return None
+
+
+def _environment_fingerprint() -> List:
+  """Changes whenever packages (and so entry points) are installed or removed."""
+  paths = [path for path in sys.path if path and os.path.isdir(path)]
+  return [sys.version, [[path, _mtime_ns(path)] for path in paths]]
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+  try:
+    return os.stat(path).st_mtime_ns
+  except OSError:
+    return None
+
+
+class ProviderRegistry(Mapping):
+  """Read-only ``name -> Provider`` mapping that imports each provider on first access.
+
+  Iterating over names (``list(registry)``, ``in``) never imports a provider;
+  ``registry[name]``, ``.values()`` and ``.items()`` do.
+
+  Args:
+      specs: Providers to serve (default: ``discover()``)
+  """
+
+  def __init__(self, specs: Optional[Dict[str, ProviderSpec]] = None):
+    self.specs = discover() if specs is None else specs
+    self._instances: Dict[str, Provider] = {}
+
+  def __getitem__(self, name: str) -> Provider:
+    provider = self._instances.get(name)
+    if provider is None:
+      provider = self.specs[name].load()
+      self._instances[name] = provider
+    return provider
+
+  def __iter__(self) -> Iterator[str]:
+    return iter(self.specs)
+
+  def __len__(self) -> int:
+    return len(self.specs)
+
+  def is_loaded(self, name: str) -> bool:
+    """Whether ``name`` has been instantiated by this registry."""
+    return name in self._instances
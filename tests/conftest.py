@@ -5,9 +5,20 @@ import tempfile
 from contextlib import contextmanager
 from pathlib import Path
 
+import pytest
 from typer.testing import CliRunner
 
 
+@pytest.fixture(autouse=True)
+def isolated_user_dirs(tmp_path, monkeypatch):
+  """Keep caches and metrics written by the CLI out of the real home directory."""
+  monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+  monkeypatch.setenv('XDG_STATE_HOME', str(tmp_path / 'state'))
+  monkeypatch.setenv('CODEX_HOME', str(tmp_path / 'codex'))
+  # No test talks to a daemon the developer happens to be running
+  monkeypatch.setenv('AIPROJ_SOCKET', str(tmp_path / 'no-daemon.sock'))
+
+
 @contextmanager
 def temp_project_dir():
   """Context manager for temporary project directory with proper cwd handling."""
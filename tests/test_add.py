@@ -1,5 +1,8 @@
 """Tests for the add command."""
 
+from src.core.detector import ProjectDetector
+from src.providers.claude import ClaudeProvider
+
 from .conftest import run_cli_command, temp_project_dir
 
 
@@ -83,3 +86,32 @@ def test_add_without_migration():
       command_files = list(gemini_commands.glob('*.toml'))
       assert len(command_files) == 1
       assert command_files[0].name == 'example.toml'
+
+
+def test_add_several_providers_loads_sources_once(monkeypatch):
+  """Test that adding two providers migrates into both from a single load."""
+  loads = []
+  load_existing_config = ClaudeProvider.load_existing_config
+
+  def counting_load(self, *args, **kwargs):
+    loads.append(self.name)
+    return load_existing_config(self, *args, **kwargs)
+
+  monkeypatch.setattr(ClaudeProvider, 'load_existing_config', counting_load)
+
+  with temp_project_dir() as temp_path:
+    (temp_path / 'CLAUDE.md').write_text('# Claude Config')
+    commands_dir = temp_path / '.claude' / 'commands'
+    commands_dir.mkdir(parents=True)
+    (commands_dir / 'custom.md').write_text('# Custom Command\n\nTest command')
+
+    result = run_cli_command(['add', 'gemini', 'codex', '--no-editor'])
+
+    assert result.exit_code == 0
+    assert 'Adding gemini' in result.stdout
+    assert 'Adding codex' in result.stdout
+    assert loads == ['claude']
+    assert (temp_path / '.gemini' / 'commands' / 'custom.toml').exists()
+    assert (temp_path / '.codex' / 'prompts' / 'custom.md').exists()
+    assert result.stdout.count('Updated configuration status') == 1
+    assert ProjectDetector().get_configured_providers(temp_path) == ['claude', 'gemini', 'codex']
@@ -0,0 +1,62 @@
+"""Tests for the scale benchmark suite."""
+
+import os
+
+from benchmarks.suite import compare, isolated_user_dirs, run_suite
+from src.core.cache import cache_home
+from src.core.trash import Trash
+
+
+def _results(**timings):
+  return {'scenarios': {'commands-10': {op: dict(t) for op, t in timings.items()}}}
+
+
+def test_run_suite_times_every_operation():
+  """Test that a small scenario produces cold and warm timings for each operation."""
+  document = run_suite(['commands-10'], repeat=1, log=lambda *_: None)
+
+  operations = document['scenarios']['commands-10']
+  assert {'status', 'write', 'remove', 'load:claude', 'generate:codex'} <= set(operations)
+  assert all(timing['cold_ms'] >= 0 for timing in operations.values())
+  assert operations['remove']['warm_ms'] is None
+
+
+def test_suite_keeps_out_of_user_dirs(tmp_path, monkeypatch):
+  """Test that the suite uses its own caches and never starts a background purge."""
+
+  def fail(self):
+    raise AssertionError('background purge started')
+
+  monkeypatch.setattr(Trash, 'purge_in_background', fail)
+  user_cache = cache_home()
+
+  with isolated_user_dirs(tmp_path / 'home'):
+    assert cache_home() == tmp_path / 'home' / 'cache' / 'aiproj'
+    Trash.purge_in_background(None)  # a no-op while isolated
+
+  assert cache_home() == user_cache
+  assert os.environ['XDG_STATE_HOME'] == str(tmp_path / 'state')
+  run_suite(['commands-10'], repeat=1, log=lambda *_: None)
+  assert not user_cache.exists()
+
+
+def test_compare_flags_regressions_beyond_threshold():
+  """Test that only slowdowns past both the ratio and the absolute floor are flagged."""
+  baseline = _results(
+    status={'cold_ms': 10.0, 'warm_ms': 0.2},
+    write={'cold_ms': 100.0, 'warm_ms': None},
+  )
+  current = _results(
+    status={'cold_ms': 11.0, 'warm_ms': 0.6},
+    write={'cold_ms': 150.0, 'warm_ms': 5.0},
+    remove={'cold_ms': 1.0, 'warm_ms': None},
+  )
+
+  rows = compare(baseline, current, threshold=0.2, min_ms=1.0)
+
+  flagged = {(row['operation'], row['metric']): row['regressed'] for row in rows}
+  assert flagged == {
+    ('status', 'cold_ms'): False,  # within 20%
+    ('status', 'warm_ms'): False,  # 3x, but under 1 ms
+    ('write', 'cold_ms'): True,
+  }
@@ -0,0 +1,157 @@
+"""Tests for exporting and importing provider configuration bundles."""
+
+import io
+import json
+import os
+import tarfile
+import tracemalloc
+
+import pytest
+
+from src.core.bundle import MANIFEST_NAME, export_bundle, import_bundle, read_manifest
+
+from .conftest import run_cli_command, temp_project_dir
+
+
+def _make_project(project_dir):
+  (project_dir / '.claude' / 'commands').mkdir(parents=True)
+  (project_dir / 'CLAUDE.md').write_text('# Claude')
+  (project_dir / '.claude' / 'commands' / 'review.md').write_text('# Review')
+  (project_dir / '.gemini' / 'commands').mkdir(parents=True)
+  (project_dir / 'GEMINI.md').write_text('# Gemini')
+  (project_dir / '.gemini' / 'commands' / 'deploy.toml').write_text('prompt = "Deploy"\n')
+
+
+@pytest.mark.parametrize('name', ['bundle.tar.gz', 'bundle.tar', 'bundle.zip'])
+def test_round_trip_skips_matching_files(tmp_path, name):
+  """Test that import writes new files, leaves matching ones and keeps edited ones."""
+  source, target = tmp_path / 'source', tmp_path / 'target'
+  _make_project(source)
+  target.mkdir()
+  archive = tmp_path / name
+
+  manifest = export_bundle(source, archive)
+  assert set(manifest['files']) == {
+    'CLAUDE.md',
+    '.claude/commands/review.md',
+    'GEMINI.md',
+    '.gemini/commands/deploy.toml',
+  }
+  assert read_manifest(archive) == manifest
+
+  first = import_bundle(target, archive)
+  assert sorted(first.written) == sorted(manifest['files'])
+  assert (target / '.claude' / 'commands' / 'review.md').read_text() == '# Review'
+
+  os.utime(target / 'GEMINI.md', ns=(1_000_000_000, 1_000_000_000))
+  (target / 'CLAUDE.md').write_text('# Edited')
+  second = import_bundle(target, archive)
+  assert second.written == []
+  assert second.unchanged == 3
+  assert second.skipped == ['CLAUDE.md']
+  assert (target / 'GEMINI.md').stat().st_mtime_ns == 1_000_000_000
+
+  forced = import_bundle(target, archive, force=True)
+  assert forced.written == ['CLAUDE.md']
+  assert (target / 'CLAUDE.md').read_text() == '# Claude'
+
+
+def test_export_selected_providers(tmp_path):
+  """Test that --provider limits the bundle to that provider's files."""
+  _make_project(tmp_path)
+  manifest = export_bundle(tmp_path, tmp_path / 'out' / 'claude.zip', providers=['claude'])
+  assert {entry['provider'] for entry in manifest['files'].values()} == {'claude'}
+
+
+def _tar(path, manifest_files, entries):
+  with tarfile.open(path, 'w') as tar:
+    for name, data in [
+      (MANIFEST_NAME, json.dumps({'version': 1, 'files': manifest_files}).encode()),
+      *entries,
+    ]:
+      info = tarfile.TarInfo(name)
+      info.size = len(data)
+      tar.addfile(info, io.BytesIO(data))
+
+
+def test_rejects_unsafe_and_corrupt_bundles(tmp_path):
+  """Test that paths outside provider files and mismatched hashes are never written."""
+  archive = tmp_path / 'evil.tar'
+  entry = {'provider': 'claude', 'size': 4, 'sha256': '0' * 64}
+  for path in ['../escape.md', '/etc/passwd', 'setup.py']:
+    _tar(archive, {path: entry}, [(path, b'evil')])
+    with pytest.raises(ValueError):
+      import_bundle(tmp_path, archive)
+
+  _tar(archive, {'CLAUDE.md': entry}, [('CLAUDE.md', b'evil')])
+  with pytest.raises(ValueError, match='sha256'):
+    import_bundle(tmp_path, archive)
+  assert not (tmp_path / 'CLAUDE.md').exists()
+
+  archive.write_text('not an archive')
+  with pytest.raises(ValueError, match='not an aiproj bundle'):
+    import_bundle(tmp_path, archive)
+
+
+def test_import_streams_large_files(tmp_path):
+  """Test that memory use while importing does not grow with the file size."""
+  source, target = tmp_path / 'source', tmp_path / 'target'
+  (source / '.claude' / 'commands').mkdir(parents=True)
+  (source / 'CLAUDE.md').write_text('# Claude')
+  (source / '.claude' / 'commands' / 'large.md').write_bytes(os.urandom(8 << 20))
+  target.mkdir()
+  archive = tmp_path / 'large.tar.gz'
+  export_bundle(source, archive)
+
+  tracemalloc.start()
+  try:
+    import_bundle(target, archive)
+    _, peak = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+  assert peak < 2 << 20
+  assert (target / '.claude' / 'commands' / 'large.md').stat().st_size == 8 << 20
+
+
+def test_export_import_cli():
+  """Test the export and import commands end to end."""
+  with temp_project_dir() as temp_path:
+    source, target = temp_path / 'source', temp_path / 'target'
+    _make_project(source)
+    target.mkdir()
+
+    os.chdir(source)
+    result = run_cli_command(['export', str(temp_path / 'commands.zip')])
+    assert result.exit_code == 0
+    assert 'Exported 4 files' in result.stdout
+
+    os.chdir(target)
+    result = run_cli_command(['import', str(temp_path / 'commands.zip'), '--dry-run'])
+    assert result.exit_code == 0
+    assert 'Would write 4 files' in result.stdout
+    assert not (target / 'CLAUDE.md').exists()
+
+    result = run_cli_command(['import', str(temp_path / 'commands.zip')])
+    assert result.exit_code == 0
+    assert (target / 'GEMINI.md').read_text() == '# Gemini'
+
+    result = run_cli_command(['import', str(temp_path / 'commands.zip')])
+    assert 'Everything up to date (4 files unchanged)' in result.stdout
+
+
+def test_export_import_cli_report_os_errors():
+  """Test that file system errors are reported like invalid bundles, without a traceback."""
+  with temp_project_dir() as temp_path:
+    _make_project(temp_path)
+    (temp_path / 'out').write_text('a file, not a directory')
+
+    result = run_cli_command(['export', 'out/commands.tar'])
+    assert result.exit_code == 1
+    assert 'Cannot export to out/commands.tar' in result.stdout
+
+    export_bundle(temp_path, temp_path / 'commands.tar')
+    (temp_path / 'CLAUDE.md').unlink()
+    (temp_path / 'CLAUDE.md').mkdir()
+    result = run_cli_command(['import', 'commands.tar', '--force'])
+    assert result.exit_code == 1
+    assert 'Cannot import commands.tar' in result.stdout
@@ -0,0 +1,77 @@
+"""Tests for the persistent provider status cache."""
+
+import os
+import time
+from pathlib import Path
+
+from src.core.cache import StatusCache
+from src.core.detector import ProjectDetector
+
+from .conftest import run_cli_command, temp_project_dir
+
+
+def _backdate(project_dir: Path, seconds: int = 3600):
+  """Move every mtime in the project into the past so cache entries are not racy."""
+  past = time.time() - seconds
+  for path in [project_dir, *project_dir.rglob('*')]:
+    os.utime(path, (past, past))
+
+
+def _make_claude_project(project_dir: Path):
+  (project_dir / 'CLAUDE.md').write_text('# Claude')
+  commands_dir = project_dir / '.claude' / 'commands'
+  commands_dir.mkdir(parents=True)
+  (commands_dir / 'review.md').write_text('# Review')
+
+
+def test_warm_cache_skips_provider_scans(monkeypatch):
+  """Test that unchanged projects are answered from the cache."""
+  with temp_project_dir() as temp_path:
+    _make_claude_project(temp_path)
+    _backdate(temp_path)
+
+    cold = ProjectDetector(cache=StatusCache()).get_provider_status(temp_path)
+
+    warm_detector = ProjectDetector(cache=StatusCache())
+    for provider in warm_detector.get_all_providers().values():
+      monkeypatch.setattr(provider, 'get_existing_components', None)
+      monkeypatch.setattr(provider, 'detect_existing', None)
+
+    assert warm_detector.get_provider_status(temp_path) == cold
+    assert cold['claude']['commands'] == 1
+
+
+def test_changed_directory_is_recomputed():
+  """Test that adding a command invalidates only that provider's entry."""
+  with temp_project_dir() as temp_path:
+    _make_claude_project(temp_path)
+    _backdate(temp_path)
+    ProjectDetector(cache=StatusCache()).get_provider_status(temp_path)
+
+    (temp_path / '.claude' / 'commands' / 'deploy.md').write_text('# Deploy')
+    status = ProjectDetector(cache=StatusCache()).get_provider_status(temp_path)
+
+    assert status['claude']['commands'] == 2
+
+
+def test_recent_changes_are_not_cached():
+  """Test that paths modified within the racy window are never trusted."""
+  with temp_project_dir() as temp_path:
+    _make_claude_project(temp_path)
+    cache = StatusCache()
+    ProjectDetector(cache=cache).get_provider_status(temp_path)
+
+    reloaded = StatusCache()
+    assert reloaded._load(temp_path).get('claude') is None
+    assert reloaded._load(temp_path).get('gemini') is not None
+
+
+def test_list_no_cache():
+  """Test the --no-cache escape hatch."""
+  with temp_project_dir() as temp_path:
+    _make_claude_project(temp_path)
+
+    result = run_cli_command(['list', '--no-cache'])
+
+    assert result.exit_code == 0
+    assert '✓ (1)' in result.stdout
@@ -1,5 +1,8 @@
 """Tests for the clean command."""
 
+import errno
+import os
+
 from .conftest import run_cli_command, temp_project_dir
 
 
@@ -95,3 +98,93 @@ def test_clean_empty_project():
     result = run_cli_command(['clean', 'all', '--force'])
 
     assert result.exit_code == 0  # Should handle gracefully
+
+
+def test_clean_moves_to_trash_and_undo_restores():
+  """Test that clean renames into .aiproj/trash and undo renames everything back."""
+  with temp_project_dir() as temp_path:
+    (temp_path / 'CLAUDE.md').write_text('# Claude Config')
+    (temp_path / '.claude' / 'commands').mkdir(parents=True)
+    (temp_path / '.claude' / 'commands' / 'example.md').write_text('# Hello')
+    (temp_path / '.gemini' / 'commands').mkdir(parents=True)
+    (temp_path / '.gemini' / 'commands' / 'example.toml').write_text('prompt = "Hello"')
+
+    result = run_cli_command(['clean', 'all', '--force'])
+
+    assert result.exit_code == 0
+    assert not (temp_path / '.claude').exists()
+    assert not (temp_path / '.gemini').exists()
+    batches = list((temp_path / '.aiproj' / 'trash').iterdir())
+    assert len(batches) == 1
+    assert (batches[0] / 'files' / '.claude' / 'commands' / 'example.md').exists()
+
+    result = run_cli_command(['undo'])
+
+    assert result.exit_code == 0
+    assert (temp_path / 'CLAUDE.md').read_text() == '# Claude Config'
+    assert (temp_path / '.claude' / 'commands' / 'example.md').read_text() == '# Hello'
+    assert (temp_path / '.gemini' / 'commands' / 'example.toml').exists()
+    assert list((temp_path / '.aiproj' / 'trash').iterdir()) == []
+    assert run_cli_command(['undo']).exit_code == 1
+
+
+def test_undo_keeps_paths_that_exist_again():
+  """Test that undo never overwrites a path recreated after the clean."""
+  with temp_project_dir() as temp_path:
+    (temp_path / 'CLAUDE.md').write_text('# Old')
+    (temp_path / 'agents.md').write_text('# Agents')
+    assert run_cli_command(['clean', 'claude', '--force']).exit_code == 0
+    (temp_path / 'CLAUDE.md').write_text('# New')
+
+    result = run_cli_command(['undo'])
+
+    assert result.exit_code == 1
+    assert (temp_path / 'CLAUDE.md').read_text() == '# New'
+    assert (temp_path / 'agents.md').exists()
+    assert 'CLAUDE.md' in result.stdout
+
+
+def test_clean_purge_and_trash_expiry():
+  """Test that the purge process keeps only the newest batch and --purge only drops its own."""
+  from src.core.trash import Trash
+
+  with temp_project_dir() as temp_path:
+    trash = Trash(temp_path)
+    for _ in range(3):
+      (temp_path / 'CLAUDE.md').write_text('# Claude')
+      batch = trash.new_batch()
+      batch.move('CLAUDE.md')
+      batch.save()
+    assert len(trash.expired()) == 2
+
+    assert trash.purge_in_background().wait() == 0
+    assert [b.name for b in trash.batches()] == [batch.name]
+
+    (temp_path / 'CLAUDE.md').write_text('# Claude')
+    assert run_cli_command(['clean', 'claude', '--force', '--purge']).exit_code == 0
+    assert not (temp_path / 'CLAUDE.md').exists()
+    assert [b.name for b in trash.batches()] == [batch.name]
+    assert list(trash.directory.glob('.purging-*')) == []
+
+
+def test_clean_and_undo_across_filesystems(monkeypatch):
+  """Test that paths that cannot be renamed into the trash (EXDEV) are copied instead."""
+  rename = os.rename
+
+  def cross_device_rename(source, target):
+    if '.aiproj' in str(source) or '.aiproj' in str(target):
+      raise OSError(errno.EXDEV, 'Invalid cross-device link')
+    rename(source, target)
+
+  with temp_project_dir() as temp_path:
+    (temp_path / 'CLAUDE.md').write_text('# Claude Config')
+    (temp_path / '.claude' / 'commands').mkdir(parents=True)
+    (temp_path / '.claude' / 'commands' / 'example.md').write_text('# Hello')
+    monkeypatch.setattr(os, 'rename', cross_device_rename)
+
+    assert run_cli_command(['clean', 'claude', '--force']).exit_code == 0
+    assert not (temp_path / '.claude').exists()
+
+    assert run_cli_command(['undo']).exit_code == 0
+    assert (temp_path / 'CLAUDE.md').read_text() == '# Claude Config'
+    assert (temp_path / '.claude' / 'commands' / 'example.md').read_text() == '# Hello'
@@ -0,0 +1,152 @@
+"""Tests for installing Codex prompts into $CODEX_HOME/prompts."""
+
+import json
+import os
+from pathlib import Path
+
+from src.core.atomic import LinkMode
+from src.core.codex_install import LEGACY_INDEX_NAME, CodexInstaller, codex_home
+from src.core.state import state_home
+
+from .conftest import run_cli_command, temp_project_dir
+
+
+def _make_prompts(project_dir: Path, **prompts):
+  prompts_dir = project_dir / '.codex' / 'prompts'
+  prompts_dir.mkdir(parents=True, exist_ok=True)
+  (project_dir / 'AGENTS.md').write_text('# Agents')
+  for name, content in prompts.items():
+    (prompts_dir / f'{name}.md').write_text(content)
+
+
+def test_install_is_incremental():
+  """Test that unchanged prompts are not rewritten and deleted ones are removed."""
+  with temp_project_dir() as temp_path:
+    _make_prompts(temp_path, review='# Review', deploy='# Deploy')
+    installed = codex_home() / 'prompts'
+
+    first = CodexInstaller(temp_path).install()
+    assert first.installed == ['deploy.md', 'review.md']
+    assert (installed / 'review.md').read_text() == '# Review'
+    index_path = CodexInstaller(temp_path).index_path
+    assert index_path.parent == state_home() / 'codex-index'
+    index = json.loads(index_path.read_text())['prompts']
+    assert index['review.md']['project'] == str(temp_path.resolve())
+    assert sorted(p.name for p in installed.iterdir()) == ['deploy.md', 'review.md']
+
+    os.utime(installed / 'deploy.md', ns=(1_000_000_000, 1_000_000_000))
+    (temp_path / '.codex' / 'prompts' / 'review.md').write_text('# Review v2')
+    second = CodexInstaller(temp_path).install()
+
+    assert second.installed == ['review.md']
+    assert second.unchanged == 1
+    assert (installed / 'deploy.md').stat().st_mtime_ns == 1_000_000_000
+    assert (installed / 'review.md').read_text() == '# Review v2'
+
+    (temp_path / '.codex' / 'prompts' / 'deploy.md').unlink()
+    third = CodexInstaller(temp_path).install()
+
+    assert third.removed == ['deploy.md']
+    assert not (installed / 'deploy.md').exists()
+    assert 'deploy.md' not in json.loads(index_path.read_text())['prompts']
+
+
+def test_source_deleted_during_install(tmp_path):
+  """Test that a prompt deleted after the directory scan is removed, not an error."""
+  _make_prompts(tmp_path, review='# Review', deploy='# Deploy')
+  CodexInstaller(tmp_path).install()
+
+  installer = CodexInstaller(tmp_path)
+  codex = installer.detector.get_provider('codex')
+  command_files = codex.command_files
+
+  def scan_then_delete(project_dir, snapshot=None):
+    files = command_files(project_dir, snapshot)
+    (tmp_path / '.codex' / 'prompts' / 'deploy.md').unlink()
+    return files
+
+  codex.command_files = scan_then_delete
+  result = installer.install()
+
+  assert result.removed == ['deploy.md']
+  assert result.unchanged == 1
+  assert not (codex_home() / 'prompts' / 'deploy.md').exists()
+  assert 'deploy.md' not in json.loads(installer.index_path.read_text())['prompts']
+
+
+def test_collisions_between_projects_and_prefixes(tmp_path):
+  """Test that another project's prompt is never overwritten, and --prefix avoids it."""
+  first, second = tmp_path / 'first', tmp_path / 'second'
+  _make_prompts(first, review='# First')
+  _make_prompts(second, review='# Second')
+  CodexInstaller(first).install()
+
+  result = CodexInstaller(second).install()
+  assert result.installed == []
+  assert 'installed from' in result.collisions[0]
+  assert (codex_home() / 'prompts' / 'review.md').read_text() == '# First'
+
+  assert CodexInstaller(second).install(prefix='second-').installed == ['second-review.md']
+  # The prefix is remembered
+  (second / '.codex' / 'prompts' / 'review.md').write_text('# Second v2')
+  assert CodexInstaller(second).install().installed == ['second-review.md']
+
+  # Uninstalling one project leaves the other's prompts alone
+  assert CodexInstaller(second).uninstall().removed == ['second-review.md']
+  assert (codex_home() / 'prompts' / 'review.md').exists()
+
+
+def test_changing_link_mode_reinstalls(tmp_path):
+  """Test that a different --link redoes unchanged prompts, and the mode is remembered."""
+  _make_prompts(tmp_path, review='# Review')
+  installed = codex_home() / 'prompts' / 'review.md'
+
+  assert CodexInstaller(tmp_path).install(link=LinkMode.sym).installed == ['review.md']
+  assert installed.is_symlink()
+  assert CodexInstaller(tmp_path).install().unchanged == 1
+
+  assert CodexInstaller(tmp_path).install(link=LinkMode.copy).installed == ['review.md']
+  assert not installed.is_symlink()
+  assert installed.read_text() == '# Review'
+
+
+def test_legacy_index_is_moved_out_of_prompts_dir(tmp_path):
+  """Test that an index left in the prompts directory by an older version is taken over."""
+  _make_prompts(tmp_path, review='# Review')
+  installed = codex_home() / 'prompts'
+  installed.mkdir(parents=True)
+  (installed / 'review.md').write_text('# Other')
+  owner = {'project': '/elsewhere', 'source': '.codex/prompts/review.md'}
+  legacy = {'version': 1, 'prompts': {'review.md': owner}}
+  (installed / LEGACY_INDEX_NAME).write_text(json.dumps(legacy))
+
+  result = CodexInstaller(tmp_path).install()
+
+  assert 'installed from /elsewhere' in result.collisions[0]
+  assert not (installed / LEGACY_INDEX_NAME).exists()
+  index = json.loads(CodexInstaller(tmp_path).index_path.read_text())['prompts']
+  assert index == {'review.md': owner}
+
+
+def test_codex_install_command():
+  """Test the CLI, including a hand-made prompt that needs --force."""
+  with temp_project_dir() as temp_path:
+    _make_prompts(temp_path, review='# Review')
+    installed = codex_home() / 'prompts'
+    installed.mkdir(parents=True)
+    (installed / 'review.md').write_text('# Mine')
+
+    result = run_cli_command(['codex', 'install'])
+    assert result.exit_code == 1
+    assert 'not installed by aiproj' in result.stdout
+
+    result = run_cli_command(['codex', 'install', '--force', '--link', 'sym'])
+    assert result.exit_code == 0
+    assert (installed / 'review.md').is_symlink()
+    assert (installed / 'review.md').read_text() == '# Review'
+
+    result = run_cli_command(['codex', 'install'])
+    assert 'Everything up to date (1 prompts unchanged)' in result.stdout
+
+    assert run_cli_command(['codex', 'uninstall']).exit_code == 0
+    assert not os.path.lexists(installed / 'review.md')
@@ -0,0 +1,101 @@
+"""Tests for cached shell completion and clean --command."""
+
+import os
+import subprocess
+import sys
+
+from benchmarks.startup import PROJECT_ROOT
+from src.cli import complete
+from src.core.completion import cache_path
+
+from .conftest import run_cli_command, temp_project_dir
+
+_COMPLETE = """
+import sys
+sys.argv[0] = 'aiproj'
+from src.cli.main import main
+try:
+  main()
+finally:
+  print('loaded:', ' '.join(sys.modules), file=sys.stderr)
+"""
+
+
+def _tab(line: str):
+  """Run a bash completion request for ``line`` in the current directory."""
+  env = {
+    **os.environ,
+    'PYTHONPATH': str(PROJECT_ROOT),
+    '_AIPROJ_COMPLETE': 'complete_bash',
+    'COMP_WORDS': line,
+    'COMP_CWORD': str(len(line.split()) - (0 if line.endswith(' ') else 1)),
+  }
+  result = subprocess.run(
+    [sys.executable, '-c', _COMPLETE], env=env, capture_output=True, text=True, check=True
+  )
+  loaded = result.stderr.rpartition('loaded:')[2].split()
+  return result.stdout.split(), loaded
+
+
+def test_cache_is_refreshed_after_writes():
+  """Test that add writes the completion cache and its words cover providers and commands."""
+  with temp_project_dir() as temp_path:
+    run_cli_command(['add', 'claude', '--no-editor', '--all'])
+
+    data = complete.read_cache(os.getcwd())
+    assert data is not None
+    assert cache_path(temp_path).exists()
+    assert complete.words(data, [], 'cl') == ['clean']
+    assert complete.words(data, ['add', 'claude'], '') == ['gemini', 'codex']
+    assert complete.words(data, ['clean'], '') == ['claude', 'all']
+    assert complete.words(data, ['clean', 'claude'], '') == []
+    assert complete.words(data, ['clean', '--command'], 'ex') == ['example']
+    assert complete.words(data, ['add', '--link'], '') is None
+    assert complete.words(data, ['clean'], '--') is None
+
+    # A command created outside aiproj makes the cache stale
+    (temp_path / '.claude' / 'commands' / 'review.md').write_text('# Review\n')
+    assert complete.read_cache(os.getcwd()) is None
+    assert complete.load_words()['command_names']['claude'] == ['example', 'review']
+    assert complete.read_cache(os.getcwd()) is not None
+
+
+def test_completion_reads_only_the_cache():
+  """Test that a TAB press answered from the cache imports neither typer nor the core."""
+  with temp_project_dir() as temp_path:
+    run_cli_command(['add', 'gemini', '--no-editor', '--all'])
+
+    words, loaded = _tab('aiproj clean --command ')
+    assert words == ['example']
+    assert not [name for name in loaded if name.startswith(('typer', 'click', 'src.core'))]
+
+    # Stale cache: typer answers and the cache is rebuilt for the next TAB
+    (temp_path / '.gemini' / 'commands' / 'deploy.toml').write_text('prompt = "Deploy"\n')
+    words, loaded = _tab('aiproj clean gemini --command ')
+    assert words == ['deploy', 'example']
+    assert 'typer' in loaded
+    words, loaded = _tab('aiproj clean gemini --command d')
+    assert words == ['deploy']
+    assert 'typer' not in loaded
+
+
+def test_clean_single_command():
+  """Test that clean --command removes one command from every provider, undoably."""
+  with temp_project_dir() as temp_path:
+    run_cli_command(['add', 'claude', 'gemini', '--no-editor', '--all'])
+    (temp_path / '.claude' / 'commands' / 'review.md').write_text('# Review\n')
+
+    result = run_cli_command(['clean', '--command', 'example', '--force'])
+
+    assert result.exit_code == 0
+    assert not (temp_path / '.claude' / 'commands' / 'example.md').exists()
+    assert not (temp_path / '.gemini' / 'commands' / 'example.toml').exists()
+    assert (temp_path / '.claude' / 'commands' / 'review.md').exists()
+    assert complete.read_cache(os.getcwd())['command_names']['claude'] == ['review']
+
+    assert run_cli_command(['undo']).exit_code == 0
+    assert (temp_path / '.gemini' / 'commands' / 'example.toml').exists()
+
+    result = run_cli_command(['clean', 'claude', '--command', 'missing', '--force'])
+    assert result.exit_code == 1
+    assert 'No command named missing' in result.stdout
@@ -0,0 +1,121 @@
+"""Tests for the aiproj serve daemon."""
+
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from benchmarks.startup import measure_imports
+from src.cli.machine import write_listing
+from src.core import daemon_client
+from src.core.daemon import DaemonServer, is_running, serve
+
+from .conftest import run_cli_command, temp_project_dir
+
+
+@pytest.fixture
+def daemon(monkeypatch):
+  """Serve on a short socket path (AF_UNIX paths are limited to ~100 bytes)."""
+  socket_dir = Path(tempfile.mkdtemp(prefix='aiproj-'))
+  path = socket_dir / 'd.sock'
+  monkeypatch.setenv('AIPROJ_SOCKET', str(path))
+  started = threading.Event()
+  servers = []
+
+  def ready(server: DaemonServer):
+    servers.append(server)
+    started.set()
+
+  thread = threading.Thread(target=serve, kwargs={'path': path, 'ready': ready}, daemon=True)
+  thread.start()
+  assert started.wait(5)
+  yield path
+  servers[0].shutdown()
+  thread.join(5)
+  shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+def _records(project_dir: Path):
+  return {r['provider']: r for r in daemon_client.call('status', {'project': str(project_dir)})}
+
+
+def test_status_matches_detector_and_follows_changes(daemon):
+  """Test that status comes from the warm index and is refreshed after a file change."""
+  with temp_project_dir() as temp_path:
+    commands_dir = temp_path / '.claude' / 'commands'
+    commands_dir.mkdir(parents=True)
+    (commands_dir / 'review.md').write_text('# Review\n')
+
+    out = io.StringIO()
+    write_listing('json', temp_path, no_cache=True, out=out)
+    assert (
+      daemon_client.call('status', {'project': str(temp_path)})
+      == json.loads(out.getvalue())['providers']
+    )
+
+    (temp_path / 'CLAUDE.md').write_text('# Claude\n')
+    (commands_dir / 'test.md').write_text('# Test\n')
+    claude = _records(temp_path)['claude']
+    assert claude['config'] is True
+    assert claude['commands'] == 2
+
+    (commands_dir / 'review.md').write_text('---\ndescription: Review a diff\n---\nBody\n')
+    deadline = time.monotonic() + 5
+    commands = []
+    while time.monotonic() < deadline:
+      commands = daemon_client.call('commands', {'project': str(temp_path), 'provider': 'claude'})
+      if any(c['description'] == 'Review a diff' for c in commands):
+        break
+      time.sleep(0.05)
+    assert {c['name'] for c in commands} == {'review', 'test'}
+    assert any(c['description'] == 'Review a diff' for c in commands)
+
+
+def test_errors_and_stale_socket(daemon):
+  """Test JSON-RPC errors and that a second daemon refuses to take over the socket."""
+  with pytest.raises(daemon_client.DaemonError) as excinfo:
+    daemon_client.call('nope')
+  assert excinfo.value.code == -32601
+  with pytest.raises(daemon_client.DaemonError):
+    daemon_client.call('commands', {'project': '/', 'provider': 'nope'})
+
+  with pytest.raises(OSError, match='already listening'):
+    DaemonServer(daemon, None)
+  assert is_running(daemon)
+  assert oct(daemon.stat().st_mode & 0o777) == '0o600'
+
+
+def test_cli_uses_running_daemon(daemon):
+  """Test that list asks the daemon and then never imports the detector."""
+  with temp_project_dir() as temp_path:
+    (temp_path / 'GEMINI.md').write_text('# Gemini\n')
+    before = daemon_client.call('ping')['requests']
+
+    result = run_cli_command(['list'])
+
+    assert result.exit_code == 0
+    assert 'Configured providers: gemini' in result.stdout
+    ping = daemon_client.call('ping')
+    assert ping['requests'] == before + 2
+    assert str(temp_path.resolve()) in ping['projects']
+
+  modules = measure_imports(['list', '--format', 'json'])
+  assert 'src.core.daemon_client' in modules
+  assert 'src.core.detector' not in modules
+
+
+def test_serve_stop(daemon):
+  """Test that serve --stop shuts the daemon down and removes its socket."""
+  result = run_cli_command(['serve', '--stop'])
+
+  assert result.exit_code == 0
+  deadline = time.monotonic() + 5
+  while daemon.exists() and time.monotonic() < deadline:
+    time.sleep(0.05)
+  assert not daemon.exists()
+  assert run_cli_command(['serve', '--stop']).exit_code == 1
@@ -0,0 +1,92 @@
+"""Tests for recursive provider discovery."""
+
+import threading
+from pathlib import Path
+
+from src.core.detector import ProjectDetector
+from src.core.discovery import GitignoreRules, discover_provider_configs, is_ignored
+
+from .conftest import run_cli_command, temp_project_dir
+
+
+def _make_monorepo(root: Path):
+  """Create nested packages with provider configs, plus trees that must be skipped."""
+  (root / 'AGENTS.md').write_text('# Agents')
+  claude_commands = root / 'packages' / 'api' / '.claude' / 'commands'
+  claude_commands.mkdir(parents=True)
+  (root / 'packages' / 'api' / 'CLAUDE.md').write_text('# API')
+  (claude_commands / 'deploy.md').write_text('# Deploy')
+  gemini_commands = root / 'packages' / 'web' / '.gemini' / 'commands'
+  gemini_commands.mkdir(parents=True)
+  (gemini_commands / 'lint.toml').write_text('description = "Lint"')
+
+  for skipped in ('node_modules/dep', '.venv/lib', 'dist/bundle'):
+    (root / skipped).mkdir(parents=True)
+    (root / skipped / 'CLAUDE.md').write_text('# Skipped')
+  (root / '.gitignore').write_text('# build output\n/dist\n')
+
+
+def test_discover_nested_configs():
+  """Test that every nested provider config is found and classified."""
+  with temp_project_dir() as temp_path:
+    _make_monorepo(temp_path)
+
+    projects = discover_provider_configs(temp_path)
+
+    assert [str(project.path) for project in projects] == ['.', 'packages/api', 'packages/web']
+    api = projects[1]
+    assert api.configured_providers == ['claude']
+    assert api.status['claude']['commands'] == 1
+    assert projects[2].status['gemini']['commands'] == 1
+
+
+def test_status_is_computed_in_the_pool():
+  """Test that the status of found projects is computed concurrently, off the walking thread."""
+  with temp_project_dir() as temp_path:
+    (temp_path / 'api').mkdir()
+    (temp_path / 'api' / 'CLAUDE.md').write_text('# API')
+    (temp_path / 'web').mkdir()
+    (temp_path / 'web' / 'GEMINI.md').write_text('# Web')
+    detector = ProjectDetector()
+    get_provider_status = detector.get_provider_status
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_each_other(project_dir, snapshot=None):
+      barrier.wait()
+      return get_provider_status(project_dir, snapshot)
+
+    detector.get_provider_status = wait_for_each_other
+    projects = discover_provider_configs(temp_path, detector)
+
+    assert [str(project.path) for project in projects] == ['api', 'web']
+
+
+def test_gitignore_rules():
+  """Test anchoring, directory-only patterns, globs and negation."""
+  rules = [
+    GitignoreRules('', '/build\nlogs/\n*.tmp\n**/cache\n'),
+    GitignoreRules('pkg', 'out\n!keep\n'),
+  ]
+
+  assert is_ignored(rules, 'build', is_dir=True)
+  assert not is_ignored(rules, 'src/build', is_dir=True)
+  assert is_ignored(rules, 'a/logs', is_dir=True)
+  assert not is_ignored(rules, 'a/logs', is_dir=False)
+  assert is_ignored(rules, 'x/y.tmp', is_dir=False)
+  assert is_ignored(rules, 'deep/nested/cache', is_dir=True)
+  assert is_ignored(rules, 'pkg/out', is_dir=True)
+  assert not is_ignored(rules, 'other/out', is_dir=True)
+  assert not is_ignored(rules, 'pkg/keep', is_dir=True)
+
+
+def test_list_recursive():
+  """Test list --recursive output."""
+  with temp_project_dir() as temp_path:
+    _make_monorepo(temp_path)
+
+    result = run_cli_command(['list', '--recursive'])
+
+    assert result.exit_code == 0
+    assert 'packages/api' in result.stdout
+    assert 'node_modules' not in result.stdout
+    assert 'Found provider configs in 3 directories' in result.stdout
@@ -0,0 +1,99 @@
+"""Tests for multi-repository status."""
+
+import json
+from pathlib import Path
+
+from src.core.cache import StatusCache
+from src.core.detector import ProjectDetector
+from src.core.fleet import FleetSummary, expand_roots, iter_fleet_status
+
+from .conftest import run_cli_command, temp_project_dir
+
+
+def _make_repos(root: Path):
+  """Create three repositories with different provider setups."""
+  (root / 'repo-a').mkdir()
+  (root / 'repo-a' / 'CLAUDE.md').write_text('# A')
+  (root / 'repo-b' / '.codex' / 'prompts').mkdir(parents=True)
+  (root / 'repo-b' / '.codex' / 'prompts' / 'review.md').write_text('# Review')
+  (root / 'repo-c').mkdir()
+
+
+def test_expand_roots_from_file_and_glob():
+  """Test reading roots from a list file or a glob."""
+  with temp_project_dir() as temp_path:
+    _make_repos(temp_path)
+    (temp_path / 'roots.txt').write_text('repo-b\n# comment\n\nrepo-a\n')
+
+    assert expand_roots('roots.txt') == [Path('repo-b'), Path('repo-a')]
+    assert [p.name for p in expand_roots(str(temp_path / 'repo-*'))] == [
+      'repo-a',
+      'repo-b',
+      'repo-c',
+    ]
+
+
+def test_unreadable_root_does_not_stop_others():
+  """Test that a missing root is reported without affecting other results."""
+  with temp_project_dir() as temp_path:
+    _make_repos(temp_path)
+    roots = [temp_path / 'repo-a', temp_path / 'missing', temp_path / 'repo-b']
+
+    results = {result.root.name: result for result in iter_fleet_status(roots, max_workers=2)}
+    summary = FleetSummary()
+    for result in results.values():
+      summary.add(result)
+
+    assert results['missing'].error is not None
+    assert results['repo-a'].configured_providers == ['claude']
+    assert results['repo-b'].status['codex']['prompts'] == 1
+    assert summary.roots == 3
+    assert summary.errors == 1
+    assert summary.providers == {'claude': 1, 'gemini': 0, 'codex': 1}
+
+
+def test_failing_root_is_reported_and_cache_is_used(tmp_path, monkeypatch):
+  """Test that any error in one root becomes its error status, and the cache is passed on."""
+  _make_repos(tmp_path)
+  get_status = ProjectDetector.get_provider_status
+
+  def get_provider_status(self, project_dir, snapshot=None):
+    if project_dir.name == 'repo-c':
+      raise ValueError('malformed provider file')
+    assert self.cache is not None
+    return get_status(self, project_dir, snapshot)
+
+  monkeypatch.setattr(ProjectDetector, 'get_provider_status', get_provider_status)
+  detector = ProjectDetector(cache=StatusCache(tmp_path / 'cache'))
+  roots = [tmp_path / name for name in ('repo-a', 'repo-b', 'repo-c')]
+
+  results = {result.root.name: result for result in iter_fleet_status(roots, 2, detector)}
+
+  assert results['repo-c'].error == 'ValueError: malformed provider file'
+  assert results['repo-a'].configured_providers == ['claude']
+  assert len(list((tmp_path / 'cache').iterdir())) == 2
+
+
+def test_list_roots_ndjson():
+  """Test streaming NDJSON output with a trailing summary."""
+  with temp_project_dir() as temp_path:
+    _make_repos(temp_path)
+
+    result = run_cli_command(['list', '--roots', 'repo-*', '--format', 'ndjson'])
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert sorted(record['root'] for record in records[:-1]) == ['repo-a', 'repo-b', 'repo-c']
+    assert records[-1]['summary']['unconfigured'] == 1
+
+
+def test_list_roots_table():
+  """Test table output for multiple repositories."""
+  with temp_project_dir() as temp_path:
+    _make_repos(temp_path)
+
+    result = run_cli_command(['list', '--roots', 'repo-*'])
+
+    assert result.exit_code == 0
+    assert 'repo-a' in result.stdout
+    assert 'Scanned 3 repositories' in result.stdout
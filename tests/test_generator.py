@@ -0,0 +1,206 @@
+"""Tests for writing generated configuration files."""
+
+import errno
+import os
+import threading
+import tracemalloc
+
+import pytest
+
+from src.core import atomic
+from src.core.atomic import AtomicWriter, Durability, LinkMode, same_content
+from src.core.generator import ConfigGenerator
+from src.providers.codex import CodexProvider
+from src.providers.gemini import GeminiProvider
+
+from .conftest import run_cli_command, temp_project_dir
+
+
+def test_force_skips_unchanged_files():
+  """Test that --force leaves files with identical content (and their mtimes) alone."""
+  with temp_project_dir() as temp_path:
+    generator = ConfigGenerator()
+    files = {'CLAUDE.md': '# Claude\n', '.claude/commands/review.md': '# Review\n'}
+    assert generator.write_config_files(temp_path, files) == list(files)
+
+    review = temp_path / '.claude' / 'commands' / 'review.md'
+    os.utime(review, ns=(1_000_000_000, 1_000_000_000))
+
+    files['CLAUDE.md'] = '# Claude, edited\n'
+    assert generator.write_config_files(temp_path, files, force=True) == ['CLAUDE.md']
+    assert review.stat().st_mtime_ns == 1_000_000_000
+    assert (temp_path / 'CLAUDE.md').read_text() == '# Claude, edited\n'
+
+
+def test_atomic_write_leaves_no_temp_files_and_keeps_mode():
+  """Test that replaced files keep their permissions and no temp files remain."""
+  with temp_project_dir() as temp_path:
+    script = temp_path / 'CLAUDE.md'
+    script.write_text('old')
+    script.chmod(0o640)
+
+    writer = AtomicWriter()
+    assert writer.write(script, b'new')
+    assert script.read_bytes() == b'new'
+    assert script.stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in temp_path.iterdir()] == ['CLAUDE.md']
+
+    fresh = temp_path / 'GEMINI.md'
+    assert writer.write(fresh, b'new')
+    assert fresh.stat().st_mode & 0o777 == 0o666 & ~atomic._umask()
+
+
+def test_same_content_compares_size_then_bytes():
+  """Test content comparison for missing, resized and same-size changed files."""
+  with temp_project_dir() as temp_path:
+    path = temp_path / 'file.md'
+    assert not same_content(path, b'abc')
+    path.write_bytes(b'abc')
+    assert same_content(path, b'abc')
+    assert not same_content(path, b'abcd')
+    assert not same_content(path, b'abd')
+    assert not same_content(temp_path, b'')
+
+
+def test_batch_durability_syncs_each_directory_once(monkeypatch):
+  """Test that batch mode fsyncs directories once after all writes."""
+  synced = []
+  monkeypatch.setattr(atomic, 'fsync_dir', synced.append)
+
+  with temp_project_dir() as temp_path:
+    generator = ConfigGenerator(durability=Durability.batch)
+    files = {f'.claude/commands/cmd-{i}.md': f'# {i}\n' for i in range(5)}
+    files['CLAUDE.md'] = '# Claude\n'
+    generator.write_config_files(temp_path, files)
+
+    assert sorted(synced) == sorted([temp_path, temp_path / '.claude' / 'commands'])
+
+    synced.clear()
+    ConfigGenerator(durability='strict').write_config_files(
+      temp_path, {'CLAUDE.md': '# Strict\n', 'GEMINI.md': '# Gemini\n'}, force=True
+    )
+    assert synced == [temp_path, temp_path]
+
+
+def test_init_durability_option():
+  """Test that --durability is accepted and rejects unknown policies."""
+  with temp_project_dir() as temp_path:
+    result = run_cli_command(['init', '--claude', '--no-editor', '--durability', 'strict'])
+    assert result.exit_code == 0
+    assert (temp_path / 'CLAUDE.md').exists()
+
+    result = run_cli_command(['init', '--claude', '--durability', 'sometimes'])
+    assert result.exit_code != 0
+
+
+def test_link_falls_back_to_copy_across_devices(monkeypatch):
+  """Test that a hard link that cannot be made (EXDEV) is written as a copy."""
+  with temp_project_dir() as temp_path:
+    source = temp_path / 'source.md'
+    source.write_text('# Shared\n')
+
+    def cross_device(src, dst):
+      raise OSError(errno.EXDEV, 'Invalid cross-device link')
+
+    monkeypatch.setattr(atomic.os, 'link', cross_device)
+    writer = AtomicWriter()
+    assert writer.link(temp_path / 'copy.md', source, b'# Shared\n', LinkMode.hard)
+
+    assert (temp_path / 'copy.md').read_text() == '# Shared\n'
+    assert not os.path.samefile(source, temp_path / 'copy.md')
+    assert sorted(p.name for p in temp_path.iterdir()) == ['copy.md', 'source.md']
+
+
+def test_add_link_option():
+  """Test that add --link=sym links migrated commands that need no conversion."""
+  with temp_project_dir() as temp_path:
+    commands_dir = temp_path / '.claude' / 'commands'
+    commands_dir.mkdir(parents=True)
+    (commands_dir / 'deploy.md').write_text('# Deploy\n\nShip it')
+    (temp_path / 'CLAUDE.md').write_text('# Claude')
+
+    result = run_cli_command(['add', 'codex', '--link', 'sym', '--no-editor'])
+
+    assert result.exit_code == 0
+    output = temp_path / '.codex' / 'prompts' / 'deploy.md'
+    assert output.is_symlink()
+    assert output.read_text() == '# Deploy\n\nShip it'
+    assert not (temp_path / 'AGENTS.md').is_symlink()
+
+
+def test_stream_targets_matches_batch_with_bounded_memory(tmp_path):
+  """Test that streaming writes what the batch path writes without keeping bodies."""
+  batch_dir, stream_dir = tmp_path / 'batch', tmp_path / 'stream'
+  for project_dir in (batch_dir, stream_dir):
+    commands_dir = project_dir / '.claude' / 'commands'
+    commands_dir.mkdir(parents=True)
+    (project_dir / 'CLAUDE.md').write_text('# Claude')
+    for i in range(20):
+      (commands_dir / f'cmd{i}.md').write_text(f'# Command {i}\n\n' + 'x' * (256 << 10))
+  targets = {'gemini': ['config', 'commands'], 'codex': ['commands']}
+
+  generated = ConfigGenerator().generate_targets(batch_dir, targets, migrate_from=['claude'])
+  files = {path: content for target in generated.values() for path, content in target.items()}
+  ConfigGenerator().write_config_files(batch_dir, files)
+
+  generator = ConfigGenerator()
+  tracemalloc.start()
+  try:
+    items = generator.stream_targets(stream_dir, targets, migrate_from=['claude'])
+    written = generator.write_config_stream(stream_dir, items)
+    _, peak = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+
+  assert sorted(written) == sorted(files)
+  assert sorted(generator.target_files['gemini']) == sorted(generated['gemini'])
+  for path, content in files.items():
+    assert (stream_dir / path).read_text() == content
+  # The batch path holds 20 bodies plus 40 outputs (over 15 MiB) at once
+  assert peak < 4 << 20
+
+
+def _wait_for_each_other(monkeypatch, barrier):
+  """Make Gemini and Codex generation block until both have started."""
+  for provider_class in (GeminiProvider, CodexProvider):
+    iter_config = provider_class.iter_config
+
+    def waiting(self, *args, _iter_config=iter_config, **kwargs):
+      barrier.wait()
+      yield from _iter_config(self, *args, **kwargs)
+
+    monkeypatch.setattr(provider_class, 'iter_config', waiting)
+
+
+def test_stream_targets_generates_targets_concurrently(tmp_path, monkeypatch):
+  """Test that several streamed targets are produced at the same time, not one by one."""
+  (tmp_path / '.claude' / 'commands').mkdir(parents=True)
+  (tmp_path / '.claude' / 'commands' / 'review.md').write_text('# Review')
+  _wait_for_each_other(monkeypatch, threading.Barrier(2, timeout=5))
+  generator = ConfigGenerator()
+
+  items = generator.stream_targets(
+    tmp_path, {'gemini': ['commands'], 'codex': ['commands']}, migrate_from=['claude']
+  )
+  written = generator.write_config_stream(tmp_path, items)
+
+  assert sorted(written) == ['.codex/prompts/review.md', '.gemini/commands/review.toml']
+  assert generator.target_files == {
+    'gemini': ['.gemini/commands/review.toml'],
+    'codex': ['.codex/prompts/review.md'],
+  }
+
+
+def test_stream_targets_reports_producer_errors(tmp_path, monkeypatch):
+  """Test that a failing target raises in the consumer and stops the other producers."""
+
+  def fail(self, *args, **kwargs):
+    raise RuntimeError('template missing')
+    yield
+
+  monkeypatch.setattr(GeminiProvider, 'iter_config', fail)
+  generator = ConfigGenerator()
+  items = generator.stream_targets(tmp_path, {'gemini': ['config'], 'codex': ['config']})
+
+  with pytest.raises(RuntimeError, match='template missing'):
+    generator.write_config_stream(tmp_path, items)
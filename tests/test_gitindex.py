@@ -0,0 +1,191 @@
+"""Tests for git-index-backed detection."""
+
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core import gitindex
+from src.core.detector import ProjectDetector
+from src.core.discovery import discover_provider_configs
+from src.core.gitindex import GitIndex, parse_index
+from src.core.snapshot import TargetedSnapshot
+
+from .conftest import temp_project_dir
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+
+
+def _git(cwd: Path, *args: str) -> bytes:
+  return subprocess.run(['git', *args], cwd=cwd, capture_output=True, check=True).stdout
+
+
+def _write(path: Path, text: str = '# x\n'):
+  path.parent.mkdir(parents=True, exist_ok=True)
+  path.write_text(text)
+
+
+def _backdate(root: Path):
+  past = time.time() - 60
+  for directory, _, files in os.walk(root):
+    for name in files:
+      os.utime(os.path.join(directory, name), (past, past))
+    os.utime(directory, (past, past))
+
+
+@pytest.mark.parametrize('version', ['2', '3', '4'])
+def test_parser_matches_git(version):
+  """Test that every index version parses to the same paths git lists."""
+  with temp_project_dir() as temp_path:
+    _git(temp_path, 'init', '-q')
+    _write(temp_path / 'CLAUDE.md')
+    _write(temp_path / 'pkg' / 'nested' / 'deeper' / 'AGENTS.md')
+    _git(temp_path, 'add', '.')
+    # A name longer than the 12-bit length field, staged without a file on disk
+    blob = _git(temp_path, 'hash-object', '-w', 'CLAUDE.md').decode().strip()
+    long_name = '/'.join(['d' * 200] * 25) + '/x.md'
+    _git(temp_path, 'update-index', '--add', '--cacheinfo', f'100644,{blob},{long_name}')
+    _write(temp_path / 'intent.md')
+    _git(temp_path, 'add', '-N', 'intent.md')  # extended flags in version 3+
+    _git(temp_path, 'update-index', '--index-version', version)
+
+    names = parse_index((temp_path / '.git' / 'index').read_bytes())
+
+    assert names == _git(temp_path, 'ls-files', '-z').split(b'\0')[:-1]
+
+
+def test_discovery_uses_index_and_overlays_disk():
+  """Test that discovery finds tracked and untracked projects, but not ignored ones."""
+  with temp_project_dir() as temp_path:
+    _git(temp_path, 'init', '-q')
+    _write(temp_path / 'CLAUDE.md')
+    _write(
+      temp_path / 'services' / 'api' / '.gemini' / 'commands' / 'deploy.toml', 'prompt = "x"\n'
+    )
+    _write(temp_path / 'services' / 'gone' / 'AGENTS.md')
+    _write(temp_path / 'node_modules' / 'lib' / 'CLAUDE.md')
+    _git(temp_path, 'add', '.')
+    (temp_path / 'services' / 'gone' / 'AGENTS.md').unlink()
+    _write(temp_path / 'services' / 'api' / '.gemini' / 'commands' / 'test.toml', 'prompt = "y"\n')
+    _write(temp_path / 'untracked' / 'CLAUDE.md')
+    _write(temp_path / 'services' / 'new' / '.codex' / 'prompts' / 'review.md')
+    _write(temp_path / 'build' / 'CLAUDE.md')
+    _write(temp_path / '.gitignore', 'build/\n')
+
+    projects = discover_provider_configs(temp_path, ProjectDetector())
+
+    assert [str(project.path) for project in projects] == [
+      '.',
+      'services/api',
+      'services/new',
+      'untracked',
+    ]
+    assert projects[1].status['gemini']['commands'] == 2
+
+    # Searching from a subdirectory only reports projects below it
+    projects = discover_provider_configs(temp_path / 'services', ProjectDetector())
+    assert [str(project.path) for project in projects] == ['api', 'new']
+
+
+def test_sha256_index_in_linked_worktree(monkeypatch):
+  """Test that a linked worktree takes the object format from the common git dir."""
+  with temp_project_dir() as temp_path:
+    main = temp_path / 'main'
+    main.mkdir()
+    _git(main, 'init', '-q', '--object-format=sha256')
+    _write(main / 'pkg' / 'CLAUDE.md')
+    _git(main, 'add', '.')
+    _git(main, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-qm', 'init')
+    _git(main, 'worktree', 'add', '-q', str(temp_path / 'linked'))
+
+    def fail(self):
+      raise AssertionError('fell back to git ls-files')
+
+    monkeypatch.setattr(GitIndex, '_ls_files', fail)
+    index = GitIndex.find(temp_path / 'linked')
+    assert index.common_dir == (main / '.git').resolve()
+    assert index.tracked_names() == [b'pkg/CLAUDE.md']
+
+
+def test_walk_when_disabled(monkeypatch):
+  """Test that AIPROJ_GIT_INDEX=0 falls back to walking (and finds untracked projects)."""
+  monkeypatch.setenv('AIPROJ_GIT_INDEX', '0')
+  with temp_project_dir() as temp_path:
+    _git(temp_path, 'init', '-q')
+    _write(temp_path / 'untracked' / 'CLAUDE.md')
+
+    detector = ProjectDetector()
+    projects = discover_provider_configs(temp_path, detector)
+
+    assert [str(project.path) for project in projects] == ['untracked']
+    assert detector.git_index(temp_path) is None
+
+
+def test_index_results_are_cached(monkeypatch):
+  """Test that an unchanged index is not parsed again, and a changed one is."""
+  with temp_project_dir() as temp_path:
+    _git(temp_path, 'init', '-q')
+    _write(temp_path / 'a' / 'CLAUDE.md')
+    _git(temp_path, 'add', '.')
+    assert GitIndex.find(temp_path / 'a').provider_paths(['CLAUDE.md']) == ['a/CLAUDE.md']
+
+    def fail(*args):
+      raise AssertionError('index parsed again')
+
+    monkeypatch.setattr(gitindex, 'parse_index', fail)
+    assert GitIndex.find(temp_path).provider_paths(['CLAUDE.md']) == ['a/CLAUDE.md']
+
+    monkeypatch.undo()
+    _write(temp_path / 'b' / 'CLAUDE.md')
+    _git(temp_path, 'add', '.')
+    assert GitIndex.find(temp_path).provider_paths(['CLAUDE.md']) == ['a/CLAUDE.md', 'b/CLAUDE.md']
+
+
+def test_untracked_results_are_cached_until_a_directory_changes(monkeypatch):
+  """Test that git is only asked again once a searched directory changes."""
+  markers = ['AGENTS.md', 'CLAUDE.md']
+  with temp_project_dir() as temp_path:
+    _git(temp_path, 'init', '-q')
+    _write(temp_path / 'a' / 'main.py')
+    _git(temp_path, 'add', '.')
+    _write(temp_path / 'scratch' / 'notes' / 'todo.txt')
+    _write(temp_path / '.gitignore', 'build/\n')
+    _write(temp_path / 'build' / 'out.txt')
+    _backdate(temp_path)
+    assert GitIndex.find(temp_path).untracked_paths(markers) == []
+
+    def fail(self, *args):
+      raise AssertionError('git asked again')
+
+    monkeypatch.setattr(GitIndex, '_git', fail)
+    _write(temp_path / 'build' / 'CLAUDE.md')  # ignored, so not searched
+    assert GitIndex.find(temp_path).untracked_paths(markers) == []
+
+    monkeypatch.undo()
+    _write(temp_path / 'scratch' / 'notes' / 'CLAUDE.md')
+    _write(temp_path / 'a' / 'AGENTS.md')
+    paths = GitIndex.find(temp_path).untracked_paths(markers)
+    assert paths == ['a/AGENTS.md', 'scratch/notes/CLAUDE.md']
+
+
+def test_detector_stats_root_entries_in_worktree():
+  """Test that a worktree's root is never listed and status matches a full listing."""
+  with temp_project_dir() as temp_path:
+    _git(temp_path, 'init', '-q')
+    for i in range(50):
+      _write(temp_path / f'module_{i}' / 'main.py')
+    _write(temp_path / 'GEMINI.md')
+    _write(temp_path / '.claude' / 'commands' / 'review.md')
+
+    detector = ProjectDetector()
+    snapshot = detector.snapshot(temp_path)
+
+    assert isinstance(snapshot, TargetedSnapshot)
+    assert 'module_0' not in snapshot._listings['']
+    assert snapshot.is_dir('module_0')  # names outside the watched set are stat'ed on demand
+    with_listing = ProjectDetector()
+    with_listing.git_index = lambda project_dir: None
+    assert detector.get_provider_status(temp_path) == with_listing.get_provider_status(temp_path)
@@ -1,5 +1,8 @@
 """Tests for the init command."""
 
+from src.core.atomic import AtomicWriter
+from src.providers.gemini import GeminiProvider
+
 from .conftest import run_cli_command, temp_project_dir
 
 
@@ -74,3 +77,40 @@ def test_init_force_overwrite():
     assert result.exit_code == 0
     assert 'Created' in result.stdout
     assert claude_file.read_text() != 'Original content'
+
+
+def test_init_reports_failed_provider_and_writes_others(monkeypatch):
+  """Test that one provider failing to generate does not stop the others."""
+
+  def fail(self, project_dir, components, base_config=None):
+    raise RuntimeError('template missing')
+
+  monkeypatch.setattr(GeminiProvider, 'generate_config', fail)
+  with temp_project_dir() as temp_path:
+    result = run_cli_command(['init', '--claude', '--gemini', '--codex', '--no-editor'])
+
+    assert result.exit_code == 1
+    assert 'Error initializing gemini: template missing' in result.stdout
+    assert (temp_path / 'CLAUDE.md').exists()
+    assert (temp_path / 'AGENTS.md').exists()
+    assert not (temp_path / 'GEMINI.md').exists()
+
+
+def test_init_reports_failed_write_and_writes_others(monkeypatch):
+  """Test that a file that cannot be written is reported against its provider only."""
+  write = AtomicWriter.write
+
+  def fail_gemini(self, path, data, st=None):
+    if path.name == 'GEMINI.md':
+      raise PermissionError('read-only file system')
+    return write(self, path, data, st)
+
+  monkeypatch.setattr(AtomicWriter, 'write', fail_gemini)
+  with temp_project_dir() as temp_path:
+    result = run_cli_command(['init', '--claude', '--gemini', '--no-editor'])
+
+    assert result.exit_code == 1
+    assert 'Error initializing gemini: read-only file system' in result.stdout
+    assert 'Error initializing claude' not in result.stdout
+    assert (temp_path / 'CLAUDE.md').exists()
+    assert (temp_path / '.gemini' / 'commands' / 'example.toml').exists()
@@ -1,5 +1,15 @@
 """Tests for the list command."""
 
+import io
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.startup import PROJECT_ROOT, framework_modules, measure_imports
+from src.cli.machine import write_listing
+from src.cli.main import parse_machine_listing
+
 from .conftest import run_cli_command, temp_project_dir
 
 
@@ -52,3 +62,75 @@ def test_list_partial_configuration():
     assert result.exit_code == 0
     assert '✓' in result.stdout  # config exists
     assert '✗' in result.stdout  # commands/prompts don't exist
+
+
+def test_list_json_includes_counts_and_paths():
+  """Test JSON output with per-component counts and file paths."""
+  with temp_project_dir() as temp_path:
+    (temp_path / 'CLAUDE.md').write_text('# Claude Config')
+    commands_dir = temp_path / '.claude' / 'commands'
+    commands_dir.mkdir(parents=True)
+    (commands_dir / 'review.md').write_text('# Review')
+
+    result = run_cli_command(['list', '--format', 'json'])
+
+    assert result.exit_code == 0
+    document = json.loads(result.stdout)
+    claude = document['providers'][0]
+    assert claude['provider'] == 'claude'
+    assert claude['configured'] is True
+    assert claude['commands'] == 1
+    assert claude['files'] == {'config': ['CLAUDE.md'], 'commands': ['.claude/commands/review.md']}
+    assert [p['configured'] for p in document['providers'][1:]] == [False, False]
+
+
+def test_list_ndjson_recursive():
+  """Test one NDJSON line per provider per discovered project."""
+  with temp_project_dir() as temp_path:
+    (temp_path / 'pkg').mkdir()
+    (temp_path / 'pkg' / 'GEMINI.md').write_text('# Gemini')
+
+    out = io.StringIO()
+    assert write_listing('ndjson', temp_path, recursive=True, out=out) == 0
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    assert [(r['project'], r['provider']) for r in records] == [
+      ('pkg', 'claude'),
+      ('pkg', 'gemini'),
+      ('pkg', 'codex'),
+    ]
+    assert records[1]['files']['config'] == ['GEMINI.md']
+
+
+def test_machine_listing_fast_path():
+  """Test which argument lists bypass typer, and that they never import it."""
+  assert parse_machine_listing(['list', '--format', 'json']) == {'output_format': 'json'}
+  assert parse_machine_listing(['list', '-r', '--format=ndjson', '-j', '4']) == {
+    'recursive': True,
+    'output_format': 'ndjson',
+    'jobs': 4,
+  }
+  assert parse_machine_listing(['list']) is None
+  assert parse_machine_listing(['list', '--format', 'json', '--help']) is None
+  assert parse_machine_listing(['list', '--format', 'json', '--jobs', 'x']) is None
+  assert parse_machine_listing(['add', '--format', 'json']) is None
+
+  assert framework_modules(measure_imports(['list', '--format', 'json'])) == []
+
+
+def test_machine_listing_closed_pipe():
+  """Test that a reader closing the pipe early (``| head``) is not an error."""
+  with temp_project_dir() as temp_path:
+    (temp_path / 'CLAUDE.md').write_text('# Claude')
+    process = subprocess.Popen(
+      [sys.executable, '-c', 'from src.cli.main import main; main()', 'list', '--format', 'ndjson'],
+      env={**os.environ, 'PYTHONPATH': str(PROJECT_ROOT)},
+      stdout=subprocess.PIPE,
+      stderr=subprocess.PIPE,
+    )
+    # With no reader left, every write to stdout fails with EPIPE
+    process.stdout.close()
+    _, stderr = process.communicate()
+
+    assert process.returncode == 0
+    assert stderr == b''
@@ -0,0 +1,172 @@
+"""Tests for persistent run metrics and the stats command."""
+
+import json
+
+import pytest
+
+from src.core import metrics
+from src.core.completion import cache_path
+
+from .conftest import run_cli_command, temp_project_dir
+
+
+def _record(command, duration_ms, exit_code=0, **counters):
+  return {
+    'ts': 1.0,
+    'command': command,
+    'duration_ms': duration_ms,
+    'exit_code': exit_code,
+    **counters,
+  }
+
+
+def test_store_rotates_and_reads_all_generations(tmp_path):
+  """Test that a full log is rotated and older generations are still read."""
+  store = metrics.MetricsStore(tmp_path, max_bytes=200, keep=2)
+  for i in range(20):
+    store.append(_record('add', i))
+
+  assert sorted(p.name for p in tmp_path.iterdir()) == [
+    'runs.jsonl',
+    'runs.jsonl.1',
+    'runs.jsonl.2',
+    'totals.json',
+  ]
+  durations = [r['duration_ms'] for r in store.records()]
+  assert durations == sorted(durations)
+  assert durations[-1] == 19
+  assert len(durations) < 20
+  assert store.totals()['add']['runs'] + len(durations) == 20
+
+
+def test_summarize_percentiles():
+  """Test nearest-rank percentiles, failure counts and counter totals."""
+  records = [_record('list', ms, files_read=1) for ms in range(1, 101)]
+  records.append(_record('add', 5.0, exit_code=1, bytes_written=10))
+
+  summary = metrics.summarize(records)
+
+  assert summary['list']['p50_ms'] == 50
+  assert summary['list']['p90_ms'] == 90
+  assert summary['list']['p99_ms'] == 99
+  assert summary['list']['max_ms'] == 100
+  assert summary['list']['files_read'] == 100
+  assert summary['add']['failures'] == 1
+  assert summary['add']['bytes_written'] == 10
+
+
+def test_prometheus_textfile(tmp_path):
+  """Test the exported textfile's metric families."""
+  path = tmp_path / 'textfile' / 'aiproj.prom'
+  metrics.write_textfile(path, [_record('add', 250.0, bytes_written=42)])
+
+  text = path.read_text()
+  assert '# TYPE aiproj_command_duration_seconds summary' in text
+  assert 'aiproj_command_duration_seconds{command="add",quantile="0.5"} 0.25' in text
+  assert 'aiproj_command_duration_seconds_count{command="add"} 1' in text
+  assert '# TYPE aiproj_bytes_written_total counter' in text
+  assert 'aiproj_bytes_written_total{command="add"} 42' in text
+  assert '# EOF' not in text
+
+
+def test_prometheus_sample_names_match_their_family():
+  """Test that every sample belongs to the family its TYPE line declares."""
+  text = metrics.prometheus_text([_record('add', 250.0)], {'sync': {'runs': 1, 'duration_ms': 1}})
+  family, family_type = None, None
+  for line in text.splitlines():
+    if line.startswith('# TYPE '):
+      _, _, family, family_type = line.split()
+      continue
+    if line.startswith('#'):
+      continue
+    name = line.split('{')[0]
+    suffixes = ('', '_sum', '_count') if family_type == 'summary' else ('',)
+    assert name in [family + suffix for suffix in suffixes]
+
+
+def _exported_runs(store):
+  text = metrics.prometheus_text(list(store.records()), store.totals())
+  line = next(line for line in text.splitlines() if line.startswith('aiproj_runs_total'))
+  return float(line.split()[-1])
+
+
+def test_exported_counters_survive_rotation(tmp_path):
+  """Test that exported counters keep growing when rotation drops old runs."""
+  store = metrics.MetricsStore(tmp_path, max_bytes=200, keep=1)
+  exported = []
+  for _ in range(30):
+    store.append(_record('add', 1.0, bytes_written=1))
+    exported.append(_exported_runs(store))
+  assert exported == list(range(1, 31))
+
+
+def test_prometheus_text_parses():
+  """Test the export against the Prometheus text parser node_exporter's format follows."""
+  parser = pytest.importorskip('prometheus_client.parser')
+  records = [_record('add', 250.0, bytes_written=42), _record('list', 5.0, exit_code=1)]
+  totals = {'sync': {'runs': 3, 'failures': 0, 'duration_ms': 30.0, 'last_ts': 1.0}}
+
+  families = {
+    family.name: family
+    for family in parser.text_string_to_metric_families(metrics.prometheus_text(records, totals))
+  }
+
+  # The parser files counter samples under the family name without ``_total``
+  assert families['aiproj_runs'].type == 'counter'
+  runs = {s.labels['command']: s.value for s in families['aiproj_runs'].samples}
+  assert runs == {'add': 1, 'list': 1, 'sync': 3}
+  assert {s.name for s in families['aiproj_runs'].samples} == {'aiproj_runs_total'}
+  assert families['aiproj_failures'].samples[1].value == 1
+  assert families['aiproj_command_duration_seconds'].type == 'summary'
+  assert families['aiproj_last_run_timestamp_seconds'].type == 'gauge'
+  assert all(family.type != 'unknown' for family in families.values())
+
+
+def test_commands_record_runs(tmp_path):
+  """Test that CLI runs are recorded with I/O counters and shown by stats."""
+  with temp_project_dir() as temp_path:
+    (temp_path / 'CLAUDE.md').write_text('# Claude')
+
+    assert run_cli_command(['add', 'gemini', '--no-editor']).exit_code == 0
+    assert run_cli_command(['list']).exit_code == 0
+
+    records = list(metrics.MetricsStore().records())
+    assert [r['command'] for r in records] == ['add', 'list']
+    assert records[0]['files_written'] >= 1
+    assert records[0]['bytes_written'] > 0
+
+    result = run_cli_command(['stats', '--format', 'json'])
+    assert result.exit_code == 0
+    summary = json.loads(result.output)
+    assert set(summary) == {'add', 'list'}
+
+    export = tmp_path / 'aiproj.prom'
+    assert run_cli_command(['stats', '--export', str(export)]).exit_code == 0
+    assert 'aiproj_runs_total{command="list"} 1' in export.read_text()
+    assert len(list(metrics.MetricsStore().records())) == 2
+
+
+def test_metrics_can_be_disabled(monkeypatch):
+  """Test that AIPROJ_METRICS=0 turns recording off."""
+  monkeypatch.setenv('AIPROJ_METRICS', '0')
+  with temp_project_dir():
+    assert run_cli_command(['list']).exit_code == 0
+  assert list(metrics.MetricsStore().records()) == []
+
+
+def test_help_and_usage_errors_are_not_runs():
+  """Test that --help is not recorded and only a completed body refreshes completion."""
+  with temp_project_dir() as temp_path:
+    (temp_path / 'CLAUDE.md').write_text('# Claude')
+
+    assert run_cli_command(['add', '--help']).exit_code == 0
+    assert run_cli_command(['codex', 'install', '--help']).exit_code == 0
+    assert list(metrics.MetricsStore().records()) == []
+    assert not cache_path(temp_path).exists()
+
+    assert run_cli_command(['add', '--bogus']).exit_code == 2
+    assert [r['exit_code'] for r in metrics.MetricsStore().records()] == [2]
+    assert not cache_path(temp_path).exists()
+
+    assert run_cli_command(['add', 'gemini', '--no-editor']).exit_code == 0
+    assert cache_path(temp_path).exists()
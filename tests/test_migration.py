@@ -5,6 +5,8 @@ from pathlib import Path
 
 from src.core.generator import ConfigGenerator
 
+from .conftest import run_cli_command, temp_project_dir
+
 
 def test_migration_claude_to_gemini():
   """Test migrating content from Claude to Gemini."""
@@ -210,3 +212,89 @@ def test_merge_source_configs():
 
     # Gemini doesn't have prompts directory anymore, so no prompts should be found
     assert len(merged_config.prompts) == 0
+
+
+def test_merge_collapses_identical_commands():
+  """Test that the same command in several sources is migrated once."""
+  with tempfile.TemporaryDirectory() as temp_dir:
+    temp_path = Path(temp_dir)
+    claude_commands = temp_path / '.claude' / 'commands'
+    claude_commands.mkdir(parents=True)
+    (claude_commands / 'review.md').write_text(
+      '---\ndescription: "Review"\n---\n\n# Review\n\nCheck the diff.\n'
+    )
+    codex_prompts = temp_path / '.codex' / 'prompts'
+    codex_prompts.mkdir(parents=True)
+    (codex_prompts / 'review.md').write_text('# Review\r\n\r\nCheck the diff.  \r\n')
+
+    generator = ConfigGenerator()
+    merged = generator._merge_source_configs(temp_path, ['claude', 'codex'])
+
+    assert [c.name for c in merged.commands + merged.prompts] == ['review']
+    assert generator.conflicts == []
+
+
+def test_merge_conflicts_follow_priority():
+  """Test that differing commands with one name are resolved by priority and reported."""
+  with tempfile.TemporaryDirectory() as temp_dir:
+    temp_path = Path(temp_dir)
+    claude_commands = temp_path / '.claude' / 'commands'
+    claude_commands.mkdir(parents=True)
+    (claude_commands / 'review.md').write_text('# Review\n\nClaude version.\n')
+    (claude_commands / 'plan.md').write_text('# Plan\n')
+    gemini_commands = temp_path / '.gemini' / 'commands'
+    gemini_commands.mkdir(parents=True)
+    (gemini_commands / 'review.toml').write_text(
+      'description = "Review"\nprompt = """Gemini version."""\n'
+    )
+    (gemini_commands / 'plan.toml').write_text('description = "Plan"\nprompt = """# Plan"""\n')
+
+    generator = ConfigGenerator()
+    merged = generator._merge_source_configs(temp_path, ['claude', 'gemini'])
+    assert {c.name: c.path.suffix for c in merged.commands} == {'plan': '.md', 'review': '.md'}
+    assert [(c.name, c.kept, c.dropped) for c in generator.conflicts] == [
+      ('review', 'claude', ['gemini'])
+    ]
+
+    merged = generator._merge_source_configs(
+      temp_path, ['claude', 'gemini'], priority=['gemini', 'claude']
+    )
+    assert {c.name: c.path.suffix for c in merged.commands} == {'plan': '.toml', 'review': '.toml'}
+    assert [(c.name, c.kept, c.dropped) for c in generator.conflicts] == [
+      ('review', 'gemini', ['claude'])
+    ]
+
+
+def test_merge_winner_keeps_its_kind():
+  """Test that a prompt preferred over a command of the same name stays a prompt."""
+  with tempfile.TemporaryDirectory() as temp_dir:
+    temp_path = Path(temp_dir)
+    (temp_path / '.claude' / 'commands').mkdir(parents=True)
+    (temp_path / '.claude' / 'commands' / 'review.md').write_text('# Review\n\nClaude.\n')
+    (temp_path / '.codex' / 'prompts').mkdir(parents=True)
+    (temp_path / '.codex' / 'prompts' / 'review.md').write_text('# Review\n\nCodex.\n')
+
+    generator = ConfigGenerator()
+    merged = generator._merge_source_configs(
+      temp_path, ['claude', 'codex'], priority=['codex', 'claude']
+    )
+
+    assert merged.commands == []
+    assert [(c.name, c.path.parent.name) for c in merged.prompts] == [('review', 'prompts')]
+
+
+def test_add_reports_conflicts():
+  """Test that add prints resolved command conflicts."""
+  with temp_project_dir() as temp_path:
+    (temp_path / 'CLAUDE.md').write_text('# Claude')
+    claude_commands = temp_path / '.claude' / 'commands'
+    claude_commands.mkdir(parents=True)
+    (claude_commands / 'review.md').write_text('# Review\n\nClaude version.\n')
+    gemini_commands = temp_path / '.gemini' / 'commands'
+    gemini_commands.mkdir(parents=True)
+    (gemini_commands / 'review.toml').write_text('prompt = """Gemini version."""\n')
+
+    result = run_cli_command(['add', 'codex', '--no-editor', '--prefer', 'gemini,claude'])
+    assert result.exit_code == 0
+    assert "'review' differs between providers; using gemini, skipped claude" in result.stdout
+    assert 'Gemini version.' in (temp_path / '.codex' / 'prompts' / 'review.md').read_text()
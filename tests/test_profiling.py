@@ -0,0 +1,66 @@
+"""Tests for --profile timing spans."""
+
+import json
+import threading
+
+from src.core import profiling
+
+from .conftest import run_cli_command, temp_project_dir
+
+
+def test_spans_are_free_when_disabled():
+  """Test that span() returns a shared no-op and records nothing without a profiler."""
+  assert profiling.stop() is None
+  assert profiling.span('anything') is profiling.span('other')
+
+  @profiling.profiled('decorated')
+  def double(value):
+    return value * 2
+
+  assert double(21) == 42
+
+
+def test_profiler_records_nested_and_threaded_spans(tmp_path):
+  """Test trace events, per-thread ids, the summary and cProfile dumps."""
+  profiler = profiling.start(cprofile_dir=tmp_path / 'prof')
+  try:
+    with profiling.span('outer', files=3):
+      with profiling.span('inner'):
+        pass
+      thread = threading.Thread(target=_worker_span)
+      thread.start()
+      thread.join()
+  finally:
+    profiling.stop('run')
+
+  events = {event['name']: event for event in profiler.trace()['traceEvents']}
+  assert {'outer', 'inner', 'worker', 'run'} <= set(events)
+  assert events['outer']['args'] == {'files': '3'}
+  assert events['inner']['ts'] >= events['outer']['ts']
+  assert events['worker']['tid'] != events['outer']['tid']
+
+  rows = {row['name']: row for row in profiler.summary()}
+  assert rows['run']['percent'] == 100.0
+  assert [p.name for p in (tmp_path / 'prof').iterdir()] == ['001-outer.prof']
+
+
+def _worker_span():
+  with profiling.span('worker'):
+    pass
+
+
+def test_profile_option_writes_trace():
+  """Test that --profile writes a Chrome trace covering the instrumented phases."""
+  with temp_project_dir() as temp_path:
+    (temp_path / 'CLAUDE.md').write_text('# Claude')
+
+    result = run_cli_command(
+      ['--profile', '--profile-output', 'trace.json', 'add', 'gemini', '--no-editor']
+    )
+
+    assert result.exit_code == 0
+    assert 'write_config_files' in result.output
+    trace = json.loads((temp_path / 'trace.json').read_text())
+    names = {event['name'] for event in trace['traceEvents']}
+    assert {'aiproj add', 'load:claude', 'generate:gemini', 'write_config_files'} <= names
+    assert profiling.span('after') is profiling.span('run')
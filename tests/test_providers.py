@@ -186,3 +186,54 @@ class TestCodexProvider:
       assert '.codex/prompts/example.md' in files
       assert '~/.codex/prompts' in files['AGENTS.md']
       assert 'Copy this file to `~/.codex/prompts/example.md`' in files['.codex/prompts/example.md']
+
+
+class TestLazyCommands:
+  """Test deferred loading of command bodies."""
+
+  def test_body_is_read_on_first_access(self):
+    """Test that loading a command reads only its description until content is used."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+      path = Path(temp_dir) / 'schema.md'
+      body = '---\ndescription: "Big schema"\n---\n\n' + 'x' * 100_000 + '\n'
+      path.write_text(body)
+
+      command = ClaudeProvider().load_command(path)
+      assert command.description == 'Big schema'
+      assert not command.is_loaded
+
+      assert command.content == body
+      assert command.is_loaded
+
+  def test_description_beyond_head_falls_back_to_full_read(self):
+    """Test that a TOML description after a large prompt is still found."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+      path = Path(temp_dir) / 'late.toml'
+      path.write_text('prompt = """\n' + 'line\n' * 10_000 + '"""\ndescription = "Late"\n')
+
+      assert GeminiProvider().load_command(path).description == 'Late'
+
+  def test_commands_built_from_text_are_loaded(self):
+    """Test that in-memory commands behave as before."""
+    command = Command(name='custom', description='Custom', content='# Custom')
+    assert command.is_loaded
+    assert command.content == '# Custom'
+    assert command == Command('custom', 'Custom', '# Custom')
+
+  def test_bulk_load_keeps_sorted_order(self):
+    """Test that pooled loading returns the same commands, in order, as serial loading."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+      temp_path = Path(temp_dir)
+      commands_dir = temp_path / '.codex' / 'prompts'
+      commands_dir.mkdir(parents=True)
+      for i in range(200):
+        (commands_dir / f'prompt-{i:03d}.md').write_text(f'# Prompt {i}\n')
+
+      provider = CodexProvider()
+      rel_paths = provider.command_files(temp_path)
+      pooled = provider.load_commands(temp_path, rel_paths, max_workers=8)
+      serial = provider.load_commands(temp_path, rel_paths, max_workers=1)
+
+      assert [c.name for c in pooled] == [f'prompt-{i:03d}' for i in range(200)]
+      assert [c.description for c in pooled] == [c.description for c in serial]
+      assert provider.load_existing_config(temp_path).prompts == pooled
@@ -0,0 +1,129 @@
+"""Tests for the entry-point provider registry."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src.core.detector import ProjectDetector
+from src.providers import registry
+from src.providers.claude import ClaudeProvider
+
+from .conftest import temp_project_dir
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+_LOADED_PROVIDERS = """
+import sys
+from src.cli.main import main
+try:
+  main()
+except SystemExit:
+  pass
+print(' '.join(sorted(name for name in sys.modules if name.startswith('src.providers.'))))
+"""
+
+
+class CursorProvider(ClaudeProvider):
+  """Minimal plugin provider for Cursor rules."""
+
+  @property
+  def name(self) -> str:
+    """Provider name."""
+    return 'cursor'
+
+  @property
+  def config_files(self) -> List[str]:
+    """Main configuration files."""
+    return ['.cursorrules']
+
+  @property
+  def directories(self) -> List[str]:
+    """Required directories."""
+    return ['.cursor/rules']
+
+  def detect_existing(self, project_dir, snapshot=None) -> bool:
+    """Check for Cursor rules."""
+    snapshot = self.get_snapshot(project_dir, snapshot)
+    return snapshot.exists('.cursorrules') or snapshot.exists('.cursor')
+
+
+@pytest.fixture
+def plugins(monkeypatch):
+  """Pretend ``names -> targets`` are installed as entry points."""
+  monkeypatch.setattr(registry, '_discovered', None)
+
+  def install(**targets):
+    monkeypatch.setattr(
+      registry, 'provider_targets', lambda: {**registry.BUILTIN_PROVIDERS, **targets}
+    )
+    monkeypatch.setattr(registry, '_discovered', None)
+
+  return install
+
+
+def test_discovery_is_cached(plugins, monkeypatch):
+  """Test that a second discovery reads the cache instead of the entry points."""
+  specs = registry.discover()
+  assert list(specs) == ['claude', 'gemini', 'codex']
+  assert specs['claude'].markers == ['CLAUDE.md', '.claude']
+
+  def fail():
+    raise AssertionError('entry points were scanned again')
+
+  monkeypatch.setattr(registry, 'provider_targets', fail)
+  monkeypatch.setattr(registry, '_discovered', None)
+  assert registry.discover() == specs
+
+
+def test_plugin_provider_is_detected(plugins):
+  """Test that an entry-point provider is listed and detected like a built-in."""
+  plugins(cursor='tests.test_registry:CursorProvider')
+  detector = ProjectDetector(registry=registry.ProviderRegistry(registry.discover()))
+
+  with temp_project_dir() as temp_path:
+    (temp_path / '.cursor' / 'rules').mkdir(parents=True)
+
+    assert list(detector.get_all_providers()) == ['claude', 'gemini', 'codex', 'cursor']
+    assert detector.get_configured_providers(temp_path) == ['cursor']
+    assert detector.providers.is_loaded('cursor')
+    assert not detector.providers.is_loaded('gemini')
+
+
+def test_broken_plugin_is_skipped(plugins):
+  """Test that a plugin that fails to import does not break discovery."""
+  plugins(broken='tests.no_such_module:Provider')
+
+  with pytest.warns(UserWarning, match='broken'):
+    specs = registry.discover(use_cache=False)
+  assert 'broken' not in specs
+
+
+def test_add_imports_only_the_target_provider(tmp_path):
+  """Test that once discovery is cached, adding claude never imports other providers."""
+  env = {**os.environ, 'PYTHONPATH': str(PROJECT_ROOT), 'XDG_CACHE_HOME': str(tmp_path)}
+
+  def loaded_providers(project_dir, *args):
+    result = subprocess.run(
+      [sys.executable, '-c', _LOADED_PROVIDERS, *args],
+      cwd=project_dir,
+      env=env,
+      capture_output=True,
+      text=True,
+      check=True,
+    )
+    return result.stdout.splitlines()[-1].split()
+
+  with temp_project_dir() as temp_path:
+    # The first run discovers (and so imports) every provider
+    assert 'src.providers.gemini' in loaded_providers(temp_path, 'list')
+
+    loaded = loaded_providers(temp_path, 'add', 'claude', '--no-editor')
+
+    assert (temp_path / 'CLAUDE.md').exists()
+  assert 'src.providers.claude' in loaded
+  assert 'src.providers.gemini' not in loaded
+  assert 'src.providers.codex' not in loaded
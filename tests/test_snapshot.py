@@ -0,0 +1,79 @@
+"""Tests for the shared project snapshot."""
+
+import os
+import tempfile
+from pathlib import Path
+
+from src.core import snapshot as snapshot_module
+from src.core.detector import ProjectDetector
+from src.core.generator import ConfigGenerator
+from src.core.snapshot import ProjectSnapshot
+
+
+def _count_scandir(monkeypatch):
+  """Patch os.scandir in the snapshot module and return the list of scanned paths."""
+  scanned = []
+  original_scandir = os.scandir
+
+  def counting_scandir(path):
+    if not isinstance(path, int):  # tempfile cleanup scans by file descriptor
+      scanned.append(Path(path))
+    return original_scandir(path)
+
+  monkeypatch.setattr(snapshot_module.os, 'scandir', counting_scandir)
+  return scanned
+
+
+def test_snapshot_queries():
+  """Test exists/is_dir/list_files answers."""
+  with tempfile.TemporaryDirectory() as temp_dir:
+    temp_path = Path(temp_dir)
+    (temp_path / 'CLAUDE.md').write_text('# Claude')
+    commands_dir = temp_path / '.claude' / 'commands'
+    commands_dir.mkdir(parents=True)
+    (commands_dir / 'b.md').write_text('# B')
+    (commands_dir / 'a.md').write_text('# A')
+    (commands_dir / 'notes.txt').write_text('notes')
+
+    snapshot = ProjectSnapshot.scan(temp_path, ['.claude/commands'])
+
+    assert snapshot.is_file('CLAUDE.md')
+    assert snapshot.is_dir('.claude')
+    assert snapshot.exists('.claude/commands/a.md')
+    assert not snapshot.exists('.gemini/commands')
+    assert snapshot.list_files('.claude/commands', '.md') == ['a.md', 'b.md']
+    assert snapshot.list_files('.codex/prompts', '.md') == []
+
+
+def test_detector_scans_each_directory_once(monkeypatch):
+  """Test that repeated status queries are served from one scan."""
+  with tempfile.TemporaryDirectory() as temp_dir:
+    temp_path = Path(temp_dir)
+    (temp_path / 'CLAUDE.md').write_text('# Claude')
+    (temp_path / '.claude' / 'commands').mkdir(parents=True)
+    (temp_path / '.claude' / 'commands' / 'example.md').write_text('# Example')
+
+    scanned = _count_scandir(monkeypatch)
+    detector = ProjectDetector()
+    detector.format_provider_status(temp_path)
+    detector.format_provider_status(temp_path)
+    detector.get_configured_providers(temp_path)
+
+    assert len(scanned) == len(set(scanned))
+    assert temp_path in scanned
+
+
+def test_write_invalidates_snapshot():
+  """Test that writing config files refreshes the detector's view."""
+  with tempfile.TemporaryDirectory() as temp_dir:
+    temp_path = Path(temp_dir)
+    detector = ProjectDetector()
+    generator = ConfigGenerator(detector)
+
+    assert detector.get_configured_providers(temp_path) == []
+
+    files = generator.generate_provider_config(temp_path, 'gemini')
+    generator.write_config_files(temp_path, files)
+
+    assert detector.get_configured_providers(temp_path) == ['gemini']
+    assert detector.get_provider_status(temp_path)['gemini']['commands'] == 1
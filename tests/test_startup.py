@@ -0,0 +1,38 @@
+"""Tests for lazy command loading and CLI startup cost."""
+
+from benchmarks.startup import eager_modules, measure_imports
+
+from .conftest import run_cli_command
+
+
+def test_import_does_not_load_commands():
+  """Test that importing the CLI defers command, core and provider modules."""
+  modules = measure_imports()
+
+  assert 'src.cli.cli' in modules
+  assert eager_modules(modules) == []
+
+
+def test_help_does_not_load_commands():
+  """Test that top-level --help is rendered from the lazy registry."""
+  modules = measure_imports(['--help'])
+
+  assert eager_modules(modules) == []
+
+
+def test_help_lists_lazy_commands():
+  """Test that every registered command appears in the help output."""
+  result = run_cli_command(['--help'])
+
+  assert result.exit_code == 0
+  for name in ('init', 'add', 'list', 'clean'):
+    assert name in result.stdout
+
+
+def test_invoking_command_loads_only_that_command():
+  """Test that running a subcommand imports its module on demand."""
+  modules = measure_imports(['list'])
+
+  assert 'src.cli.commands.list_providers' in modules
+  assert 'src.cli.commands.add' not in modules
+  assert 'src.cli.commands.clean' not in modules
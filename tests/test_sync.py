@@ -0,0 +1,176 @@
+"""Tests for incremental command sync."""
+
+import os
+from pathlib import Path
+
+from src.core.atomic import LinkMode
+from src.core.generator import ConfigGenerator
+from src.core.sync import CommandSync
+
+from .conftest import run_cli_command, temp_project_dir
+
+
+def _make_project(temp_path: Path):
+  """Claude with two commands plus an otherwise empty Codex setup."""
+  commands_dir = temp_path / '.claude' / 'commands'
+  commands_dir.mkdir(parents=True)
+  (commands_dir / 'review.md').write_text(
+    '---\ndescription: "Review code"\n---\n\n# Review\n\nReview the diff'
+  )
+  (commands_dir / 'deploy.md').write_text('# Deploy\n\nShip it')
+  (temp_path / 'AGENTS.md').write_text('# Agents')
+
+
+def test_sync_writes_outputs_once():
+  """Test that a second sync with no changes writes nothing."""
+  with temp_project_dir() as temp_path:
+    _make_project(temp_path)
+
+    first = CommandSync(temp_path).run()
+    second = CommandSync(temp_path).run()
+
+    assert sorted(first.written) == ['.codex/prompts/deploy.md', '.codex/prompts/review.md']
+    review = (temp_path / '.codex' / 'prompts' / 'review.md').read_text()
+    assert review == '# Review\n\nReview the diff'
+    assert second.written == []
+    assert second.unchanged == 2
+    assert (temp_path / '.aiproj' / 'sync.json').exists()
+
+
+def test_sync_propagates_changes_and_deletions():
+  """Test that only changed sources are rewritten and removed sources are cleaned up."""
+  with temp_project_dir() as temp_path:
+    _make_project(temp_path)
+    CommandSync(temp_path).run()
+
+    (temp_path / '.claude' / 'commands' / 'review.md').write_text('# Review\n\nUpdated')
+    (temp_path / '.claude' / 'commands' / 'deploy.md').unlink()
+    result = CommandSync(temp_path).run()
+
+    assert result.written == ['.codex/prompts/review.md']
+    assert result.deleted == ['.codex/prompts/deploy.md']
+    assert 'Updated' in (temp_path / '.codex' / 'prompts' / 'review.md').read_text()
+    assert not (temp_path / '.codex' / 'prompts' / 'deploy.md').exists()
+
+
+def test_sync_keeps_edited_outputs():
+  """Test that hand-edited outputs are reported, and replaced only with force."""
+  with temp_project_dir() as temp_path:
+    _make_project(temp_path)
+    CommandSync(temp_path).run()
+    output = temp_path / '.codex' / 'prompts' / 'review.md'
+    output.write_text('# Hand edited')
+    (temp_path / '.claude' / 'commands' / 'review.md').write_text('# Review v2')
+
+    result = CommandSync(temp_path).run()
+    assert output.read_text() == '# Hand edited'
+    assert any('edited after sync' in conflict for conflict in result.conflicts)
+
+    forced = CommandSync(temp_path).run(force=True)
+    assert forced.written == ['.codex/prompts/review.md']
+    assert output.read_text() == '# Review v2'
+
+
+def test_sync_adopts_migrated_files():
+  """Test that files created by add --migrate are recognized instead of conflicting."""
+  with temp_project_dir() as temp_path:
+    _make_project(temp_path)
+    (temp_path / 'AGENTS.md').unlink()
+    assert run_cli_command(['add', 'codex', '--no-editor']).exit_code == 0
+
+    result = CommandSync(temp_path).run()
+
+    assert result.conflicts == []
+    assert result.written == []
+
+
+def test_sync_command():
+  """Test the sync CLI command."""
+  with temp_project_dir() as temp_path:
+    _make_project(temp_path)
+
+    result = run_cli_command(['sync', '--dry-run'])
+    assert result.exit_code == 0
+    assert 'Would write 2 files' in result.stdout
+    assert not (temp_path / '.codex' / 'prompts').exists()
+
+    result = run_cli_command(['sync'])
+    assert 'Wrote 2 files' in result.stdout
+    result = run_cli_command(['sync'])
+    assert 'Everything up to date' in result.stdout
+
+
+def test_sync_links_identical_outputs():
+  """Test --link=hard: unchanged copies share the source inode and follow its edits."""
+  with temp_project_dir() as temp_path:
+    _make_project(temp_path)
+    generator = ConfigGenerator(link=LinkMode.hard)
+
+    CommandSync(temp_path, generator).run()
+
+    source = temp_path / '.claude' / 'commands' / 'deploy.md'
+    output = temp_path / '.codex' / 'prompts' / 'deploy.md'
+    assert os.path.samefile(source, output)
+    # review.md loses its frontmatter in conversion, so it is a real copy
+    review = temp_path / '.codex' / 'prompts' / 'review.md'
+    assert not os.path.samefile(temp_path / '.claude' / 'commands' / 'review.md', review)
+
+    # Edited in place, the output already has the new content: not a hand edit
+    with open(source, 'a') as f:
+      f.write('\nCarefully')
+    result = CommandSync(temp_path, generator).run()
+
+    assert result.conflicts == []
+    assert result.written == []
+    assert output.read_text().endswith('Carefully')
+
+
+def test_sync_removes_dangling_symlinks():
+  """Test --link=sym outputs are relative links, deleted with their source."""
+  with temp_project_dir() as temp_path:
+    _make_project(temp_path)
+    generator = ConfigGenerator(link=LinkMode.sym)
+    CommandSync(temp_path, generator).run()
+
+    output = temp_path / '.codex' / 'prompts' / 'deploy.md'
+    assert os.readlink(output) == '../../.claude/commands/deploy.md'
+
+    (temp_path / '.claude' / 'commands' / 'deploy.md').unlink()
+    result = CommandSync(temp_path, generator).run()
+
+    assert result.deleted == ['.codex/prompts/deploy.md']
+    assert not os.path.lexists(output)
+
+
+def test_sync_source_deleted_during_scan():
+  """Test that a source deleted after the directory scan is treated as removed."""
+  with temp_project_dir() as temp_path:
+    _make_project(temp_path)
+    CommandSync(temp_path).run()
+
+    sync = CommandSync(temp_path)
+    command_files = sync.detector.get_provider('claude').command_files
+
+    def scan_then_delete(project_dir, snapshot=None):
+      files = command_files(project_dir, snapshot)
+      (temp_path / '.claude' / 'commands' / 'deploy.md').unlink(missing_ok=True)
+      return files
+
+    sync.detector.get_provider('claude').command_files = scan_then_delete
+    result = sync.run()
+
+    assert result.deleted == ['.codex/prompts/deploy.md']
+    assert result.unchanged == 1
+
+
+def test_first_sync_after_add_counts_adopted_outputs():
+  """Test that outputs already written by add are adopted and reported as unchanged."""
+  with temp_project_dir() as temp_path:
+    _make_project(temp_path)
+    (temp_path / 'AGENTS.md').unlink()
+    assert run_cli_command(['add', 'codex', '--migrate', '--no-editor']).exit_code == 0
+
+    result = run_cli_command(['sync'])
+
+    assert result.exit_code == 0
+    assert 'Everything up to date (2 commands unchanged)' in result.stdout
@@ -0,0 +1,110 @@
+"""Tests for change watching used by aiproj watch."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from src.core.sync import CommandSync
+from src.core.watcher import InotifyWatcher, PollingWatcher
+
+CONFIG_FILES = ['CLAUDE.md', 'GEMINI.md', 'AGENTS.md']
+DIRECTORIES = ['.claude/commands', '.gemini/commands', '.codex/prompts']
+
+WATCHERS = [
+  pytest.param(
+    InotifyWatcher,
+    marks=pytest.mark.skipif(not InotifyWatcher.available(), reason='inotify not available'),
+  ),
+  pytest.param(lambda *args: PollingWatcher(*args, interval=0.05)),
+]
+
+
+@pytest.mark.parametrize('make_watcher', WATCHERS)
+def test_burst_is_coalesced(make_watcher):
+  """Test that many writes in quick succession arrive as one batch."""
+  with tempfile.TemporaryDirectory() as temp_dir:
+    temp_path = Path(temp_dir)
+    commands_dir = temp_path / '.claude' / 'commands'
+    commands_dir.mkdir(parents=True)
+    watcher = make_watcher(temp_path, CONFIG_FILES, DIRECTORIES)
+    try:
+      for i in range(100):
+        (commands_dir / f'cmd{i}.md').write_text(f'# Command {i}')
+      (temp_path / 'unrelated.txt').write_text('ignored')
+
+      batch = watcher.next_batch(timeout=2, debounce=0.2, max_delay=2)
+
+      assert batch == {f'.claude/commands/cmd{i}.md' for i in range(100)}
+      assert watcher.next_batch(timeout=0.1) == set()
+    finally:
+      watcher.close()
+
+
+@pytest.mark.parametrize('make_watcher', WATCHERS)
+def test_new_command_directory_is_watched(make_watcher):
+  """Test that command directories created after startup are picked up."""
+  with tempfile.TemporaryDirectory() as temp_dir:
+    temp_path = Path(temp_dir)
+    watcher = make_watcher(temp_path, CONFIG_FILES, DIRECTORIES)
+    try:
+      prompts_dir = temp_path / '.codex' / 'prompts'
+      prompts_dir.mkdir(parents=True)
+      (prompts_dir / 'review.md').write_text('# Review')
+
+      batch = watcher.next_batch(timeout=2, debounce=0.2)
+
+      assert '.codex/prompts/review.md' in batch
+    finally:
+      watcher.close()
+
+
+def test_suppressed_paths_are_ignored():
+  """Test that a watcher's own writes can be filtered out."""
+  with tempfile.TemporaryDirectory() as temp_dir:
+    temp_path = Path(temp_dir)
+    (temp_path / '.gemini' / 'commands').mkdir(parents=True)
+    watcher = PollingWatcher(temp_path, CONFIG_FILES, DIRECTORIES, interval=0.05)
+
+    watcher.suppress(['.gemini/commands/review.toml'])
+    (temp_path / '.gemini' / 'commands' / 'review.toml').write_text('prompt = "x"')
+
+    assert watcher.next_batch(timeout=0.3, debounce=0.1) == set()
+
+
+@pytest.mark.parametrize('make_watcher', WATCHERS)
+def test_sync_writes_do_not_trigger_another_batch(make_watcher):
+  """Test that a sync's own temp files and outputs do not start a follow-up pass."""
+  with tempfile.TemporaryDirectory() as temp_dir:
+    temp_path = Path(temp_dir)
+    for directory in ('.claude/commands', '.gemini/commands'):
+      (temp_path / directory).mkdir(parents=True)
+    (temp_path / 'CLAUDE.md').write_text('# Claude')
+    (temp_path / 'GEMINI.md').write_text('# Gemini')
+    syncer = CommandSync(temp_path)
+    syncer.run()
+    watcher = make_watcher(temp_path, CONFIG_FILES, DIRECTORIES)
+    try:
+      (temp_path / '.claude' / 'commands' / 'review.md').write_text('# Review')
+      (temp_path / '.claude' / 'commands' / 'deploy.md').write_text('# Deploy')
+      batch = watcher.next_batch(timeout=2, debounce=0.2)
+      assert batch == {'.claude/commands/review.md', '.claude/commands/deploy.md'}
+
+      syncer.detector.invalidate(temp_path)
+      result = syncer.run()
+      assert len(result.written) == 2
+      watcher.suppress(result.written + result.deleted)
+
+      assert watcher.next_batch(timeout=0.5, debounce=0.1) == set()
+    finally:
+      watcher.close()
+
+
+def test_temp_and_foreign_files_are_not_changes():
+  """Test that dotfiles, temp files and other suffixes in command dirs are ignored."""
+  watcher = PollingWatcher(Path(tempfile.gettempdir()), CONFIG_FILES, DIRECTORIES)
+  assert watcher.is_relevant('.gemini/commands/review.toml')
+  assert watcher.is_relevant('.claude/commands')
+  assert not watcher.is_relevant('.gemini/commands/.review.toml.abc123.tmp')
+  assert not watcher.is_relevant('.claude/commands/review.md.swp')
+  assert not watcher.is_relevant('.claude/commands/.#review.md')